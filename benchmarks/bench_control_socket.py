@@ -0,0 +1,74 @@
+"""控制端点的往返延迟
+
+在临时目录中启动 ControlServer，添加 N 个子进程并冻结，然后测量对已解析目标的
+status、重复 freeze（目标已冻结）和批量 status 请求的往返延迟（目标：p50 < 1ms）：
+
+    python benchmarks/bench_control_socket.py --targets 10 --requests 2000
+"""
+import os
+import sys
+import time
+import argparse
+import tempfile
+import statistics
+import subprocess
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+
+def measure(func, requests):
+    samples = []
+    for _ in range(requests):
+        start = time.perf_counter()
+        func()
+        samples.append((time.perf_counter() - start) * 1000)
+    samples.sort()
+    return (statistics.median(samples), samples[int(len(samples) * 0.99) - 1], samples[-1])
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument('--targets', type=int, default=10, help='子进程数量')
+    parser.add_argument('--requests', type=int, default=2000, help='每种请求的次数')
+    args = parser.parse_args()
+
+    # 在临时目录中运行，processes.json/settings.json 不影响实际配置
+    workdir = tempfile.mkdtemp(prefix="process-freezer-bench-")
+    os.chdir(workdir)
+    import freezer_core as core
+    from control_server import ControlServer, ControlClient
+
+    settings = core.Settings()
+    settings.watch_new_processes = False
+    process_manager = core.ProcessManager(settings)
+    children = [subprocess.Popen(['sleep', '3600']) for _ in range(args.targets)]
+    identifiers = [str(child.pid) for child in children]
+    for identifier in identifiers:
+        process_manager.add_process(identifier, identifier)
+    server = ControlServer(process_manager, os.path.join(workdir, "control.sock"))
+    server.start()
+    try:
+        with ControlClient(server.address) as client:
+            client.call("freeze", identifiers)
+            batch = [{"jsonrpc": "2.0", "id": index, "method": "status", "params": [identifier]}
+                     for index, identifier in enumerate(identifiers)]
+            cases = {
+                "status (1 target)": lambda: client.call("status", identifiers[:1]),
+                "freeze (already frozen)": lambda: client.call("freeze", identifiers[:1]),
+                f"batch status ({len(batch)} requests)": lambda: client.send(batch),
+            }
+            for label, func in cases.items():
+                p50, p99, worst = measure(func, args.requests)
+                print(f"{label}: p50 {p50:.3f} ms, p99 {p99:.3f} ms, max {worst:.3f} ms")
+            client.call("resume", identifiers)
+    finally:
+        server.stop()
+        process_manager.throttler.stop()
+        process_manager.executor.shutdown(wait=True)
+        for child in children:
+            child.kill()
+            child.wait()
+
+
+if __name__ == '__main__':
+    main()
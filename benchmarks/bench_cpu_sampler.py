@@ -0,0 +1,57 @@
+"""CPU 采样器自身的开销
+
+启动 N 个空闲子进程（默认 500），按给定间隔反复批量读取它们的CPU时间，
+统计采样线程本身消耗的CPU时间占单核的比例：
+
+    python benchmarks/bench_cpu_sampler.py --processes 500 --interval 1.0 --duration 10
+"""
+import os
+import sys
+import time
+import argparse
+import subprocess
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from cpu_sampler import CpuSampler  # noqa: E402
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument('--processes', type=int, default=500, help='被采样的子进程数量')
+    parser.add_argument('--interval', type=float, default=1.0, help='采样间隔（秒）')
+    parser.add_argument('--duration', type=float, default=10.0, help='测试时长（秒）')
+    args = parser.parse_args()
+
+    children = [subprocess.Popen(['sleep', '3600']) if sys.platform != 'win32'
+                else subprocess.Popen([sys.executable, '-c', 'import time; time.sleep(3600)'])
+                for _ in range(args.processes)]
+    pids = [child.pid for child in children]
+    sampler = CpuSampler()
+    try:
+        ticks = 0
+        per_tick = []
+        start_wall = time.monotonic()
+        start_cpu = time.thread_time()
+        while time.monotonic() - start_wall < args.duration:
+            tick_start = time.thread_time()
+            times = sampler.read(pids)
+            per_tick.append((time.thread_time() - tick_start) * 1000)
+            ticks += 1
+            time.sleep(args.interval)
+        cpu_used = time.thread_time() - start_cpu
+        wall = time.monotonic() - start_wall
+
+        print(f"sampler: {'procfs' if sampler.use_procfs else 'psutil'}, "
+              f"{len(times)}/{args.processes} processes sampled, {ticks} ticks")
+        print(f"cpu per tick: mean {sum(per_tick) / len(per_tick):.2f} ms, max {max(per_tick):.2f} ms")
+        print(f"sampler overhead: {cpu_used / wall * 100:.3f}% of one core")
+    finally:
+        sampler.close()
+        for child in children:
+            child.kill()
+            child.wait()
+
+
+if __name__ == '__main__':
+    main()
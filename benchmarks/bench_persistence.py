@@ -0,0 +1,73 @@
+"""配置保存的写入次数和耗时：每次全量重写 vs 原子合并写入
+
+对 N 个条目连续切换 M 次冻结状态，每次切换后保存一次 processes.json。比较旧实现
+（每次 json.dump 覆盖写入）和 ProcessManager.store（DebouncedWriter 合并写入）的
+实际写入次数和调用方耗时：
+
+    python benchmarks/bench_persistence.py --entries 50 --toggles 200
+"""
+import os
+import sys
+import json
+import time
+import argparse
+import tempfile
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+
+def legacy_save(path, processes):
+    """旧实现 ProcessManager.save_processes 的等价逻辑"""
+    with open(path, 'w') as f:
+        json.dump(processes, f)
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument('--entries', type=int, default=50, help='配置中的条目数量')
+    parser.add_argument('--toggles', type=int, default=200, help='连续切换次数')
+    args = parser.parse_args()
+
+    # 在临时目录中运行，processes.json/settings.json 不影响实际配置
+    os.chdir(tempfile.mkdtemp(prefix="process-freezer-bench-"))
+    import freezer_core as core
+
+    settings = core.Settings()
+    settings.watch_new_processes = False
+    process_manager = core.ProcessManager(settings)
+    process_manager.processes = {f"app{index}.exe": {"name": f"app{index}.exe", "is_frozen": False}
+                                 for index in range(args.entries)}
+    names = list(process_manager.processes)
+
+    start = time.perf_counter()
+    for index in range(args.toggles):
+        entry = process_manager.processes[names[index % len(names)]]
+        entry["is_frozen"] = not entry["is_frozen"]
+        legacy_save("legacy.json", process_manager.processes)
+    legacy_ms = (time.perf_counter() - start) * 1000
+
+    start = time.perf_counter()
+    for index in range(args.toggles):
+        entry = process_manager.processes[names[index % len(names)]]
+        entry["is_frozen"] = not entry["is_frozen"]
+        process_manager.save_processes()
+    caller_ms = (time.perf_counter() - start) * 1000
+    start = time.perf_counter()
+    process_manager.flush()
+    flush_ms = (time.perf_counter() - start) * 1000
+    store = process_manager.store
+
+    with open(process_manager.config_file, 'r') as f:
+        saved = json.load(f)
+    assert saved == process_manager.processes, "saved configuration does not match the final state"
+
+    print(f"{args.toggles} toggles over {args.entries} entries")
+    print(f"legacy:    {args.toggles} writes, {legacy_ms:.1f} ms in caller")
+    print(f"debounced: {store.writes} writes for {store.requests} requests, "
+          f"{caller_ms:.1f} ms in caller, flush {flush_ms:.1f} ms")
+    process_manager.throttler.stop()
+    process_manager.executor.shutdown(wait=True)
+
+
+if __name__ == '__main__':
+    main()
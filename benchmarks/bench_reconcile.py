@@ -0,0 +1,65 @@
+"""真实冻结状态核对的耗时
+
+启动 N 个带 M 个线程的子进程并冻结其中一半，测量一次批量读取
+/proc/<pid>/task/*/stat 判断全部进程挂起状态的耗时（ProcessManager.reconcile 的主要开销）：
+
+    python benchmarks/bench_reconcile.py --processes 300 --threads 4
+"""
+import os
+import sys
+import time
+import argparse
+import subprocess
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from suspend_backends import create_suspend_backend  # noqa: E402
+
+CHILD_SCRIPT = """
+import sys, time, threading
+for _ in range(int(sys.argv[1])):
+    threading.Thread(target=time.sleep, args=(3600,), daemon=True).start()
+time.sleep(3600)
+"""
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument('--processes', type=int, default=300, help='子进程数量')
+    parser.add_argument('--threads', type=int, default=4, help='每个子进程额外启动的线程数')
+    parser.add_argument('--rounds', type=int, default=20, help='核对次数')
+    parser.add_argument('--backend', default='signal', help='挂起后端')
+    args = parser.parse_args()
+
+    backend = create_suspend_backend(args.backend)
+    children = [subprocess.Popen([sys.executable, '-c', CHILD_SCRIPT, str(args.threads)])
+                for _ in range(args.processes)]
+    time.sleep(1.0)  # 等待子进程创建完线程
+    targets = {str(child.pid): [child.pid] for child in children}
+    frozen = set(list(targets)[::2])
+    try:
+        for identifier in frozen:
+            backend.suspend_group(identifier, targets[identifier])
+        time.sleep(0.2)
+
+        timings = []
+        for _ in range(args.rounds):
+            start = time.perf_counter()
+            states = {identifier: backend.is_group_suspended(identifier, pids)
+                      for identifier, pids in targets.items()}
+            timings.append((time.perf_counter() - start) * 1000)
+        mismatches = sum(1 for identifier, state in states.items() if state != (identifier in frozen))
+
+        print(f"backend {backend.name}: {args.processes} processes x {args.threads + 1} threads")
+        print(f"bulk state check: min {min(timings):.2f} ms, mean {sum(timings) / len(timings):.2f} ms, "
+              f"max {max(timings):.2f} ms, mismatches {mismatches}")
+    finally:
+        for identifier in frozen:
+            backend.resume_group(identifier, targets[identifier])
+        for child in children:
+            child.kill()
+            child.wait()
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,136 @@
+"""规则匹配的开销：组合匹配器 vs 每条规则扫描一遍进程表
+
+向 ProcessIndex 写入 N 个合成进程（默认 5000，exe/cmdline/user 也是合成的），
+配置 R 条规则（默认 2000，精确名称、名称 glob、路径 glob 和命令行正则各占一部分），测量：
+编译、首次全量求值、进程表不变时解析全部条目、新增少量进程后的增量求值、
+添加/删除单个条目（update_rule）的耗时，
+与逐条规则扫描进程表的耗时对比，以及有无这些规则时解析一个普通进程名条目的耗时：
+
+    python benchmarks/bench_rules.py --processes 5000 --rules 2000
+"""
+import os
+import re
+import sys
+import time
+import fnmatch
+import argparse
+import tempfile
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from process_index import ProcessIndex  # noqa: E402
+from rule_matcher import RuleResolver, REGEX_PREFIX  # noqa: E402
+
+SYNTHETIC_PID_BASE = 10_000_000
+
+
+def synthetic_details(pid, fields):
+    index = pid - SYNTHETIC_PID_BASE
+    details = {"exe": f"/opt/vendor{index % 50}/bin/app{index}",
+               "cmdline": f"/opt/vendor{index % 50}/bin/app{index} --profile={index % 7} --worker",
+               "user": f"user{index % 10}"}
+    return {field: details[field] for field in fields}
+
+
+def build_rules(count):
+    """混合规则：40% 精确名称，30% 名称 glob，20% 路径 glob，10% 命令行正则+用户"""
+    rules = {}
+    for index in range(count):
+        kind = index % 10
+        if kind < 4:
+            rule = {"name": f"app{index * 3}"}
+        elif kind < 7:
+            rule = {"name": f"app{index}?"}
+        elif kind < 9:
+            rule = {"exe": f"/opt/vendor{index % 50}/bin/app{index}*"}
+        else:
+            rule = {"cmdline": f"re:app{index} --profile=[0-3]", "user": f"user{index % 10}"}
+        rules[f"rule{index}"] = rule
+    return rules
+
+
+def naive_match(rules, processes):
+    """逐条规则扫描整个进程表"""
+    members = {}
+    for identifier, rule in rules.items():
+        members[identifier] = []
+        for pid, name in processes:
+            details = synthetic_details(pid, ("exe", "cmdline", "user"))
+            values = {"name": name.lower(), **{field: value.lower() for field, value in details.items()}}
+            if all(re.search(pattern[len(REGEX_PREFIX):], values[field], re.IGNORECASE)
+                   if pattern.startswith(REGEX_PREFIX) else fnmatch.fnmatchcase(values[field], pattern.lower())
+                   for field, pattern in rule.items()):
+                members[identifier].append(pid)
+    return members
+
+
+def timed(func):
+    start = time.perf_counter()
+    result = func()
+    return (time.perf_counter() - start) * 1000, result
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument('--processes', type=int, default=5000, help='合成进程数量')
+    parser.add_argument('--rules', type=int, default=2000, help='规则数量')
+    parser.add_argument('--naive-rules', type=int, default=200, help='逐条扫描对比时使用的规则数量（按比例换算）')
+    args = parser.parse_args()
+
+    index = ProcessIndex(verify=False)  # 合成记录没有对应的真实进程，查询时不核对启动时间
+    processes = [(SYNTHETIC_PID_BASE + i, f"app{i}") for i in range(args.processes)]
+    for pid, name in processes:
+        index.add_record(pid, name, ppid=1, create_time=1.0)
+    rules = build_rules(args.rules)
+    resolver = RuleResolver(index, read_details=synthetic_details)
+
+    compile_ms, _ = timed(lambda: resolver.set_rules(rules))
+    full_ms, _ = timed(resolver.sync)
+    resolve_ms, _ = timed(lambda: [resolver.pids_for(identifier) for identifier in rules])
+    for i in range(args.processes, args.processes + 10):
+        index.add_record(SYNTHETIC_PID_BASE + i, f"app{i}", ppid=1, create_time=1.0)
+    incremental_ms, _ = timed(resolver.sync)
+    add_ms, _ = timed(lambda: resolver.update_rule("added", {"exe": "/opt/vendor7/bin/app7*"}))
+    remove_ms, _ = timed(lambda: resolver.update_rule("added", None))
+
+    sample = dict(list(rules.items())[:args.naive_rules])
+    naive_ms, expected = timed(lambda: naive_match(sample, processes))
+    mismatches = sum(1 for identifier, pids in expected.items()
+                     if sorted(pids) != [pid for pid in resolver.pids_for(identifier)
+                                         if pid - SYNTHETIC_PID_BASE < args.processes])
+    naive_total = naive_ms * len(rules) / len(sample)
+
+    print(f"{args.rules} rules over {args.processes} processes")
+    print(f"compile:                 {compile_ms:8.1f} ms")
+    print(f"full evaluation:         {full_ms:8.1f} ms  (per-rule scan: ~{naive_total:.0f} ms, "
+          f"{mismatches} mismatches in {len(sample)} sampled rules)")
+    print(f"resolve all entries:     {resolve_ms:8.1f} ms  ({resolve_ms * 1000 / len(rules):.1f} us per entry)")
+    print(f"10 new processes:        {incremental_ms:8.2f} ms")
+    print(f"add one rule:            {add_ms:8.2f} ms  (remove: {remove_ms:.2f} ms, "
+          f"full recompile + evaluation: {compile_ms + full_ms:.1f} ms)")
+
+    # 有无规则时解析一个普通进程名条目（ProcessManager.target_pids）
+    os.chdir(tempfile.mkdtemp(prefix="process-freezer-bench-"))
+    import freezer_core as core
+    settings = core.Settings()
+    settings.watch_new_processes = False
+    process_manager = core.ProcessManager(settings)
+    process_manager.process_index = index
+    process_manager.rules = RuleResolver(index, read_details=synthetic_details)
+    process_manager.processes = {"app42": {"name": "app42", "is_frozen": False}}
+    process_manager.rebuild_rules()
+    repeat = 10000
+    base_ms, _ = timed(lambda: [process_manager.target_pids("app42") for _ in range(repeat)])
+    process_manager.processes.update({identifier: {"name": identifier, "is_frozen": False, "rule": rule}
+                                      for identifier, rule in rules.items()})
+    process_manager.rebuild_rules()
+    process_manager.rules.sync()
+    with_rules_ms, _ = timed(lambda: [process_manager.target_pids("app42") for _ in range(repeat)])
+    print(f"resolve 'app42':         {base_ms * 1000 / repeat:.2f} us without rules, "
+          f"{with_rules_ms * 1000 / repeat:.2f} us with {args.rules} rules")
+    process_manager.throttler.stop()
+    process_manager.executor.shutdown(wait=True)
+
+
+if __name__ == '__main__':
+    main()
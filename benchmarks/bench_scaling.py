@@ -0,0 +1,181 @@
+"""随进程数量增长的整体耗时（Linux）
+
+对 N = 10/100/1000/5000 个合成进程（每个带 M 个线程，可选子进程树）分别测量：
+名称解析（冷/热索引）、WindowHider 按名称查找、批量冻结、批量解冻，以及有图形界面时的
+进程列表刷新和托盘图标重建，结果写入 JSON 报告，便于在不同版本之间比较：
+
+    python benchmarks/bench_scaling.py
+    python benchmarks/bench_scaling.py --sizes 10,100 --threads 4 --depth 1 --fanout 2 --output report.json
+"""
+import os
+import sys
+import json
+import time
+import argparse
+import platform
+import tempfile
+import statistics
+import subprocess
+from datetime import datetime
+
+import psutil
+
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+sys.path.insert(0, ROOT)
+sys.path.insert(0, os.path.dirname(os.path.abspath(__file__)))
+
+from process_farm import ProcessFarm  # noqa: E402
+
+MB_PER_PROCESS = 0.8  # 合成进程的内存估算，用于跳过机器装不下的规模
+WINDOW_LOOKUP_SAMPLE = 100  # WindowHider 每次查找都会刷新索引，只抽样测量
+
+
+def timed(func, rounds):
+    """执行 rounds 次，返回耗时中位数（毫秒）"""
+    samples = []
+    for _ in range(rounds):
+        start = time.perf_counter()
+        func()
+        samples.append((time.perf_counter() - start) * 1000)
+    return round(statistics.median(samples), 3)
+
+
+def git_revision():
+    try:
+        return subprocess.run(['git', 'rev-parse', '--short', 'HEAD'], cwd=ROOT,
+                              capture_output=True, text=True, check=True).stdout.strip()
+    except (OSError, subprocess.CalledProcessError):
+        return None
+
+
+def create_window(process_manager):
+    """创建主窗口和托盘图标，没有图形环境时返回 (None, 原因)"""
+    try:
+        from process_freezer_gui import ProcessListWindow
+        app = ProcessListWindow(process_manager)
+        app.window.withdraw()
+    except Exception as e:
+        return None, f"no GUI: {e}"
+    try:
+        app.create_tray_icon()
+    except Exception as e:
+        app.tray_error = f"no tray: {e}"
+    return app, None
+
+
+def close_window(app):
+    if app.cpu_policy:
+        app.cpu_policy.stop()
+    app.stop_memory_policy()
+    app.process_manager.throttler.stop()
+    app.process_manager.stop_watcher()
+    if hasattr(app, 'tray_icon'):
+        app.tray_icon.stop()
+    app.window.destroy()
+
+
+def run_size(core, size, args):
+    farm = ProcessFarm(size, threads=args.threads, depth=args.depth, fanout=args.fanout)
+    result = {"processes": size, "threads": args.threads, "depth": args.depth,
+              "fanout": args.fanout, "total_processes": farm.total_processes, "phases": {}}
+    phases = result["phases"]
+    needed = farm.total_processes * MB_PER_PROCESS
+    available = psutil.virtual_memory().available / 2 ** 20
+    if needed > available * 0.8:
+        reason = f"needs ~{needed:.0f} MB, {available:.0f} MB available"
+        print(f"N={size}: skipped ({reason})")
+        result["skipped"] = reason
+        return result
+
+    with farm:
+        settings = core.Settings()
+        settings.suspend_backend = args.backend
+        settings.watch_new_processes = False
+        settings.control_socket_enabled = False
+        process_manager = core.ProcessManager(settings)
+        process_manager.processes = {}
+        for name in farm.names:
+            process_manager.processes[name] = {"name": name, "is_frozen": False,
+                                               "include_children": args.depth > 0}
+        process_manager.rebuild_rules()
+
+        def resolve():
+            process_manager.refresh_index()
+            for name in farm.names:
+                process_manager.target_pids(name)
+
+        phases["resolve_cold"] = {"ms": timed(resolve, 1)}
+        phases["resolve_warm"] = {"ms": timed(resolve, args.rounds)}
+
+        sample = farm.names[:WINDOW_LOOKUP_SAMPLE]
+        lookup_ms = timed(lambda: [process_manager.window_hider.get_process_id_by_name(name)
+                                   for name in sample], 1)
+        phases["window_lookup_per_name"] = {"ms": round(lookup_ms / len(sample), 3)}
+
+        freeze_times, resume_times = [], []
+        for _ in range(args.rounds):
+            freeze_times.append(timed(process_manager.freeze_many, 1))
+            resume_times.append(timed(process_manager.resume_many, 1))
+        phases["freeze_all"] = {"ms": statistics.median(freeze_times)}
+        phases["resume_all"] = {"ms": statistics.median(resume_times)}
+        result["latency"] = process_manager.latency.snapshot()["backend"]
+
+        app, reason = create_window(process_manager)
+        if app is None:
+            phases["list_refresh"] = phases["list_update_one"] = phases["tray_rebuild"] = {"skipped": reason}
+        else:
+            try:
+                phases["list_refresh"] = {"ms": timed(app.update_process_list, args.rounds)}
+                phases["list_update_one"] = {"ms": timed(lambda: app.update_process_list(farm.names[:1]),
+                                                         args.rounds)}
+                if hasattr(app, 'tray_icon'):
+                    phases["tray_rebuild"] = {"ms": timed(app.apply_tray_update, args.rounds)}
+                else:
+                    phases["tray_rebuild"] = {"skipped": app.tray_error}
+            finally:
+                close_window(app)
+        process_manager.throttler.stop()
+        process_manager.executor.shutdown(wait=False)
+
+    print(f"N={size} ({farm.total_processes} processes): " +
+          ", ".join(f"{phase} {value['ms']:.1f}ms" if "ms" in value else f"{phase} skipped"
+                    for phase, value in phases.items()))
+    return result
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument('--sizes', default='10,100,1000,5000', help='逗号分隔的进程数量')
+    parser.add_argument('--threads', type=int, default=2, help='每个进程额外启动的线程数')
+    parser.add_argument('--depth', type=int, default=0, help='子进程树的层数')
+    parser.add_argument('--fanout', type=int, default=0, help='每层子进程数量')
+    parser.add_argument('--rounds', type=int, default=3, help='每项测量的重复次数（取中位数）')
+    parser.add_argument('--backend', default='auto', help='挂起后端')
+    parser.add_argument('--output', default='benchmark-report.json', help='JSON 报告路径')
+    args = parser.parse_args()
+    output = os.path.abspath(args.output)
+
+    # 在临时目录中运行，processes.json/settings.json/日志不影响实际配置
+    os.chdir(tempfile.mkdtemp(prefix="process-freezer-bench-"))
+    import freezer_core as core
+
+    report = {
+        "meta": {
+            "timestamp": datetime.now().isoformat(timespec='seconds'),
+            "revision": git_revision(),
+            "platform": platform.platform(),
+            "python": platform.python_version(),
+            "cpu_count": psutil.cpu_count(),
+            "memory_mb": psutil.virtual_memory().total // 2 ** 20,
+            "backend": args.backend,
+            "rounds": args.rounds,
+        },
+        "results": [run_size(core, int(size), args) for size in args.sizes.split(',')],
+    }
+    with open(output, 'w', encoding='utf-8') as f:
+        json.dump(report, f, indent=4, ensure_ascii=False)
+    print(f"Report written to {output}")
+
+
+if __name__ == '__main__':
+    main()
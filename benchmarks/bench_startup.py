@@ -0,0 +1,99 @@
+"""冷启动耗时：模块导入、首次绘制和托盘就绪
+
+在临时目录中多次启动图形界面子进程，记录从启动子进程开始到以下各阶段的耗时
+（time.monotonic 在进程间可比较）：导入 freezer_core、导入 process_freezer_gui、
+主窗口创建完成、首次绘制、托盘图标就绪、后台服务启动完成。没有图形环境时只测量导入阶段：
+
+    python benchmarks/bench_startup.py --rounds 5 --output startup-report.json
+"""
+import os
+import sys
+import json
+import time
+import argparse
+import tempfile
+import statistics
+import subprocess
+
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+
+MARKS = ("import_core", "import_gui", "window_created", "first_paint", "tray_ready", "services_started")
+
+CHILD_SCRIPT = r"""
+import sys, json, time
+sys.path.insert(0, sys.argv[1])
+marks = {}
+import freezer_core
+marks["import_core"] = time.monotonic()
+import process_freezer_gui
+marks["import_gui"] = time.monotonic()
+
+settings = freezer_core.Settings()
+freezer_core.setup_logging(settings)
+process_manager = freezer_core.ProcessManager(settings)
+try:
+    app = process_freezer_gui.ProcessListWindow(process_manager)
+except Exception as e:
+    print(json.dumps({"marks": marks, "error": f"no GUI: {e}"}), flush=True)
+    sys.exit(0)
+
+
+def poll():
+    if "services_started" not in app.startup_marks:
+        app.window.after(10, poll)
+        return
+    marks.update(app.startup_marks)
+    print(json.dumps({"marks": marks}), flush=True)
+    app.quit_app(from_tray=True)
+
+
+app.window.after(10, poll)
+app.run()
+"""
+
+
+def run_once(workdir):
+    start = time.monotonic()
+    output = subprocess.run([sys.executable, '-c', CHILD_SCRIPT, ROOT], cwd=workdir,
+                            capture_output=True, text=True, timeout=60).stdout
+    lines = [line for line in output.splitlines() if line.startswith('{')]
+    if not lines:
+        raise RuntimeError(f"startup child produced no result: {output!r}")
+    result = json.loads(lines[-1])
+    result["ms"] = {mark: round((value - start) * 1000, 1) for mark, value in result["marks"].items()}
+    return result
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument('--rounds', type=int, default=5, help='启动次数（取中位数）')
+    parser.add_argument('--output', help='JSON 报告路径')
+    args = parser.parse_args()
+
+    # 临时目录中的配置：关闭进程监视，控制端点不占用默认地址
+    workdir = tempfile.mkdtemp(prefix="process-freezer-bench-")
+    with open(os.path.join(workdir, "settings.json"), 'w', encoding='utf-8') as f:
+        json.dump({"watch_new_processes": False,
+                   "control_socket_address": os.path.join(workdir, "control.sock")}, f)
+
+    results = [run_once(workdir) for _ in range(args.rounds)]
+    summary = {}
+    for mark in MARKS:
+        samples = [result["ms"][mark] for result in results if mark in result["ms"]]
+        if samples:
+            summary[mark] = {"median_ms": statistics.median(samples), "min_ms": min(samples)}
+    for mark, value in summary.items():
+        print(f"{mark:<18} median {value['median_ms']:>8.1f} ms   min {value['min_ms']:>8.1f} ms")
+    errors = {result["error"] for result in results if "error" in result}
+    for error in errors:
+        print(f"skipped GUI phases ({error})")
+
+    if args.output:
+        with open(args.output, 'w', encoding='utf-8') as f:
+            json.dump({"rounds": args.rounds, "summary": summary, "errors": sorted(errors)},
+                      f, indent=4, ensure_ascii=False)
+        print(f"Report written to {args.output}")
+
+
+if __name__ == '__main__':
+    main()
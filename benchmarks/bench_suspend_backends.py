@@ -0,0 +1,87 @@
+"""各挂起后端的冻结/解冻延迟对比
+
+启动 N 个空闲子进程（每个带 M 个线程），用每个可用后端反复整组挂起/恢复，
+输出每次操作的延迟分布：
+
+    python benchmarks/bench_suspend_backends.py --rounds 200
+    python benchmarks/bench_suspend_backends.py --processes 50 --threads 20 --backend signal --backend cgroup
+"""
+import os
+import sys
+import time
+import argparse
+import statistics
+import subprocess
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from suspend_backends import SUSPEND_BACKENDS, available_backends  # noqa: E402
+
+CHILD_SCRIPT = """
+import sys, time, threading
+for _ in range(int(sys.argv[1])):
+    threading.Thread(target=time.sleep, args=(3600,), daemon=True).start()
+time.sleep(3600)
+"""
+
+
+def percentile(samples, pct):
+    ordered = sorted(samples)
+    index = min(len(ordered) - 1, int(round(pct / 100 * (len(ordered) - 1))))
+    return ordered[index]
+
+
+def measure(backend, pids, rounds):
+    """返回 (挂起耗时列表, 恢复耗时列表)，单位毫秒"""
+    suspend_times, resume_times = [], []
+    try:
+        # 预热一轮：cgroup 后端首次冻结需要把进程迁入子组
+        backend.suspend_group("bench", pids)
+        backend.resume_group("bench", pids)
+
+        for _ in range(rounds):
+            start = time.perf_counter()
+            backend.suspend_group("bench", pids)
+            suspend_times.append((time.perf_counter() - start) * 1000)
+
+            start = time.perf_counter()
+            backend.resume_group("bench", pids)
+            resume_times.append((time.perf_counter() - start) * 1000)
+    finally:
+        # 把子进程迁回原来的 cgroup 并删除 bench 子组，不在系统中留下残余
+        backend.release_group("bench")
+    return suspend_times, resume_times
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument('--rounds', type=int, default=100, help='每个后端的冻结/解冻次数')
+    parser.add_argument('--processes', type=int, default=1, help='子进程数量')
+    parser.add_argument('--threads', type=int, default=0, help='每个子进程额外启动的线程数')
+    parser.add_argument('--backend', action='append', help='只测试指定后端（可重复）')
+    args = parser.parse_args()
+
+    names = args.backend or available_backends()
+    children = [subprocess.Popen([sys.executable, '-c', CHILD_SCRIPT, str(args.threads)])
+                for _ in range(args.processes)]
+    pids = [child.pid for child in children]
+    time.sleep(0.5)  # 等待子进程创建完线程
+    try:
+        print(f"{args.processes} processes x {args.threads + 1} threads, {args.rounds} rounds")
+        print(f"{'backend':<12}{'op':<9}{'mean':>9}{'p50':>9}{'p95':>9}{'max':>9}  (ms)")
+        for name in names:
+            backend = SUSPEND_BACKENDS[name]()
+            for op, samples in zip(('suspend', 'resume'), measure(backend, pids, args.rounds)):
+                print(f"{name:<12}{op:<9}"
+                      f"{statistics.mean(samples):>9.3f}"
+                      f"{percentile(samples, 50):>9.3f}"
+                      f"{percentile(samples, 95):>9.3f}"
+                      f"{max(samples):>9.3f}")
+    finally:
+        for child in children:
+            child.kill()
+            child.wait()
+
+
+if __name__ == '__main__':
+    main()
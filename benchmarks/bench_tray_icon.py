@@ -0,0 +1,83 @@
+"""托盘图标渲染耗时：每次从磁盘读取图标并重新合成 vs 预加载资源和渲染结果的 LRU 缓存
+
+模拟 N 次连续切换（默认 50，冻结数量在 0..K 之间来回变化），每次切换后渲染一次托盘图标。
+旧实现每次都重新打开 .ico、逐个尝试加载字体并合成数字；render_tray_icon 只在
+（是否有冻结、数量、颜色）组合第一次出现时合成：
+
+    python benchmarks/bench_tray_icon.py --toggles 50 --entries 10
+"""
+import os
+import sys
+import time
+import argparse
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from PIL import Image, ImageDraw, ImageFont  # noqa: E402
+
+from process_freezer_gui import ASSETS_DIR, render_tray_icon  # noqa: E402
+
+NUMBER_COLOR = '#ffffff'
+SHADOW_COLOR = '#007bff'
+
+
+def legacy_font(names, size):
+    for name in names:
+        try:
+            return ImageFont.truetype(name, size)
+        except OSError:
+            continue
+    return None
+
+
+def legacy_render(count):
+    """旧实现 create_icon_image 的等价逻辑"""
+    icon_path = os.path.join(ASSETS_DIR, "icon.ico" if count else "icon_inactive.ico")
+    image = Image.open(icon_path).convert('RGBA')
+    if count:
+        txt_layer = Image.new('RGBA', image.size, (0, 0, 0, 0))
+        dc = ImageDraw.Draw(txt_layer)
+        text = str(count)
+        font_size = int(image.width * 0.7)
+        font = legacy_font(("arial.ttf",), font_size)
+        shadow_font = legacy_font(("arialbd.ttf", "arial bold"), int(font_size * 1.5)) or font
+        dc.text((0, 0), text, fill=SHADOW_COLOR, font=shadow_font)
+        dc.text((0, 0), text, fill=NUMBER_COLOR, font=font)
+        image = Image.alpha_composite(image, txt_layer)
+    return image
+
+
+def counts(toggles, entries):
+    """冻结数量序列：逐个冻结到 entries 个，再逐个解冻，循环"""
+    cycle = list(range(1, entries + 1)) + list(range(entries - 1, -1, -1))
+    return [cycle[index % len(cycle)] for index in range(toggles)]
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument('--toggles', type=int, default=50, help='连续切换次数')
+    parser.add_argument('--entries', type=int, default=10, help='条目数量（冻结数量的上限）')
+    args = parser.parse_args()
+    sequence = counts(args.toggles, args.entries)
+
+    start = time.perf_counter()
+    for count in sequence:
+        legacy_render(count)
+    legacy_ms = (time.perf_counter() - start) * 1000
+
+    render_tray_icon.cache_clear()
+    start = time.perf_counter()
+    for count in sequence:
+        render_tray_icon(count > 0, count, NUMBER_COLOR, SHADOW_COLOR)
+    cached_ms = (time.perf_counter() - start) * 1000
+    info = render_tray_icon.cache_info()
+
+    print(f"{args.toggles} toggles, frozen count cycling 0..{args.entries}")
+    print(f"legacy: {legacy_ms:8.2f} ms ({legacy_ms / args.toggles:.3f} ms per update)")
+    print(f"cached: {cached_ms:8.2f} ms ({info.misses} renders, {info.hits} cache hits)")
+    print("the GUI additionally coalesces updates within ProcessListWindow.TRAY_UPDATE_DELAY_MS "
+          "into a single icon swap")
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,96 @@
+"""托盘菜单重建耗时：每次状态变化全量重建 vs TrayMenu（内容不变时跳过、复用菜单项、分组子菜单）
+
+对 N 个条目（默认 100/500/2000），模拟 U 次界面刷新（默认 100），其中一半刷新前切换一个
+条目的冻结状态，另一半没有可见变化（例如只有限速占空比变化）。比较旧实现（每次刷新构造
+全部菜单项并替换菜单）和 TrayMenu.build 的总耗时、实际替换菜单的次数和顶层菜单项数量。
+使用 pystray 的 dummy 后端，不需要图形环境；没有安装 pystray 时给出提示并退出：
+
+    python benchmarks/bench_tray_menu.py --sizes 100,500,2000 --updates 100
+"""
+import os
+import sys
+import time
+import argparse
+import tempfile
+
+os.environ.setdefault('PYSTRAY_BACKEND', 'dummy')
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+pystray = None  # main() 中导入
+
+
+def legacy_menu(process_manager):
+    """旧实现 get_menu 的等价逻辑：平铺所有条目"""
+    menu_items = []
+    for proc_id, data in process_manager.processes.items():
+        display_name = data.get("name", proc_id)
+        is_frozen = data.get("is_frozen", False)
+        prefix = "… " if process_manager.is_pending(proc_id) else ("❄ " if is_frozen else "  ")
+        text = f"{prefix}{'解冻' if is_frozen else '冻结'} {display_name}"
+        menu_items.append(pystray.MenuItem(text, lambda: None))
+    if menu_items:
+        menu_items.append(pystray.Menu.SEPARATOR)
+        menu_items.extend([pystray.MenuItem("冻结全部", lambda: None),
+                           pystray.MenuItem("解冻全部", lambda: None),
+                           pystray.Menu.SEPARATOR])
+    menu_items.extend([pystray.MenuItem("显示主窗口", lambda: None, default=True),
+                       pystray.MenuItem("退出", lambda: None)])
+    return pystray.Menu(*menu_items)
+
+
+def run(process_manager, build, updates):
+    """执行 updates 次刷新，返回 (耗时毫秒, 替换菜单次数, 最后的菜单)"""
+    names = list(process_manager.processes)
+    swaps, menu = 0, None
+    start = time.perf_counter()
+    for index in range(updates):
+        if index % 2 == 0:
+            entry = process_manager.processes[names[index % len(names)]]
+            entry["is_frozen"] = not entry["is_frozen"]
+        result = build()
+        if result is not None:
+            menu = result
+            swaps += 1
+    return (time.perf_counter() - start) * 1000, swaps, menu
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument('--sizes', default='100,500,2000', help='逗号分隔的条目数量')
+    parser.add_argument('--updates', type=int, default=100, help='刷新次数')
+    args = parser.parse_args()
+
+    global pystray
+    try:
+        import pystray
+    except ImportError:
+        sys.exit("bench_tray_menu 需要 pystray：pip install pystray")
+
+    # 在临时目录中运行，processes.json/settings.json 不影响实际配置
+    os.chdir(tempfile.mkdtemp(prefix="process-freezer-bench-"))
+    import freezer_core as core
+    try:
+        from process_freezer_gui import TrayMenu
+    except ImportError as e:  # 例如没有 tkinter
+        sys.exit(f"bench_tray_menu 无法导入 process_freezer_gui：{e}")
+
+    settings = core.Settings()
+    settings.watch_new_processes = False
+    process_manager = core.ProcessManager(settings)
+    for size in (int(size) for size in args.sizes.split(',')):
+        process_manager.processes = {f"app{index}.exe": {"name": f"app{index}.exe", "is_frozen": False}
+                                     for index in range(size)}
+        legacy_ms, legacy_swaps, legacy = run(process_manager, lambda: legacy_menu(process_manager), args.updates)
+        tray_menu = TrayMenu(process_manager, lambda proc_id: (lambda: None),
+                             [("冻结全部", lambda: None), ("解冻全部", lambda: None)],
+                             [pystray.MenuItem("显示主窗口", lambda: None, default=True),
+                              pystray.MenuItem("退出", lambda: None)])
+        menu_ms, menu_swaps, menu = run(process_manager, tray_menu.build, args.updates)
+        print(f"N={size}: legacy {legacy_ms:7.1f} ms, {legacy_swaps} swaps, {len(legacy.items)} top-level items; "
+              f"TrayMenu {menu_ms:7.1f} ms, {menu_swaps} swaps, {len(menu.items)} top-level items")
+    process_manager.throttler.stop()
+    process_manager.executor.shutdown(wait=True)
+
+
+if __name__ == '__main__':
+    main()
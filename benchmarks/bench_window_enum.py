@@ -0,0 +1,92 @@
+"""隐藏/显示窗口的开销：每个PID枚举一遍窗口 vs 所有PID共用一次枚举
+
+使用 FakeWindowBackend 在内存中构造 W 个顶层窗口（默认 10000，分属若干进程），
+目标条目有 P 个进程（默认 40，类似浏览器），每个进程若干窗口。比较旧实现（逐个PID
+调用 EnumWindows 并逐个窗口 SetWindowPos）和 WindowHider.hide_windows/show_windows
+的耗时与模拟的系统调用次数：
+
+    python benchmarks/bench_window_enum.py --windows 10000 --pids 40
+"""
+import os
+import sys
+import time
+import argparse
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from freezer_core import WindowHider  # noqa: E402
+from window_backends import FakeWindowBackend  # noqa: E402
+
+
+def legacy_hide(backend, hidden, target_pid):
+    """旧实现 hide_window_by_pid 的等价逻辑：每个PID一次完整的窗口枚举"""
+    for hwnd, pid in backend.enumerate():
+        if pid == target_pid:
+            hidden.setdefault(target_pid, {})[hwnd] = {
+                'title': backend.title(hwnd),
+                'is_foreground': hwnd == backend.foreground()
+            }
+            backend.hide([hwnd])
+
+
+def legacy_show(backend, hidden, target_pid):
+    for hwnd, info in hidden.pop(target_pid, {}).items():
+        backend.show([hwnd])
+        if info['is_foreground']:
+            backend.set_foreground(hwnd)
+
+
+def build_backend(args):
+    backend = FakeWindowBackend()
+    target_pids = list(range(1000, 1000 + args.pids))
+    for pid in target_pids:
+        for index in range(args.windows_per_pid):
+            backend.add_window(pid, f"target {pid} window {index}")
+    other = args.windows - len(backend.windows)
+    for index in range(max(other, 0)):
+        backend.add_window(100_000 + index // 3, f"other window {index}", visible=index % 4 != 0)
+    backend.foreground_hwnd = next(iter(backend.windows))
+    return backend, target_pids
+
+
+def measure(func):
+    start = time.perf_counter()
+    func()
+    return (time.perf_counter() - start) * 1000
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument('--windows', type=int, default=10000, help='顶层窗口总数')
+    parser.add_argument('--pids', type=int, default=40, help='目标条目的进程数')
+    parser.add_argument('--windows-per-pid', type=int, default=3, help='每个目标进程的窗口数')
+    args = parser.parse_args()
+
+    backend, target_pids = build_backend(args)
+    hidden = {}
+    legacy_hide_ms = measure(lambda: [legacy_hide(backend, hidden, pid) for pid in target_pids])
+    legacy_hide_calls = backend.calls
+    backend.calls = 0
+    legacy_show_ms = measure(lambda: [legacy_show(backend, hidden, pid) for pid in target_pids])
+    legacy_show_calls = backend.calls
+
+    backend, target_pids = build_backend(args)
+    hider = WindowHider(backend=backend)
+    hide_ms = measure(lambda: hider.hide_windows(target_pids))
+    hide_calls = backend.calls
+    hidden_count = sum(len(windows) for windows in hider.hidden_windows.values())
+    assert hidden_count == args.pids * args.windows_per_pid, "not all target windows were hidden"
+    backend.calls = 0
+    show_ms = measure(lambda: hider.show_windows(target_pids))
+    show_calls = backend.calls
+    assert all(visible for pid, _, visible in backend.windows.values() if pid in set(target_pids))
+
+    print(f"{args.pids} pids x {args.windows_per_pid} windows among {len(backend.windows)} top-level windows")
+    print(f"hide  per-pid: {legacy_hide_ms:8.2f} ms, {legacy_hide_calls:7d} calls")
+    print(f"hide  batched: {hide_ms:8.2f} ms, {hide_calls:7d} calls")
+    print(f"show  per-pid: {legacy_show_ms:8.2f} ms, {legacy_show_calls:7d} calls")
+    print(f"show  batched: {show_ms:8.2f} ms, {show_calls:7d} calls")
+
+
+if __name__ == '__main__':
+    main()
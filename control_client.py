@@ -0,0 +1,90 @@
+"""本地控制端点的同步客户端
+
+协议见 control_server.py。本模块只依赖标准库中的轻量模块（不导入 asyncio 和进程管理相关模块），
+命令行把命令转发给正在运行的实例时只需要导入它。
+"""
+import io
+import os
+import sys
+import json
+import socket
+import tempfile
+
+
+def default_address():
+    """Linux: $XDG_RUNTIME_DIR/process_freezer.sock（或临时目录下按用户区分的文件）；Windows: 命名管道"""
+    if sys.platform == 'win32':
+        return r'\\.\pipe\process_freezer-' + os.environ.get('USERNAME', 'default')
+    runtime_dir = os.environ.get('XDG_RUNTIME_DIR')
+    if runtime_dir and os.path.isdir(runtime_dir):
+        return os.path.join(runtime_dir, 'process_freezer.sock')
+    return os.path.join(tempfile.gettempdir(), f'process_freezer-{os.getuid()}.sock')
+
+
+class RpcError(Exception):
+    def __init__(self, code, message):
+        super().__init__(message)
+        self.code = code
+        self.message = message
+
+
+class ControlClient:
+    """同步客户端：每次 call 发送一个请求并等待对应的响应，期间收到的事件通知放入 events"""
+
+    def __init__(self, address=None, timeout=10.0):
+        self.address = address or default_address()
+        self.events = []
+        self._next_id = 0
+        if sys.platform == 'win32':
+            self._sock = None
+            self._raw = open(self.address, 'r+b', buffering=0)
+            self._write = self._raw.write
+        else:
+            self._sock = socket.socket(socket.AF_UNIX, socket.SOCK_STREAM)
+            self._sock.settimeout(timeout)
+            try:
+                self._sock.connect(self.address)
+            except OSError:
+                self._sock.close()
+                raise
+            self._raw = self._sock.makefile('rb', buffering=0)
+            self._write = self._sock.sendall
+        self._reader = io.BufferedReader(self._raw)
+
+    def close(self):
+        self._reader.close()
+        if self._sock is not None:
+            self._sock.close()
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc_info):
+        self.close()
+
+    def send(self, payload):
+        """发送一个请求对象或批量请求列表，返回解析后的响应"""
+        self._write(json.dumps(payload, ensure_ascii=False).encode('utf-8') + b'\n')
+        while True:
+            message = self.read_message()
+            if isinstance(message, dict) and message.get("method") == "event" and "id" not in message:
+                self.events.append(message["params"])
+                continue
+            return message
+
+    def read_message(self):
+        line = self._reader.readline()
+        if not line:
+            raise ConnectionError("control server closed the connection")
+        return json.loads(line)
+
+    def call(self, method, params=None):
+        """调用一个方法，返回 result；服务端返回错误时抛出 RpcError"""
+        self._next_id += 1
+        request = {"jsonrpc": "2.0", "id": self._next_id, "method": method}
+        if params is not None:
+            request["params"] = params
+        response = self.send(request)
+        if "error" in response:
+            raise RpcError(response["error"]["code"], response["error"]["message"])
+        return response["result"]
@@ -0,0 +1,244 @@
+"""本地控制端点
+
+ControlServer 在后台线程中运行 asyncio，监听 Unix 域套接字（Windows 下为命名管道），
+协议为按行分隔的 JSON-RPC 2.0：
+
+    {"jsonrpc": "2.0", "id": 1, "method": "freeze", "params": {"identifiers": ["chrome.exe"]}}
+    {"jsonrpc": "2.0", "id": 2, "method": "status"}
+    [{"jsonrpc": "2.0", "id": 3, "method": "resume", "params": ["a.exe"]}, ...]   # 批量请求
+
+方法：freeze / resume / status / subscribe；freeze 的参数为对象时可以带 "add_missing": true，
+先把未添加的进程加入配置（命令行 freeze 的行为）。所有请求都提交到 ProcessManager 的冻结队列，
+与界面发起的操作串行执行；批量请求中的各项一次性入队，按顺序执行。subscribe 之后，
+服务端在同一连接上推送 {"method": "event", "params": {"identifier": ..., "event": ...}} 通知。
+
+同步客户端 ControlClient 在 control_client.py 中（不导入 asyncio，供命令行快速启动），这里一并导出。
+"""
+import os
+import sys
+import json
+import socket
+import asyncio
+import logging
+import threading
+
+from freeze_queue import PRIORITY_INTERACTIVE
+from control_client import ControlClient, RpcError, default_address  # noqa: F401
+
+PARSE_ERROR = -32700
+INVALID_REQUEST = -32600
+METHOD_NOT_FOUND = -32601
+INVALID_PARAMS = -32602
+INTERNAL_ERROR = -32603
+
+
+class ControlServer:
+    """JSON-RPC 控制端点，请求经由 ProcessManager 的冻结队列执行"""
+
+    def __init__(self, process_manager, address=None):
+        self.process_manager = process_manager
+        self.address = address or default_address()
+        self._loop = None
+        self._thread = None
+        self._servers = []
+        self._subscribers = set()  # 订阅了事件的 StreamWriter
+        self._methods = {
+            "freeze": self._freeze,
+            "resume": self._resume,
+            "status": self._status,
+            "subscribe": self._subscribe,
+        }
+
+    def start(self):
+        """启动服务线程，地址被其他实例占用或无法监听时抛出 OSError"""
+        ready = threading.Event()
+        errors = []
+        self._thread = threading.Thread(target=self._run, args=(ready, errors), name="control-server", daemon=True)
+        self._thread.start()
+        ready.wait()
+        if errors:
+            self._thread.join()
+            raise errors[0]
+        self.process_manager.add_listener(self._on_state_change)
+        logging.info(f"Control server listening on {self.address}")
+
+    def stop(self):
+        if self._loop is None:
+            return
+        self.process_manager.remove_listener(self._on_state_change)
+        self._loop.call_soon_threadsafe(self._loop.stop)
+        self._thread.join(timeout=2)
+        self._loop = None
+
+    def _run(self, ready, errors):
+        loop = asyncio.new_event_loop()
+        asyncio.set_event_loop(loop)
+        try:
+            loop.run_until_complete(self._listen())
+        except OSError as e:
+            errors.append(e)
+            ready.set()
+            loop.close()
+            return
+        self._loop = loop
+        ready.set()
+        try:
+            loop.run_forever()
+        finally:
+            for server in self._servers:
+                server.close()
+            # 取消仍在等待请求的连接，让它们在事件循环关闭前关闭传输
+            tasks = asyncio.all_tasks(loop)
+            for task in tasks:
+                task.cancel()
+            loop.run_until_complete(asyncio.gather(*tasks, return_exceptions=True))
+            if sys.platform != 'win32' and os.path.exists(self.address):
+                os.unlink(self.address)
+            loop.close()
+
+    async def _listen(self):
+        if sys.platform == 'win32':
+            loop = asyncio.get_running_loop()
+
+            def protocol_factory():
+                reader = asyncio.StreamReader()
+                return asyncio.StreamReaderProtocol(reader, self._handle_client)
+
+            # ProactorEventLoop 的命名管道服务端
+            self._servers = await loop.start_serving_pipe(protocol_factory, self.address)
+            return
+        self._remove_stale_socket()
+        server = await asyncio.start_unix_server(self._handle_client, path=self.address)
+        os.chmod(self.address, 0o600)  # 只允许当前用户连接
+        self._servers = [server]
+
+    def _remove_stale_socket(self):
+        """删除上次异常退出遗留的套接字文件；仍有实例在监听时抛出 OSError"""
+        if not os.path.exists(self.address):
+            return
+        probe = socket.socket(socket.AF_UNIX, socket.SOCK_STREAM)
+        try:
+            probe.connect(self.address)
+        except OSError:
+            os.unlink(self.address)
+        else:
+            raise OSError(f"another instance is already listening on {self.address}")
+        finally:
+            probe.close()
+
+    async def _handle_client(self, reader, writer):
+        try:
+            while True:
+                line = await reader.readline()
+                if not line:
+                    break
+                if not line.strip():
+                    continue
+                response = await self._handle_message(line, writer)
+                if response is not None:
+                    writer.write(json.dumps(response, ensure_ascii=False).encode('utf-8') + b'\n')
+                    await writer.drain()
+        except (ConnectionError, asyncio.IncompleteReadError, asyncio.LimitOverrunError, asyncio.CancelledError):
+            # 停止服务时取消连接任务；吞掉 CancelledError，否则 3.11 的 StreamReaderProtocol 回调会报错
+            pass
+        finally:
+            self._subscribers.discard(writer)
+            writer.close()
+
+    async def _handle_message(self, line, writer):
+        try:
+            message = json.loads(line)
+        except ValueError:
+            return self._error(None, PARSE_ERROR, "Parse error")
+        if isinstance(message, list):
+            if not message:
+                return self._error(None, INVALID_REQUEST, "Empty batch")
+            # 批量请求一次性入队，由冻结队列按顺序执行
+            responses = await asyncio.gather(*(self._handle_request(request, writer) for request in message))
+            responses = [response for response in responses if response is not None]
+            return responses or None
+        return await self._handle_request(message, writer)
+
+    async def _handle_request(self, request, writer):
+        if not isinstance(request, dict) or request.get("jsonrpc") != "2.0" or not isinstance(request.get("method"), str):
+            return self._error(None, INVALID_REQUEST, "Invalid request")
+        request_id = request.get("id")
+        is_notification = "id" not in request
+        method = self._methods.get(request["method"])
+        try:
+            if method is None:
+                raise RpcError(METHOD_NOT_FOUND, f"Method not found: {request['method']}")
+            result = await method(request.get("params"), writer)
+        except RpcError as e:
+            return None if is_notification else self._error(request_id, e.code, e.message)
+        except Exception as e:
+            logging.error(f"Control request {request['method']} failed: {str(e)}")
+            return None if is_notification else self._error(request_id, INTERNAL_ERROR, str(e))
+        if is_notification:
+            return None
+        return {"jsonrpc": "2.0", "id": request_id, "result": result}
+
+    @staticmethod
+    def _error(request_id, code, message):
+        return {"jsonrpc": "2.0", "id": request_id, "error": {"code": code, "message": message}}
+
+    @staticmethod
+    def _identifiers(params, required=True):
+        """参数可以是标识符列表，或 {"identifiers": [...]}"""
+        if isinstance(params, dict):
+            params = params.get("identifiers")
+        if params is None and not required:
+            return None
+        if not isinstance(params, list) or not params or not all(isinstance(item, str) for item in params):
+            raise RpcError(INVALID_PARAMS, "identifiers must be a non-empty list of strings")
+        return params
+
+    def _submit(self, func, *args, keys=()):
+        future = self.process_manager.executor.submit(func, *args, priority=PRIORITY_INTERACTIVE, keys=keys)
+        return asyncio.wrap_future(future)
+
+    async def _freeze(self, params, writer):
+        identifiers = self._identifiers(params)
+        add_missing = isinstance(params, dict) and params.get("add_missing") is True
+
+        def freeze():
+            if add_missing:
+                for identifier in identifiers:
+                    if identifier not in self.process_manager.processes:
+                        self.process_manager.add_process(identifier, identifier)
+            return self.process_manager.freeze_many(identifiers)
+        return await self._submit(freeze, keys=identifiers)
+
+    async def _resume(self, params, writer):
+        identifiers = self._identifiers(params)
+        return await self._submit(self.process_manager.resume_many, identifiers, keys=identifiers)
+
+    async def _status(self, params, writer):
+        identifiers = self._identifiers(params, required=False)
+
+        def status():
+            self.process_manager.refresh_index()
+            return self.process_manager.status(identifiers)
+        return await self._submit(status)
+
+    async def _subscribe(self, params, writer):
+        self._subscribers.add(writer)
+        return {"subscribed": True}
+
+    def _on_state_change(self, identifier, event):
+        """ProcessManager 回调（任意线程），转到事件循环中推送给订阅者"""
+        loop = self._loop
+        if loop is not None and self._subscribers:
+            loop.call_soon_threadsafe(self._broadcast, identifier, event)
+
+    def _broadcast(self, identifier, event):
+        data = self.process_manager.processes.get(identifier, {})
+        message = {"jsonrpc": "2.0", "method": "event",
+                   "params": {"identifier": identifier, "event": event,
+                              "is_frozen": data.get("is_frozen", False)}}
+        payload = json.dumps(message, ensure_ascii=False).encode('utf-8') + b'\n'
+        for writer in list(self._subscribers):
+            if writer.is_closing():
+                self._subscribers.discard(writer)
+                continue
+            writer.write(payload)
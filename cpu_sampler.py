@@ -0,0 +1,214 @@
+"""CPU 占用采样与阈值自动冻结
+
+- CpuSampler: 一次批量读取一组进程的累计CPU时间；Linux 下直接读 /proc/<pid>/stat，
+  其他平台使用 psutil 并缓存 Process 对象
+- CpuThresholdPolicy: 为设置了 cpu_rule 的条目维护滑动窗口平均占用，
+  持续超过阈值（可限定只在后台时）即通过 ProcessManager 冻结
+
+cpu_rule 格式: {"threshold": 40, "window": 30, "background_only": true}，
+threshold 为占整机CPU的百分比（与任务管理器一致），window 单位为秒。
+"""
+import os
+import sys
+import time
+import errno
+import logging
+import threading
+from collections import deque
+
+import psutil
+
+try:
+    import resource
+except ImportError:  # Windows 没有 resource 模块
+    resource = None
+
+from freeze_queue import PRIORITY_BACKGROUND
+
+# 所有保持打开的 /proc 描述符缓存（本模块和 process_monitor）合计不超过 RLIMIT_NOFILE 软上限的一半，
+# 其余留给套接字、日志文件、PSI 触发器等
+FD_CACHE_SHARE = 0.25  # 每个缓存可以使用软上限的比例
+
+
+def fd_cache_limit(cap):
+    """描述符缓存的容量：不超过 cap，也不超过 RLIMIT_NOFILE 软上限的 FD_CACHE_SHARE"""
+    if resource is None:
+        return cap
+    soft, _ = resource.getrlimit(resource.RLIMIT_NOFILE)
+    if soft == resource.RLIM_INFINITY:
+        return cap
+    return min(cap, int(soft * FD_CACHE_SHARE))
+
+
+class CpuSampler:
+    """批量读取进程的累计CPU时间（秒）"""
+
+    MAX_OPEN_FILES = 2000  # 最多缓存的 /proc/<pid>/stat 文件描述符数量，实际容量见 fd_cache_limit
+
+    def __init__(self):
+        self.max_open_files = fd_cache_limit(self.MAX_OPEN_FILES)
+        self.use_procfs = sys.platform.startswith('linux')
+        self._clock_ticks = os.sysconf('SC_CLK_TCK') if self.use_procfs else None
+        self._stat_fds = {}  # Linux 下保持打开的 {pid: stat 文件描述符}，每次用 pread 重新读取
+        self._processes = {}  # 非Linux平台缓存的 psutil.Process 对象
+
+    def read(self, pids):
+        """返回 {pid: 累计CPU秒数}，已退出或无权访问的进程不在结果中"""
+        if self.use_procfs:
+            return self._read_procfs(pids)
+        return self._read_psutil(pids)
+
+    def close(self):
+        for fd in self._stat_fds.values():
+            os.close(fd)
+        self._stat_fds = {}
+
+    def _read_procfs(self, pids):
+        times = {}
+        ticks = self._clock_ticks
+        old_fds = self._stat_fds
+        fds = {}
+        for pid in pids:
+            fd = old_fds.pop(pid, None)
+            try:
+                if fd is None:
+                    fd = os.open(f'/proc/{pid}/stat', os.O_RDONLY)
+                # 同一个文件描述符可以反复 pread，省去每次 open/close 的系统调用
+                data = os.pread(fd, 512, 0)
+            except OSError as e:
+                # 进程已退出（旧描述符读取返回 ESRCH）；PID 被复用时下次重新打开
+                if fd is not None:
+                    os.close(fd)
+                if e.errno in (errno.EMFILE, errno.ENFILE):
+                    logging.warning(f"CPU sampler ran out of file descriptors reading {pid}: {str(e)}")
+                continue
+            # 进程名可能包含空格和括号，从最后一个右括号之后开始分割
+            fields = data[data.rindex(b')') + 2:].split(None, 13)
+            times[pid] = (int(fields[11]) + int(fields[12])) / ticks  # utime + stime
+            if len(fds) < self.max_open_files:
+                fds[pid] = fd
+            else:
+                os.close(fd)
+        # 不再采样的进程关闭其描述符
+        for fd in old_fds.values():
+            os.close(fd)
+        self._stat_fds = fds
+        return times
+
+    def _read_psutil(self, pids):
+        times = {}
+        processes = {}
+        for pid in pids:
+            proc = self._processes.get(pid)
+            try:
+                if proc is None:
+                    proc = psutil.Process(pid)
+                cpu = proc.cpu_times()
+            except (psutil.NoSuchProcess, psutil.AccessDenied, psutil.ZombieProcess):
+                continue
+            times[pid] = cpu.user + cpu.system
+            processes[pid] = proc
+        # 只保留仍在采样的进程，避免缓存无限增长
+        self._processes = processes
+        return times
+
+
+class CpuThresholdPolicy:
+    """按 cpu_rule 自动冻结持续高占用的条目，采样在单独的线程中进行"""
+
+    def __init__(self, process_manager, interval=1.0, foreground=None, sampler=None):
+        self.process_manager = process_manager
+        self.interval = interval
+        self.foreground = foreground or (lambda: set())  # 返回当前位于前台的条目集合
+        self.sampler = sampler or CpuSampler()
+        self.cpu_count = psutil.cpu_count() or 1
+        self.history = {}  # {标识符: deque[(时间, 占用百分比)]}
+        self.usage = {}  # {标识符: 最近一次采样的占用百分比}
+        self._last_times = {}  # {pid: 累计CPU秒数}
+        self._last_sample = None
+        self._stop_event = threading.Event()
+        self._thread = None
+
+    def start(self):
+        self._thread = threading.Thread(target=self._run, name="cpu-sampler", daemon=True)
+        self._thread.start()
+        logging.info(f"CPU threshold policy started, interval {self.interval}s")
+
+    def stop(self):
+        self._stop_event.set()
+        if self._thread is not None:
+            self._thread.join(timeout=2)
+            self._thread = None
+        self.sampler.close()
+
+    def _run(self):
+        while not self._stop_event.wait(self.interval):
+            try:
+                self.tick()
+            except Exception as e:
+                logging.error(f"CPU sampling failed: {str(e)}")
+
+    def ruled_entries(self):
+        """返回 {标识符: cpu_rule}，只包含未冻结且设置了规则的条目"""
+        return {identifier: data["cpu_rule"]
+                for identifier, data in list(self.process_manager.processes.items())
+                if data.get("cpu_rule") and not data.get("is_frozen", False)}
+
+    def tick(self, now=None):
+        """采样一次并检查所有规则，返回本次触发冻结的条目列表"""
+        now = time.monotonic() if now is None else now
+        entries = self.ruled_entries()
+        for identifier in set(self.history) | set(self.usage):
+            if identifier not in entries:
+                self.history.pop(identifier, None)
+                self.usage.pop(identifier, None)
+        if not entries:
+            self._last_times = {}
+            self._last_sample = now
+            return []
+
+        self.process_manager.refresh_index()
+        targets = {identifier: self.process_manager.target_pids(identifier) for identifier in entries}
+        all_pids = set()
+        for pids in targets.values():
+            all_pids.update(pids)
+        times = self.sampler.read(all_pids)
+
+        elapsed = now - self._last_sample if self._last_sample is not None else None
+        last_times = self._last_times
+        self._last_times = times
+        self._last_sample = now
+        if not elapsed or elapsed <= 0:
+            return []
+
+        triggered = []
+        foreground = self.foreground()
+        for identifier, rule in entries.items():
+            busy = 0.0
+            for pid in targets[identifier]:
+                before = last_times.get(pid)
+                after = times.get(pid)
+                # 新进程或PID被复用（累计时间变小）时本轮不计入
+                if before is not None and after is not None and after >= before:
+                    busy += after - before
+            percent = busy / elapsed / self.cpu_count * 100
+            self.usage[identifier] = percent
+
+            window = float(rule.get("window", 30))
+            samples = self.history.setdefault(identifier, deque())
+            samples.append((now, percent))
+            while samples and samples[0][0] < now - window:
+                samples.popleft()
+            # 窗口被采样填满之前不做判断
+            if now - samples[0][0] < window - self.interval:
+                continue
+            average = sum(value for _, value in samples) / len(samples)
+            if average <= float(rule.get("threshold", 100)):
+                continue
+            if rule.get("background_only", True) and identifier in foreground:
+                continue
+            logging.info(f"CPU policy: {identifier} averaged {average:.1f}% over {window:.0f}s, freezing")
+            self.history.pop(identifier, None)
+            self.process_manager.freeze_many_async([identifier], priority=PRIORITY_BACKGROUND)
+            triggered.append(identifier)
+        return triggered
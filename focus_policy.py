@@ -0,0 +1,270 @@
+"""前台焦点驱动的自动冻结策略
+
+条目设置了 idle_freeze_seconds 后，离开前台超过该时间即自动冻结，
+它的窗口重新被激活时立即解冻。策略冻结时不隐藏窗口，否则窗口无法再被激活。
+启动后新添加的条目、在后台被手动解冻的条目同样会重新开始计时。
+
+- DeadlineScheduler: 基于堆的定时器，所有条目的截止时间共用一个线程，空闲时不消耗CPU
+- ForegroundSource: 前台窗口变化事件源；Windows 下使用 SetWinEventHook，
+  FakeForegroundSource 用于测试和其他平台
+- FocusPolicy: 把前台变化映射到 ProcessManager 的条目并安排冻结/解冻
+"""
+import sys
+import time
+import heapq
+import logging
+import itertools
+import threading
+
+from freeze_queue import PRIORITY_INTERACTIVE, PRIORITY_BACKGROUND
+
+
+class DeadlineScheduler:
+    """每个 key 最多一个截止时间，到期时在调度线程中调用 callback(key)"""
+
+    def __init__(self, callback, name="deadline-scheduler"):
+        self.callback = callback
+        self._heap = []  # [(deadline, seq, key)]，被取消或重新安排的条目延迟删除
+        self._deadlines = {}  # {key: (deadline, seq)}
+        self._counter = itertools.count()
+        self._condition = threading.Condition()
+        self._running = True
+        self._thread = threading.Thread(target=self._run, name=name, daemon=True)
+        self._thread.start()
+
+    def schedule(self, key, deadline):
+        """安排（或重新安排）key 在 deadline（time.monotonic 时间）到期"""
+        with self._condition:
+            seq = next(self._counter)
+            self._deadlines[key] = (deadline, seq)
+            heapq.heappush(self._heap, (deadline, seq, key))
+            # 只有新截止时间成为最早的一个时才需要唤醒调度线程
+            if self._heap[0][1] == seq:
+                self._condition.notify()
+
+    def cancel(self, key):
+        with self._condition:
+            self._deadlines.pop(key, None)
+
+    def deadline_of(self, key):
+        with self._condition:
+            entry = self._deadlines.get(key)
+            return entry[0] if entry else None
+
+    def __len__(self):
+        with self._condition:
+            return len(self._deadlines)
+
+    def stop(self):
+        with self._condition:
+            self._running = False
+            self._condition.notify()
+        self._thread.join(timeout=2)
+
+    def _pop_due(self):
+        """弹出所有已到期的 key，返回 (到期列表, 下一个截止时间)"""
+        due = []
+        now = time.monotonic()
+        while self._heap:
+            deadline, seq, key = self._heap[0]
+            if self._deadlines.get(key) != (deadline, seq):
+                heapq.heappop(self._heap)  # 已取消或已重新安排
+                continue
+            if deadline > now:
+                return due, deadline
+            heapq.heappop(self._heap)
+            del self._deadlines[key]
+            due.append(key)
+        return due, None
+
+    def _run(self):
+        while True:
+            with self._condition:
+                if not self._running:
+                    return
+                due, next_deadline = self._pop_due()
+                if not due:
+                    timeout = None if next_deadline is None else max(0.0, next_deadline - time.monotonic())
+                    self._condition.wait(timeout)
+                    continue
+            for key in due:
+                try:
+                    self.callback(key)
+                except Exception as e:
+                    logging.error(f"Deadline callback failed for {key}: {str(e)}")
+
+
+class ForegroundSource:
+    """前台窗口变化事件源，变化时调用 callback(pid)"""
+    name = "base"
+
+    def start(self, callback):
+        raise NotImplementedError
+
+    def stop(self):
+        pass
+
+
+class FakeForegroundSource(ForegroundSource):
+    """手动触发前台变化，用于测试或没有窗口系统的平台"""
+    name = "fake"
+
+    def __init__(self):
+        self.callback = None
+
+    def start(self, callback):
+        self.callback = callback
+
+    def activate(self, pid):
+        """模拟 pid 的窗口被激活"""
+        if self.callback:
+            self.callback(pid)
+
+
+class Win32ForegroundSource(ForegroundSource):
+    """Windows: 通过 SetWinEventHook(EVENT_SYSTEM_FOREGROUND) 接收前台窗口切换事件"""
+    name = "win32"
+
+    EVENT_SYSTEM_FOREGROUND = 0x0003
+    WINEVENT_OUTOFCONTEXT = 0x0000
+    WM_QUIT = 0x0012
+
+    def __init__(self, window_hider):
+        self.window_hider = window_hider  # 复用 WindowHider 的 窗口 -> PID 映射
+        self.callback = None
+        self._thread = None
+        self._thread_id = None
+
+    @classmethod
+    def is_available(cls):
+        return sys.platform == 'win32'
+
+    def start(self, callback):
+        self.callback = callback
+        ready = threading.Event()
+        self._thread = threading.Thread(target=self._run, args=(ready,), name="foreground-hook", daemon=True)
+        self._thread.start()
+        ready.wait(timeout=2)
+
+    def stop(self):
+        if self._thread_id is not None:
+            import ctypes
+            ctypes.windll.user32.PostThreadMessageW(self._thread_id, self.WM_QUIT, 0, 0)
+            self._thread.join(timeout=2)
+            self._thread_id = None
+
+    def _run(self, ready):
+        import ctypes
+        from ctypes import wintypes
+
+        user32 = ctypes.windll.user32
+        kernel32 = ctypes.windll.kernel32
+        WinEventProc = ctypes.WINFUNCTYPE(None, wintypes.HANDLE, wintypes.DWORD, wintypes.HWND,
+                                          wintypes.LONG, wintypes.LONG, wintypes.DWORD, wintypes.DWORD)
+
+        def on_event(hook, event, hwnd, id_object, id_child, thread_id, event_time):
+            pid = self.window_hider.get_window_process_id(hwnd) if hwnd else None
+            if pid and self.callback:
+                try:
+                    self.callback(pid)
+                except Exception as e:
+                    logging.error(f"Foreground callback failed: {str(e)}")
+
+        # 回调对象必须在钩子存在期间保持引用
+        proc = WinEventProc(on_event)
+        user32.SetWinEventHook.restype = wintypes.HANDLE
+        hook = user32.SetWinEventHook(self.EVENT_SYSTEM_FOREGROUND, self.EVENT_SYSTEM_FOREGROUND,
+                                      0, proc, 0, 0, self.WINEVENT_OUTOFCONTEXT)
+        self._thread_id = kernel32.GetCurrentThreadId()
+        ready.set()
+        if not hook:
+            logging.error("SetWinEventHook failed, focus policy disabled")
+            return
+        msg = wintypes.MSG()
+        while user32.GetMessageW(ctypes.byref(msg), 0, 0, 0) > 0:
+            user32.TranslateMessage(ctypes.byref(msg))
+            user32.DispatchMessageW(ctypes.byref(msg))
+        user32.UnhookWinEvent(hook)
+
+
+class FocusPolicy:
+    """离开前台超过 idle_freeze_seconds 的条目自动冻结，窗口被激活时立即解冻"""
+
+    def __init__(self, process_manager, source):
+        self.process_manager = process_manager
+        self.source = source
+        self.scheduler = DeadlineScheduler(self._on_deadline, name="focus-policy")
+        self.foreground = set()  # 当前位于前台、受本策略管理的条目
+        self.foreground_identifiers = set()  # 当前位于前台的所有条目（供其他策略判断前后台）
+        self._lock = threading.Lock()
+
+    def start(self):
+        """为所有受管理的后台条目安排截止时间，然后开始接收前台变化和条目状态变化"""
+        for identifier in self.managed_identifiers():
+            self._schedule_if_background(identifier)
+        self.process_manager.add_listener(self.on_entry_event)
+        self.source.start(self.on_foreground)
+        logging.info(f"Focus policy started with source {self.source.name}")
+
+    def stop(self):
+        self.process_manager.remove_listener(self.on_entry_event)
+        self.source.stop()
+        self.scheduler.stop()
+
+    def idle_seconds(self, identifier):
+        data = self.process_manager.processes.get(identifier, {})
+        return data.get("idle_freeze_seconds", 0) or 0
+
+    def managed_identifiers(self):
+        return [identifier for identifier in list(self.process_manager.processes)
+                if self.idle_seconds(identifier) > 0]
+
+    def on_foreground(self, pid):
+        """前台窗口切换到 pid（可从任意线程调用）"""
+        matched = set(self.process_manager.identifiers_for_pid(pid))
+        self.foreground_identifiers = matched
+        active = {identifier for identifier in matched if self.idle_seconds(identifier) > 0}
+        now = time.monotonic()
+        with self._lock:
+            left = self.foreground - active
+            self.foreground = active
+
+        for identifier in active:
+            self.scheduler.cancel(identifier)
+            if self.process_manager.processes.get(identifier, {}).get("is_frozen", False):
+                logging.info(f"Focus policy: {identifier} activated, resuming")
+                self.process_manager.resume_many_async([identifier], priority=PRIORITY_INTERACTIVE)
+        for identifier in left:
+            self.scheduler.schedule(identifier, now + self.idle_seconds(identifier))
+
+    def on_entry_event(self, identifier, event):
+        """ProcessManager 状态变化回调（可能在工作线程中调用）"""
+        if event in ("added", "resumed"):
+            self._schedule_if_background(identifier)
+        elif event in ("removed", "frozen"):
+            self.scheduler.cancel(identifier)
+
+    def _schedule_if_background(self, identifier):
+        """未冻结、不在前台的受管理条目从现在开始计时"""
+        idle_seconds = self.idle_seconds(identifier)
+        if idle_seconds <= 0 or self.process_manager.processes.get(identifier, {}).get("is_frozen", False):
+            return
+        with self._lock:
+            if identifier in self.foreground:
+                return
+        self.scheduler.schedule(identifier, time.monotonic() + idle_seconds)
+
+    def _on_deadline(self, identifier):
+        with self._lock:
+            if identifier in self.foreground:
+                return
+        data = self.process_manager.processes.get(identifier)
+        if data is None or data.get("is_frozen", False) or self.idle_seconds(identifier) <= 0:
+            return
+        if not self.process_manager.resolve_pids(identifier):
+            # 进程没有在运行：过一个空闲周期再检查，之后启动的实例同样会被冻结
+            self.scheduler.schedule(identifier, time.monotonic() + self.idle_seconds(identifier))
+            return
+        logging.info(f"Focus policy: {identifier} idle in background, freezing")
+        # 不隐藏窗口：隐藏的窗口无法被激活，也就无法触发解冻
+        self.process_manager.freeze_many_async([identifier], priority=PRIORITY_BACKGROUND, hide_windows=False)
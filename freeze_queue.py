@@ -0,0 +1,89 @@
+"""冻结操作队列
+
+所有冻结/解冻操作都提交到 FreezeExecutor，由唯一的工作线程按优先级依次执行，
+调用方（Tk 主线程、托盘线程等）立即拿到 Future，不会被耗时的挂起操作阻塞，
+不同来源的操作也因此天然串行化。
+"""
+import queue
+import logging
+import itertools
+import threading
+from concurrent.futures import Future
+
+# 数值越小越先执行
+PRIORITY_INTERACTIVE = 0  # 用户点击
+PRIORITY_BATCH = 5  # 批量操作
+PRIORITY_BACKGROUND = 10  # 策略、后台任务
+
+
+class FreezeExecutor:
+    """带优先级的单线程执行器，同一优先级内按提交顺序执行"""
+
+    def __init__(self, name="freeze-worker"):
+        self._queue = queue.PriorityQueue()
+        self._counter = itertools.count()
+        self._pending = {}  # {key: 未完成的操作数}
+        self._lock = threading.Lock()
+        self._shutdown = False
+        self._thread = threading.Thread(target=self._worker, name=name, daemon=True)
+        self._thread.start()
+
+    def submit(self, func, *args, priority=PRIORITY_BACKGROUND, keys=(), **kwargs):
+        """提交操作，keys 为该操作涉及的条目标识符，用于查询 pending 状态"""
+        future = Future()
+        keys = tuple(keys)
+        with self._lock:
+            if self._shutdown:
+                raise RuntimeError("FreezeExecutor has been shut down")
+            for key in keys:
+                self._pending[key] = self._pending.get(key, 0) + 1
+        self._queue.put((priority, next(self._counter), future, func, args, kwargs, keys))
+        return future
+
+    def is_pending(self, key):
+        """条目是否有排队中或执行中的操作"""
+        with self._lock:
+            return key in self._pending
+
+    def pending_keys(self):
+        with self._lock:
+            return set(self._pending)
+
+    def shutdown(self, wait=True):
+        """停止接收新操作；已排队的操作仍会执行完"""
+        with self._lock:
+            if self._shutdown:
+                return
+            self._shutdown = True
+        # 哨兵排在所有操作之后
+        self._queue.put((float('inf'), next(self._counter), None, None, None, None, ()))
+        if wait:
+            self._thread.join()
+
+    def _worker(self):
+        while True:
+            _, _, future, func, args, kwargs, keys = self._queue.get()
+            if future is None:
+                break
+            if future.set_running_or_notify_cancel():
+                try:
+                    result = func(*args, **kwargs)
+                except BaseException as e:
+                    logging.error(f"Freeze operation {getattr(func, '__name__', func)} failed: {str(e)}")
+                    self._release(keys)
+                    future.set_exception(e)
+                else:
+                    self._release(keys)
+                    future.set_result(result)
+            else:
+                self._release(keys)
+
+    def _release(self, keys):
+        # 先更新 pending 再完成 Future，回调里查询到的就是最新状态
+        with self._lock:
+            for key in keys:
+                count = self._pending.get(key, 0) - 1
+                if count > 0:
+                    self._pending[key] = count
+                else:
+                    self._pending.pop(key, None)
@@ -0,0 +1,706 @@
+"""进程冻结器核心：进程管理、窗口隐藏和设置
+
+不依赖任何图形界面模块（tkinter、pystray、PIL、keyboard），导入时没有副作用，
+供图形界面、命令行和守护进程共用。
+"""
+import os
+import glob
+import json
+import time
+import logging
+import threading
+from concurrent.futures import ThreadPoolExecutor
+
+from suspend_backends import SuspendError, create_suspend_backend
+from process_index import ProcessIndex
+from freeze_queue import FreezeExecutor, PRIORITY_INTERACTIVE, PRIORITY_BATCH, PRIORITY_BACKGROUND
+from throttle import DutyCycleThrottler
+from latency import LatencyRecorder, OperationTimer
+from persistence import DebouncedWriter
+from rule_matcher import RuleResolver, validate_rule
+from window_backends import create_window_backend
+
+# 修改日志配置部分
+def setup_logging(settings=None):
+    """配置异步日志管道（见 log_pipeline），级别和轮转参数取自 settings，为空时使用默认值"""
+    from log_pipeline import start_logging
+
+    if settings is None:
+        return start_logging()
+    try:
+        return start_logging(level=settings.log_level, levels=settings.log_levels,
+                             console_level=settings.log_console_level,
+                             max_bytes=settings.log_max_bytes, backup_count=settings.log_backup_count)
+    except ValueError as e:
+        writer = start_logging()
+        logging.error(f"Invalid log settings, using defaults: {str(e)}")
+        return writer
+
+class ProcessManager:
+    MAX_BATCH_WORKERS = 8  # 批量冻结/解冻时的最大并发数
+
+    def __init__(self, settings):  # 修改：接收 settings 参数
+        self.config_file = "processes.json"
+        self.processes = {}
+        self.store = DebouncedWriter(self.config_file, self._snapshot_processes)  # 合并写入 processes.json
+        self._lock = threading.Lock()
+        self.settings = settings  # 使用传入的 settings 实例
+        self.process_index = ProcessIndex()  # 与 WindowHider、DragHandle 共用的进程索引
+        self.window_hider = WindowHider(self.process_index)
+        self.backend = create_suspend_backend(settings.suspend_backend)
+        logging.info(f"Using suspend backend: {self.backend.name}")
+        self.executor = FreezeExecutor()  # 所有冻结/解冻操作都经由此队列执行
+        self.error_handler = None  # 错误回调 (标题, 内容)，由界面设置
+        self.watcher = None  # 进程启动/退出监视器，见 start_watcher
+        self._auto_frozen = set()  # 已自动冻结的新实例 {(pid, create_time)}，避免重复挂起
+        self.throttler = DutyCycleThrottler(self.backend, self._throttle_pids)  # 限速状态的条目
+        self.latency = LatencyRecorder()  # 冻结/解冻各阶段的延迟统计
+        self.listeners = []  # 状态变化回调 (标识符, 事件)，可能在工作线程中调用
+        self.rules = RuleResolver(self.process_index)  # 所有条目编译成的组合匹配器，见 rule_matcher
+        self.load_processes()
+
+    def load_processes(self):
+        if os.path.exists(self.config_file):
+            try:
+                with open(self.config_file, 'r') as f:
+                    loaded_processes = json.load(f)
+                    # 确保所有进程都有name字段
+                    for proc_id, data in loaded_processes.items():
+                        if "name" not in data:
+                            data["name"] = proc_id  # 如果没有名称，使用进程ID作为默认名称
+                    self.processes = loaded_processes
+            except Exception as e:
+                logging.error(f"加载进程配置文件失败: {str(e)}")
+                self.processes = {}
+        self.rebuild_rules()
+
+    def rebuild_rules(self):
+        """按当前条目重新编译规则匹配器，直接替换 processes 后需要调用"""
+        rules = {}
+        for identifier, data in list(self.processes.items()):
+            rule = self._rule_of(identifier, data)
+            if rule is not None:
+                rules[identifier] = rule
+        self.rules.set_rules(rules)
+
+    @staticmethod
+    def _rule_of(identifier, data):
+        """条目的匹配规则；PID 条目没有规则"""
+        if data.get("rule"):
+            return data["rule"]
+        if not identifier.isdigit():
+            return {"name": glob.escape(identifier)}  # 进程名按字面匹配
+        return None
+
+    def save_processes(self):
+        """请求保存 processes.json，由 store 在后台合并写入"""
+        self.store.schedule()
+
+    def _snapshot_processes(self):
+        """在锁内复制条目，供保存线程在锁外序列化；条目的增删和状态修改都在同一把锁内进行"""
+        with self._lock:
+            return {identifier: dict(data) for identifier, data in self.processes.items()}
+
+    def flush(self):
+        """立即写入尚未保存的进程配置和设置，退出前调用"""
+        self.store.flush()
+        self.settings.flush()
+
+    def add_process(self, identifier, name="", is_frozen=False, include_children=False,
+                    idle_freeze_seconds=0, cpu_rule=None, priority=0, rule=None):
+        """添加条目；rule 为按名称/路径/命令行/用户匹配的规则（见 rule_matcher），格式错误时抛出 RuleError"""
+        if rule is not None:
+            validate_rule(rule)
+        entry = {
+            "name": name,
+            "is_frozen": is_frozen,
+            "include_children": include_children,  # 是否连同子进程整棵树一起冻结
+            "idle_freeze_seconds": idle_freeze_seconds,  # 离开前台多久后自动冻结，0表示不自动冻结
+            "cpu_rule": cpu_rule,  # CPU占用阈值规则，见 cpu_sampler.CpuThresholdPolicy
+            "priority": priority,  # 优先级，内存压力时先冻结优先级低的条目
+            "throttle_percent": 0  # 限速状态下每个周期运行的百分比，0表示不限速
+        }
+        if rule is not None:
+            entry["rule"] = rule  # 没有规则时按标识符匹配进程名或PID
+        with self._lock:
+            self.processes[identifier] = entry
+        # 只编译、求值这一条规则，不重新编译全部条目
+        self.rules.update_rule(identifier, self._rule_of(identifier, entry))
+        self.save_processes()
+        self._notify(identifier, "added")
+
+    def remove_process(self, identifier):
+        if identifier in self.processes:
+            self.throttler.remove(identifier)
+            self.latency.remove_target(identifier)
+            # 在冻结队列中执行，排在该条目已提交的操作之后
+            self.executor.submit(self._release_backend_group, identifier)
+            with self._lock:
+                self.processes.pop(identifier, None)
+            self.rules.update_rule(identifier, None)
+            self.save_processes()
+            self._notify(identifier, "removed")
+
+    def _release_backend_group(self, identifier):
+        """释放后端为条目保留的资源（如 cgroup 子组），条目已被重新添加时跳过"""
+        if identifier in self.processes:
+            return
+        try:
+            self.backend.release_group(identifier)
+        except SuspendError as e:
+            logging.error(f"Failed to release {identifier} from backend {self.backend.name}: {str(e)}")
+
+    def add_listener(self, callback):
+        """订阅条目状态变化，callback(标识符, 事件)；事件为 added/removed/frozen/resumed/throttled/unthrottled"""
+        self.listeners.append(callback)
+
+    def remove_listener(self, callback):
+        if callback in self.listeners:
+            self.listeners.remove(callback)
+
+    def _notify(self, identifier, event):
+        for callback in list(self.listeners):
+            try:
+                callback(identifier, event)
+            except Exception as e:
+                logging.error(f"State listener failed for {identifier} {event}: {str(e)}")
+
+    def refresh_index(self):
+        """刷新进程索引；实时监视器运行时索引已由事件维护，无需再比较进程表"""
+        if self.watcher is None or not self.watcher.is_live:
+            self.process_index.refresh()
+
+    def start_watcher(self):
+        """启动进程监视器：维护进程索引，并自动冻结已冻结条目新启动的实例"""
+        if self.watcher is not None:
+            return
+        # 按需导入，一次性的命令行操作用不到监视器
+        from process_watcher import create_process_watcher
+        self.process_index.refresh()
+        self.watcher = create_process_watcher()
+        self.watcher.on_start(self._on_process_start)
+        self.watcher.on_exit(self._on_process_exit)
+        self.watcher.start()
+
+    def stop_watcher(self):
+        if self.watcher is not None:
+            self.watcher.stop()
+            self.watcher = None
+
+    def _on_process_start(self, pid):
+        """监视器线程回调：新进程属于已冻结条目时立即排队冻结"""
+        name = self.process_index.add_pid(pid)
+        if not name:
+            return
+        for identifier in self.rules.identifiers_for(pid):
+            if self.processes.get(identifier, {}).get("is_frozen", False):
+                logging.info(f"New instance of frozen process {identifier} started: {pid}")
+                # 以最高优先级排队，与其他冻结操作串行执行
+                self.executor.submit(self._freeze_new_instance, identifier, pid,
+                                     priority=PRIORITY_INTERACTIVE)
+
+    def _on_process_exit(self, pid):
+        key = self.process_index.key_of(pid)
+        self._auto_frozen.discard(key)
+        self.process_index.remove_pid(pid)
+
+    def _freeze_new_instance(self, identifier, pid):
+        if not self.processes.get(identifier, {}).get("is_frozen", False):
+            return  # 排队期间条目已被解冻或删除
+        # 同一进程可能先后收到 fork 和 exec 两个事件
+        key = self.process_index.key_of(pid)
+        if key is None or key in self._auto_frozen:
+            return
+        self._auto_frozen.add(key)
+        timer = OperationTimer()
+        if self.settings.hide_window:
+            with timer.phase("hide"):
+                self.window_hider.hide_window_by_pid(pid)
+        with timer.phase("suspend"):
+            self.backend.suspend_group(identifier, [pid])
+        self.latency.record("auto_freeze", identifier, self.backend.name, timer)
+        logging.info(f"Auto-froze new instance of {identifier}: {pid}")
+
+    def identifiers_for_pid(self, pid):
+        """返回与该进程匹配的条目标识符（按PID、进程名或规则）"""
+        if self.process_index.name_of(pid) is None:
+            self.process_index.add_pid(pid)
+        matched = self.rules.identifiers_for(pid)
+        return [identifier for identifier in list(self.processes)
+                if identifier == str(pid) or identifier in matched]
+
+    def resolve_pids(self, identifier):
+        """将条目解析为PID列表（按规则，或按进程名/PID），使用前需先刷新 process_index"""
+        if self.processes.get(identifier, {}).get("rule"):
+            return self.rules.pids_for(identifier)
+        return self.process_index.pids_for(identifier)
+
+    def target_pids(self, identifier):
+        """条目需要操作的所有PID；启用 include_children 时包含整棵子进程树（父进程在前）"""
+        pids = self.resolve_pids(identifier)
+        if self.processes.get(identifier, {}).get("include_children", False):
+            pids = self.process_index.subtree(pids)
+        return pids
+
+    def _freeze_target(self, identifier, pids, timer=None, hide_windows=True):
+        """冻结单个条目的所有进程，失败时抛出异常（不保存配置）；timer 记录各阶段耗时"""
+        timer = timer or OperationTimer()
+        logging.info(f"Attempting to freeze process: {identifier} {pids} via {self.backend.name}")
+        if not pids:
+            raise SuspendError(f"未找到进程: {identifier}")
+        # 冻结取代限速状态
+        self.throttler.remove(identifier)
+        hide_windows = hide_windows and self.settings.hide_window
+        # 如果启用了窗口隐藏功能，先隐藏窗口
+        if hide_windows:
+            with timer.phase("hide"):
+                self.window_hider.hide_windows(pids)
+        try:
+            # 先冻结叶子进程，避免父进程在冻结过程中继续派生/唤醒子进程
+            with timer.phase("suspend"):
+                self.backend.suspend_group(identifier, pids[::-1])
+        except Exception:
+            # 如果冻结失败，恢复隐藏的窗口
+            if hide_windows:
+                self.window_hider.show_windows(pids)
+            raise
+        with self._lock:
+            # 操作执行期间条目可能已被删除
+            if identifier in self.processes:
+                self.processes[identifier]["is_frozen"] = True
+                self.processes[identifier]["throttle_percent"] = 0
+        logging.info(f"Successfully froze process: {identifier}")
+        self._notify(identifier, "frozen")
+
+    def _resume_target(self, identifier, pids, timer=None):
+        """解冻单个条目的所有进程，失败时抛出异常（不保存配置）；timer 记录各阶段耗时"""
+        timer = timer or OperationTimer()
+        logging.info(f"Attempting to resume process: {identifier} {pids} via {self.backend.name}")
+        # 从根进程开始解冻
+        with timer.phase("suspend"):
+            self.backend.resume_group(identifier, pids)
+        self._auto_frozen.difference_update(self.process_index.key_of(pid) for pid in pids)
+        with self._lock:
+            # 操作执行期间条目可能已被删除
+            if identifier in self.processes:
+                self.processes[identifier]["is_frozen"] = False
+        # 如果启用了窗口隐藏功能，在解冻后恢复窗口
+        if self.settings.hide_window:
+            with timer.phase("hide"):
+                self.window_hider.show_windows(pids)
+        logging.info(f"Successfully resumed process: {identifier}")
+        self._notify(identifier, "resumed")
+
+    def toggle_freeze(self, identifier):
+        if identifier in self.processes:
+            current_state = self.processes[identifier]["is_frozen"]
+            new_state = not current_state
+            
+            logging.info(f"Toggle freeze for process: {identifier}")
+            logging.info(f"Current state: {current_state}")
+            logging.info(f"New state: {new_state}")
+            
+            timer = OperationTimer()
+            try:
+                with timer.phase("resolve"):
+                    self.refresh_index()
+                    pids = self.target_pids(identifier)
+                if new_state:  # Freeze
+                    self._freeze_target(identifier, pids, timer)
+                else:  # Resume
+                    self._resume_target(identifier, pids, timer)
+                
+                with timer.phase("persist"):
+                    self.save_processes()
+                self.latency.record("freeze" if new_state else "resume", identifier,
+                                    self.backend.name, timer)
+                return True
+                
+            except SuspendError as e:
+                logging.error(f"Error executing suspend backend {self.backend.name}: {str(e)}")
+                self.report_error("错误", f"执行进程{identifier}操作失败: {str(e)}")
+                return False
+            except Exception as e:
+                logging.error(f"Unexpected error: {str(e)}")
+                self.report_error("错误", f"未知错误: {str(e)}")
+                return False
+        return False
+
+    def report_error(self, title, message):
+        """通过 error_handler 通知界面，操作可能运行在工作线程中"""
+        if self.error_handler:
+            self.error_handler(title, message)
+
+    def toggle_freeze_async(self, identifier, priority=PRIORITY_INTERACTIVE):
+        """在冻结队列中切换状态，返回 Future（结果同 toggle_freeze）"""
+        return self.executor.submit(self.toggle_freeze, identifier,
+                                    priority=priority, keys=[identifier])
+
+    def freeze_many_async(self, identifiers=None, priority=PRIORITY_BATCH, hide_windows=True):
+        """在冻结队列中批量冻结，返回 Future（结果同 freeze_many）"""
+        keys = list(self.processes) if identifiers is None else identifiers
+        return self.executor.submit(self.freeze_many, identifiers, hide_windows=hide_windows,
+                                    priority=priority, keys=keys)
+
+    def resume_many_async(self, identifiers=None, priority=PRIORITY_BATCH):
+        """在冻结队列中批量解冻，返回 Future（结果同 resume_many）"""
+        keys = list(self.processes) if identifiers is None else identifiers
+        return self.executor.submit(self.resume_many, identifiers, priority=priority, keys=keys)
+
+    def is_pending(self, identifier):
+        """条目是否有尚未完成的冻结/解冻操作"""
+        return self.executor.is_pending(identifier)
+
+    def reconcile(self):
+        """一次批量检查所有条目的真实挂起状态，修正与 is_frozen 不一致的条目
+
+        返回被修正的条目列表。没有运行中的进程、或当前平台无法判断时保留原状态，
+        以便之后启动的实例仍按已冻结处理。
+        """
+        self.refresh_index()
+        corrected = []
+        for identifier, data in list(self.processes.items()):
+            if self.throttler.is_throttled(identifier):
+                continue  # 限速中的进程会周期性地处于挂起状态
+            pids = self.target_pids(identifier)
+            actual = self.backend.is_group_suspended(identifier, pids)
+            if actual is None or actual == data.get("is_frozen", False):
+                continue
+            logging.warning(f"Process {identifier} is_frozen={data.get('is_frozen', False)} "
+                            f"but actual state is {actual}, correcting")
+            with self._lock:
+                if identifier in self.processes:
+                    self.processes[identifier]["is_frozen"] = actual
+            # 进程已在外部被恢复时，把隐藏的窗口也显示出来
+            if not actual and self.settings.hide_window:
+                self.window_hider.show_windows(pids)
+            corrected.append(identifier)
+            self._notify(identifier, "frozen" if actual else "resumed")
+        if corrected:
+            self.save_processes()
+        return corrected
+
+    def reconcile_async(self, priority=PRIORITY_BACKGROUND):
+        """在冻结队列中执行 reconcile，返回 Future"""
+        return self.executor.submit(self.reconcile, priority=priority)
+
+    def _throttle_pids(self, identifier):
+        """限速调度线程定期调用，重新解析条目的进程"""
+        self.refresh_index()
+        return self.target_pids(identifier)
+
+    def restore_throttles(self):
+        """恢复配置中保存的限速状态；只应由常驻进程（界面、守护进程）调用"""
+        for identifier, data in self.processes.items():
+            percent = data.get("throttle_percent", 0)
+            if percent and not data.get("is_frozen", False):
+                self.throttler.set(identifier, percent / 100)
+
+    def set_throttle(self, identifier, percent):
+        """切换到限速状态，每个周期只运行 percent% 的时间；percent 为 0 时取消限速"""
+        data = self.processes.get(identifier)
+        if data is None:
+            return False
+        try:
+            if percent:
+                if data.get("is_frozen", False):
+                    self.refresh_index()
+                    self._resume_target(identifier, self.target_pids(identifier))
+                self.throttler.set(identifier, percent / 100)
+            else:
+                self.throttler.remove(identifier)
+        except Exception as e:
+            logging.error(f"Failed to throttle process {identifier}: {str(e)}")
+            self.report_error("错误", f"设置进程{identifier}限速失败: {str(e)}")
+            return False
+        with self._lock:
+            if identifier in self.processes:
+                self.processes[identifier]["throttle_percent"] = percent
+        self.save_processes()
+        self._notify(identifier, "throttled" if percent else "unthrottled")
+        return True
+
+    def set_throttle_async(self, identifier, percent, priority=PRIORITY_INTERACTIVE):
+        """在冻结队列中设置限速，返回 Future（结果同 set_throttle）"""
+        return self.executor.submit(self.set_throttle, identifier, percent,
+                                    priority=priority, keys=[identifier])
+
+    def throttle_status(self, identifier):
+        """返回 (设定百分比, 实测百分比)，未限速时返回 None；尚未测得时实测值为 None"""
+        duty = self.throttler.duty_of(identifier)
+        if duty is None:
+            return None
+        measured = self.throttler.measured_duty(identifier)
+        return duty * 100, None if measured is None else measured * 100
+
+    def entry_state(self, identifier):
+        """条目的当前状态：frozen / throttled / running / not running，使用前需先刷新 process_index"""
+        data = self.processes[identifier]
+        if data.get("is_frozen", False):
+            return "frozen"
+        if not self.target_pids(identifier):
+            return "not running"
+        if self.throttler.is_throttled(identifier) or data.get("throttle_percent", 0):
+            return "throttled"
+        return "running"
+
+    def status(self, identifiers=None):
+        """返回条目状态列表，默认包含所有条目，使用前需先刷新 process_index"""
+        rows = []
+        for identifier in list(self.processes) if identifiers is None else identifiers:
+            data = self.processes.get(identifier)
+            if data is None:
+                continue
+            throttle = self.throttle_status(identifier)
+            rows.append({
+                "identifier": identifier,
+                "name": data.get("name", identifier),
+                "state": self.entry_state(identifier),
+                "throttle_percent": data.get("throttle_percent", 0),
+                "measured_duty": None if throttle is None or throttle[1] is None else round(throttle[1], 1),
+                "pids": self.target_pids(identifier),
+            })
+        return rows
+
+    def freeze_many(self, identifiers=None, hide_windows=True):
+        """批量冻结，默认处理所有未冻结的条目；返回 {标识符: 结果}
+
+        hide_windows 为 False 时即使开启了窗口隐藏也保留窗口（如需要靠激活窗口来解冻的策略）
+        """
+        return self._run_batch(identifiers, freeze=True, hide_windows=hide_windows)
+
+    def resume_many(self, identifiers=None):
+        """批量解冻，默认处理所有已冻结的条目；返回 {标识符: 结果}"""
+        return self._run_batch(identifiers, freeze=False)
+
+    def _run_batch(self, identifiers, freeze, hide_windows=True):
+        """只遍历一次进程表解析所有条目，再在有限大小的线程池中并发执行"""
+        if identifiers is None:
+            identifiers = list(self.processes)
+
+        results = {}
+        targets = []
+        for identifier in identifiers:
+            data = self.processes.get(identifier)
+            if data is None:
+                results[identifier] = {"success": False, "pids": [], "error": "未添加的进程"}
+            elif data.get("is_frozen", False) == freeze:
+                # 已处于目标状态，不重复挂起（NtSuspendProcess 会累加挂起计数）
+                results[identifier] = {"success": True, "pids": [], "error": None}
+            else:
+                targets.append(identifier)
+        if not targets:
+            return results
+
+        # 所有条目共用一次索引刷新，耗时计入每个条目的 resolve 阶段
+        batch_start = time.perf_counter()
+        refresh_timer = OperationTimer()
+        with refresh_timer.phase("resolve"):
+            self.refresh_index()
+        timers = {}
+
+        def run(identifier):
+            timer = timers[identifier] = OperationTimer(batch_start)
+            timer.phases.update(refresh_timer.phases)
+            with timer.phase("resolve"):
+                pids = self.target_pids(identifier)
+            try:
+                if freeze:
+                    self._freeze_target(identifier, pids, timer, hide_windows=hide_windows)
+                else:
+                    self._resume_target(identifier, pids, timer)
+                return {"success": True, "pids": pids, "error": None}
+            except Exception as e:
+                logging.error(f"Batch {'freeze' if freeze else 'resume'} failed for {identifier}: {str(e)}")
+                return {"success": False, "pids": pids, "error": str(e)}
+
+        logging.info(f"Batch {'freeze' if freeze else 'resume'} of {len(targets)} processes")
+        with ThreadPoolExecutor(max_workers=min(self.MAX_BATCH_WORKERS, len(targets))) as executor:
+            for identifier, result in zip(targets, executor.map(run, targets)):
+                results[identifier] = result
+
+        persist_timer = OperationTimer()
+        with persist_timer.phase("persist"):
+            self.save_processes()
+        for identifier in targets:
+            if results[identifier]["success"]:
+                timer = timers[identifier]
+                timer.phases.update(persist_timer.phases)
+                self.latency.record("freeze" if freeze else "resume", identifier, self.backend.name, timer)
+        return results
+
+class WindowHider:
+    def __init__(self, process_index=None, backend=None):
+        self.hidden_windows = {}  # 存储被隐藏的窗口信息，格式：{进程ID: {hwnd: 窗口信息}}
+        self.process_index = process_index or ProcessIndex()
+        self.backend = backend or create_window_backend()
+    
+    def get_window_title(self, hwnd):
+        """获取窗口标题"""
+        return self.backend.title(hwnd)
+    
+    def get_window_process_id(self, hwnd):
+        """获取窗口对应的进程ID"""
+        return self.backend.window_pid(hwnd)
+    
+    def get_process_id_by_name(self, process_name):
+        """通过进程名称获取进程ID列表"""
+        logging.info(f"Attempting to get process ID for process: {process_name}")
+        self.process_index.refresh()
+        pids = self.process_index.pids_for(process_name)
+        logging.info(f"Successfully got process ID for process: {process_name} as {pids}")
+        return pids
+    
+    def hide_window_by_name(self, process_name):
+        """根据进程名称隐藏窗口"""
+        self.hide_windows(self.get_process_id_by_name(process_name))
+    
+    def show_windows_by_name(self, process_name):
+        """根据进程名称显示窗口"""
+        logging.info(f"Attempting to show windows by process name: {process_name}")
+        self.show_windows(self.get_process_id_by_name(process_name))
+        logging.info(f"Successfully showed windows by process name: {process_name}")
+    
+    def hide_window_by_pid(self, target_pid):
+        """根据进程ID隐藏窗口"""
+        self.hide_windows([target_pid])
+    
+    def show_windows_by_pid(self, target_pid):
+        """根据进程ID显示窗口"""
+        self.show_windows([target_pid])
+    
+    def windows_by_pid(self, pids):
+        """遍历一次顶层窗口，返回 {进程ID: [hwnd]}（只包含有可见窗口的进程）"""
+        targets = set(pids)
+        windows = {}
+        for hwnd, pid in self.backend.enumerate():
+            if pid in targets:
+                windows.setdefault(pid, []).append(hwnd)
+        return windows
+    
+    def hide_windows(self, pids):
+        """隐藏这些进程的所有可见窗口，所有进程共用一次窗口枚举"""
+        logging.info(f"Attempting to hide windows by pids: {pids}")
+        windows = self.windows_by_pid(pids)
+        if not windows:
+            return
+        foreground = self.backend.foreground()
+        hwnds = []
+        for pid, pid_hwnds in windows.items():
+            # 保存窗口状态
+            saved = self.hidden_windows.setdefault(pid, {})
+            for hwnd in pid_hwnds:
+                saved[hwnd] = {
+                    'title': self.get_window_title(hwnd),
+                    'is_foreground': hwnd == foreground
+                }
+            hwnds.extend(pid_hwnds)
+        self.backend.hide(hwnds)
+        logging.info(f"Successfully hid {len(hwnds)} windows of {len(windows)} processes")
+    
+    def show_windows(self, pids):
+        """显示这些进程之前被隐藏的窗口"""
+        hwnds = []
+        foreground = None
+        for pid in pids:
+            saved = self.hidden_windows.pop(pid, None)
+            if not saved:
+                continue
+            for hwnd, info in saved.items():
+                hwnds.append(hwnd)
+                if info['is_foreground']:
+                    foreground = hwnd
+        if not hwnds:
+            return
+        self.backend.show(hwnds)
+        # 如果之前是前台窗口，恢复其状态
+        if foreground is not None:
+            try:
+                self.backend.set_foreground(foreground)
+            except Exception as e:
+                logging.warning(f"Failed to restore foreground window {foreground}: {str(e)}")
+
+class Settings:
+    def __init__(self):
+        self.config_file = "settings.json"
+        self.store = DebouncedWriter(self.config_file, self.to_dict, indent=4)  # 合并写入 settings.json
+        self.show_icon_count = True
+        self.icon_number_color = '#ffffff'  # white
+        self.icon_shadow_color = '#007bff'  # blue
+        self.hide_window = False  # 在冻结时隐藏窗口
+        self.always_on_top = False
+        self.toggle_hotkey = 'ctrl+alt+f'  # 新增：默认快捷键
+        self.suspend_backend = 'auto'  # 进程挂起后端：auto/ntdll/signal/cgroup/pssuspend
+        self.watch_new_processes = True  # 自动冻结已冻结进程新启动的实例
+        self.cpu_sample_interval = 1.0  # CPU占用采样间隔（秒）
+        self.memory_pressure_enabled = False  # 内存压力时按优先级自动冻结
+        self.memory_pressure_triggers = ["some 150000 2000000"]  # PSI触发器："some|full 停顿微秒 窗口微秒"
+        self.memory_pressure_clear_avg10 = 5.0  # avg10 低于该百分比视为压力解除
+        self.memory_pressure_hold_seconds = 10.0  # 压力解除后每隔多久解冻一个条目
+        self.control_socket_enabled = True  # 本地控制端点（JSON-RPC）
+        self.control_socket_address = ''  # 为空时使用默认地址
+        self.log_level = 'INFO'  # 默认日志级别
+        self.log_levels = {}  # 按子系统（模块名）单独设置的日志级别，如 {"process_watcher": "DEBUG"}
+        self.log_console_level = 'WARNING'  # 控制台输出的最低级别
+        self.log_max_bytes = 5 * 1024 * 1024  # 单个日志文件的大小上限，超过后轮转并压缩
+        self.log_backup_count = 5  # 保留的轮转文件个数
+        self.load_settings()
+
+    def load_settings(self):
+        try:
+            if os.path.exists(self.config_file):
+                with open(self.config_file, 'r', encoding='utf-8') as f:
+                    data = json.load(f)
+                    self.show_icon_count = data.get('show_icon_count', True)
+                    self.icon_number_color = data.get('icon_number_color', '#ffffff')
+                    self.icon_shadow_color = data.get('icon_shadow_color', '#007bff')
+                    self.hide_window = data.get('hide_window', False)
+                    self.always_on_top = data.get('always_on_top', False)
+                    self.toggle_hotkey = data.get('toggle_hotkey', 'ctrl+alt+f')  # 新增：加载快捷键设置
+                    self.suspend_backend = data.get('suspend_backend', 'auto')
+                    self.watch_new_processes = data.get('watch_new_processes', True)
+                    self.cpu_sample_interval = data.get('cpu_sample_interval', 1.0)
+                    self.memory_pressure_enabled = data.get('memory_pressure_enabled', False)
+                    self.memory_pressure_triggers = data.get('memory_pressure_triggers', ["some 150000 2000000"])
+                    self.memory_pressure_clear_avg10 = data.get('memory_pressure_clear_avg10', 5.0)
+                    self.memory_pressure_hold_seconds = data.get('memory_pressure_hold_seconds', 10.0)
+                    self.control_socket_enabled = data.get('control_socket_enabled', True)
+                    self.control_socket_address = data.get('control_socket_address', '')
+                    self.log_level = data.get('log_level', 'INFO')
+                    self.log_levels = data.get('log_levels', {})
+                    self.log_console_level = data.get('log_console_level', 'WARNING')
+                    self.log_max_bytes = data.get('log_max_bytes', 5 * 1024 * 1024)
+                    self.log_backup_count = data.get('log_backup_count', 5)
+        except Exception as e:
+            logging.error(f"Failed to load settings: {e}")
+
+    def to_dict(self):
+        return {
+            'show_icon_count': self.show_icon_count,
+            'icon_number_color': self.icon_number_color,
+            'icon_shadow_color': self.icon_shadow_color,
+            'hide_window': self.hide_window,
+            'always_on_top': self.always_on_top,
+            'toggle_hotkey': self.toggle_hotkey,  # 新增：保存快捷键设置
+            'suspend_backend': self.suspend_backend,
+            'watch_new_processes': self.watch_new_processes,
+            'cpu_sample_interval': self.cpu_sample_interval,
+            'memory_pressure_enabled': self.memory_pressure_enabled,
+            'memory_pressure_triggers': self.memory_pressure_triggers,
+            'memory_pressure_clear_avg10': self.memory_pressure_clear_avg10,
+            'memory_pressure_hold_seconds': self.memory_pressure_hold_seconds,
+            'control_socket_enabled': self.control_socket_enabled,
+            'control_socket_address': self.control_socket_address,
+            'log_level': self.log_level,
+            'log_levels': self.log_levels,
+            'log_console_level': self.log_console_level,
+            'log_max_bytes': self.log_max_bytes,
+            'log_backup_count': self.log_backup_count
+        }
+
+    def save_settings(self):
+        """请求保存 settings.json，由 store 在后台合并写入"""
+        self.store.schedule()
+
+    def flush(self):
+        self.store.flush()
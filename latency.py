@@ -0,0 +1,139 @@
+"""冻结/解冻操作的延迟统计
+
+每次操作用 OperationTimer 记录各阶段耗时（resolve 解析PID、hide 隐藏窗口、
+suspend 挂起/恢复、persist 保存配置），交给 LatencyRecorder 按后端和按条目
+分别汇总到 LatencyHistogram 中，可以查询 p50/p95/p99 并导出为 JSON。
+"""
+import math
+import json
+import time
+import threading
+from contextlib import contextmanager
+
+PHASES = ("resolve", "hide", "suspend", "persist", "total")
+
+
+class OperationTimer:
+    """记录一次操作各阶段的耗时（秒），同一阶段多次进入时累加"""
+
+    def __init__(self, start=None):
+        self.phases = {}
+        self._start = time.perf_counter() if start is None else start  # 批量操作中共用开始时间
+
+    @contextmanager
+    def phase(self, name):
+        start = time.perf_counter()
+        try:
+            yield
+        finally:
+            self.phases[name] = self.phases.get(name, 0.0) + time.perf_counter() - start
+
+    def total(self):
+        return time.perf_counter() - self._start
+
+
+class LatencyHistogram:
+    """对数分桶直方图：每个2倍区间分为 SUB_BUCKETS 个桶，百分位的相对误差约 9%"""
+
+    SUB_BUCKETS = 8
+    MIN_SECONDS = 1e-6  # 小于 1µs 的值计入第一个桶
+
+    def __init__(self):
+        self.buckets = {}  # {桶序号: 次数}
+        self.count = 0
+        self.sum = 0.0
+        self.min = None
+        self.max = None
+
+    def _bucket(self, seconds):
+        return max(0, math.ceil(math.log2(max(seconds, self.MIN_SECONDS) / self.MIN_SECONDS) * self.SUB_BUCKETS))
+
+    def _upper_bound(self, bucket):
+        return self.MIN_SECONDS * 2 ** (bucket / self.SUB_BUCKETS)
+
+    def add(self, seconds):
+        bucket = self._bucket(seconds)
+        self.buckets[bucket] = self.buckets.get(bucket, 0) + 1
+        self.count += 1
+        self.sum += seconds
+        self.min = seconds if self.min is None else min(self.min, seconds)
+        self.max = seconds if self.max is None else max(self.max, seconds)
+
+    def percentile(self, percent):
+        """返回第 percent 百分位的耗时（秒），没有样本时返回 None"""
+        if not self.count:
+            return None
+        rank = max(1, math.ceil(self.count * percent / 100))
+        seen = 0
+        for bucket in sorted(self.buckets):
+            seen += self.buckets[bucket]
+            if seen >= rank:
+                # 桶上界可能超出实际范围，用最小/最大值收窄
+                return min(max(self._upper_bound(bucket), self.min), self.max)
+        return self.max
+
+    def summary(self):
+        """以毫秒为单位的统计摘要"""
+        def ms(value):
+            return None if value is None else round(value * 1000, 3)
+        return {
+            "count": self.count,
+            "mean_ms": ms(self.sum / self.count) if self.count else None,
+            "min_ms": ms(self.min),
+            "p50_ms": ms(self.percentile(50)),
+            "p95_ms": ms(self.percentile(95)),
+            "p99_ms": ms(self.percentile(99)),
+            "max_ms": ms(self.max),
+        }
+
+
+class LatencyRecorder:
+    """按 (后端, 操作) 和 (条目, 操作) 汇总各阶段的延迟直方图"""
+
+    def __init__(self):
+        self._lock = threading.Lock()
+        self.by_backend = {}  # {(后端名, 操作): {阶段: LatencyHistogram}}
+        self.by_target = {}  # {(标识符, 操作): {阶段: LatencyHistogram}}
+
+    def record(self, operation, identifier, backend, timer):
+        """记录一次完成的操作，operation 如 freeze/resume/auto_freeze"""
+        phases = dict(timer.phases)
+        phases["total"] = timer.total()
+        with self._lock:
+            for table, key in ((self.by_backend, (backend, operation)),
+                               (self.by_target, (identifier, operation))):
+                histograms = table.setdefault(key, {})
+                for phase, seconds in phases.items():
+                    histograms.setdefault(phase, LatencyHistogram()).add(seconds)
+
+    def remove_target(self, identifier):
+        with self._lock:
+            for key in [key for key in self.by_target if key[0] == identifier]:
+                del self.by_target[key]
+
+    def reset(self):
+        with self._lock:
+            self.by_backend.clear()
+            self.by_target.clear()
+
+    def rows(self):
+        """返回 [(分类, 名称, 操作, 阶段, 摘要)]，供界面显示"""
+        rows = []
+        with self._lock:
+            for category, table in (("backend", self.by_backend), ("target", self.by_target)):
+                for (name, operation), histograms in sorted(table.items()):
+                    for phase in PHASES:
+                        if phase in histograms:
+                            rows.append((category, name, operation, phase, histograms[phase].summary()))
+        return rows
+
+    def snapshot(self):
+        """可序列化为 JSON 的统计结果"""
+        result = {"backend": {}, "target": {}}
+        for category, name, operation, phase, summary in self.rows():
+            result[category].setdefault(name, {}).setdefault(operation, {})[phase] = summary
+        return result
+
+    def dump_json(self, path):
+        with open(path, 'w', encoding='utf-8') as f:
+            json.dump(self.snapshot(), f, indent=4, ensure_ascii=False)
@@ -0,0 +1,147 @@
+"""异步日志管道
+
+调用方只把日志记录放入队列（EnqueueHandler），由后台 LogWriter 线程写入文件：
+
+- process_freezer.log（按配置的级别）和 process_freezer_error.log（ERROR 及以上）
+  按大小轮转，轮转出的旧文件在后台线程中压缩为 .gz，保留 backup_count 个；
+- 控制台只输出 console_level 及以上的记录；
+- 级别可以按子系统（记录所在的模块名，如 suspend_backends、process_watcher）单独配置；
+- 过期日志（包括旧版本按日期命名的文件）的清理也在后台线程中执行。
+"""
+import os
+import gzip
+import time
+import queue
+import atexit
+import shutil
+import logging
+from logging.handlers import QueueHandler, QueueListener, RotatingFileHandler
+
+LOG_FORMAT = '%(asctime)s - %(levelname)s - %(filename)s:%(lineno)d - %(funcName)s - %(message)s'
+LOG_PREFIX = "process_freezer"
+MAX_LOG_AGE_DAYS = 7
+
+
+def parse_level(level):
+    """'INFO'/'debug'/20 -> 20"""
+    if isinstance(level, int):
+        return level
+    value = logging.getLevelName(str(level).upper())
+    if not isinstance(value, int):
+        raise ValueError(f"unknown log level: {level}")
+    return value
+
+
+class SubsystemFilter(logging.Filter):
+    """按记录所在模块的配置级别过滤，未配置的模块使用默认级别"""
+
+    def __init__(self, default_level, levels):
+        super().__init__()
+        self.default_level = default_level
+        self.levels = levels  # {模块名: 级别}
+
+    def filter(self, record):
+        return record.levelno >= self.levels.get(record.module, self.default_level)
+
+
+def gzip_namer(name):
+    return name + ".gz"
+
+
+def gzip_rotator(source, dest):
+    """轮转时把旧文件压缩为 .gz（在写日志的后台线程中执行）"""
+    with open(source, 'rb') as f_in, gzip.open(dest, 'wb') as f_out:
+        shutil.copyfileobj(f_in, f_out)
+    os.remove(source)
+
+
+def cleanup_old_logs(log_dir, max_age_days=MAX_LOG_AGE_DAYS):
+    """删除超过 max_age_days 天的日志文件（包括已压缩的轮转文件）"""
+    cutoff = time.time() - max_age_days * 24 * 3600
+    try:
+        with os.scandir(log_dir) as entries:
+            for entry in entries:
+                if not entry.name.startswith(LOG_PREFIX) or not entry.is_file():
+                    continue
+                try:
+                    if entry.stat().st_mtime < cutoff:
+                        os.remove(entry.path)
+                        logging.info(f"Removed old log file: {entry.name}")
+                except OSError as e:
+                    logging.warning(f"Failed to remove old log file {entry.name}: {str(e)}")
+    except OSError as e:
+        logging.warning(f"Error during log cleanup: {str(e)}")
+
+
+class EnqueueHandler(QueueHandler):
+    """调用方线程中只展开消息参数后入队，格式化（时间、异常堆栈）留给后台线程"""
+
+    def prepare(self, record):
+        # 队列在进程内，不需要像 QueueHandler 那样复制记录并预先格式化
+        record.msg = record.getMessage()
+        record.args = None
+        return record
+
+
+class LogWriter(QueueListener):
+    """后台写日志线程，启动时先清理过期日志"""
+
+    def __init__(self, log_queue, *handlers, log_dir=None):
+        super().__init__(log_queue, *handlers, respect_handler_level=True)
+        self.log_dir = log_dir
+
+    def _monitor(self):
+        if self.log_dir:
+            cleanup_old_logs(self.log_dir)
+        super()._monitor()
+
+    def stop(self):
+        """写完队列中剩余的记录后停止，可以重复调用"""
+        if self._thread is not None:
+            super().stop()
+
+
+def build_rotating_handler(path, level, max_bytes, backup_count, formatter):
+    handler = RotatingFileHandler(path, maxBytes=max_bytes, backupCount=backup_count,
+                                  encoding='utf-8', delay=True)
+    handler.namer = gzip_namer
+    handler.rotator = gzip_rotator
+    handler.setLevel(level)
+    handler.setFormatter(formatter)
+    return handler
+
+
+def start_logging(log_dir="logs", level='INFO', levels=None, console_level='WARNING',
+                  max_bytes=5 * 2 ** 20, backup_count=5):
+    """把根日志记录器切换到异步管道，返回已启动的 LogWriter（进程退出时自动停止并刷新）"""
+    os.makedirs(log_dir, exist_ok=True)
+    default_level = parse_level(level)
+    subsystem_levels = {module: parse_level(value) for module, value in (levels or {}).items()}
+
+    formatter = logging.Formatter(LOG_FORMAT)
+    handlers = [
+        build_rotating_handler(os.path.join(log_dir, f"{LOG_PREFIX}.log"),
+                               logging.DEBUG, max_bytes, backup_count, formatter),
+        build_rotating_handler(os.path.join(log_dir, f"{LOG_PREFIX}_error.log"),
+                               logging.ERROR, max_bytes, backup_count, formatter),
+    ]
+    console_handler = logging.StreamHandler()
+    console_handler.setLevel(parse_level(console_level))
+    console_handler.setFormatter(formatter)
+    handlers.append(console_handler)
+
+    log_queue = queue.SimpleQueue()
+    queue_handler = EnqueueHandler(log_queue)
+    queue_handler.addFilter(SubsystemFilter(default_level, subsystem_levels))
+
+    root = logging.getLogger()
+    for handler in list(root.handlers):
+        root.removeHandler(handler)
+    # 根记录器使用最低的配置级别，低于该级别的调用在创建记录之前就被丢弃
+    root.setLevel(min([default_level, *subsystem_levels.values()]))
+    root.addHandler(queue_handler)
+
+    writer = LogWriter(log_queue, *handlers, log_dir=log_dir)
+    writer.start()
+    atexit.register(writer.stop)
+    return writer
@@ -0,0 +1,169 @@
+"""内存压力（PSI）驱动的自动冻结
+
+Linux 下向 /proc/pressure/memory 写入 PSI 触发器，在事件循环中等待内核通知
+（POLLPRI），不做周期轮询：
+- 任一触发器越过阈值时，冻结优先级最低、正在运行的条目（每个事件冻结一个）
+- 持续 hold_seconds 没有新事件且 avg10 低于 clear_avg10 时，按优先级从高到低
+  逐个解冻由本策略冻结的条目
+- 策略停止时解冻所有仍由它冻结的条目（与限速器停止时一致），这些条目不会跨重启保持冻结
+
+条目的 priority 字段越大越重要，默认为 0。
+"""
+import os
+import re
+import sys
+import time
+import select
+import logging
+import threading
+
+from freeze_queue import PRIORITY_INTERACTIVE, PRIORITY_BACKGROUND, PRIORITY_BATCH
+
+PSI_MEMORY_PATH = "/proc/pressure/memory"
+
+
+def read_memory_avg10(path=PSI_MEMORY_PATH):
+    """读取 'some' 行的 avg10（最近10秒内存停顿百分比）"""
+    with open(path, 'r') as f:
+        for line in f:
+            if line.startswith('some'):
+                match = re.search(r'avg10=([\d.]+)', line)
+                if match:
+                    return float(match.group(1))
+    return 0.0
+
+
+class MemoryPressurePolicy:
+    """根据 PSI 内存压力按优先级冻结/解冻条目"""
+
+    STOP_TIMEOUT = 5.0  # 停止时等待解冻完成的秒数
+
+    def __init__(self, process_manager, triggers=("some 150000 2000000",),
+                 clear_avg10=5.0, hold_seconds=10.0, path=PSI_MEMORY_PATH):
+        self.process_manager = process_manager
+        self.triggers = list(triggers)  # 每项格式为 "<some|full> <停顿微秒> <窗口微秒>"
+        self.clear_avg10 = clear_avg10
+        self.hold_seconds = hold_seconds
+        self.path = path
+        self.frozen_by_policy = {}  # 本策略冻结的条目（按冻结顺序，值不使用）
+        self._fds = []
+        self._wake_r = self._wake_w = None
+        self._thread = None
+        self._running = False
+
+    @staticmethod
+    def is_available(path=PSI_MEMORY_PATH):
+        return sys.platform.startswith('linux') and os.path.exists(path)
+
+    def start(self):
+        """注册 PSI 触发器并启动事件循环，失败时抛出 OSError"""
+        try:
+            for trigger in self.triggers:
+                fd = os.open(self.path, os.O_RDWR | os.O_NONBLOCK)
+                self._fds.append(fd)
+                # 触发器在文件描述符关闭前一直有效
+                os.write(fd, trigger.encode() + b'\0')
+        except OSError:
+            self._close_fds()
+            raise
+        self._wake_r, self._wake_w = os.pipe()
+        self._running = True
+        self._thread = threading.Thread(target=self._run, name="memory-pressure", daemon=True)
+        self._thread.start()
+        logging.info(f"Memory pressure policy started with triggers {self.triggers}")
+
+    def stop(self):
+        if not self._running:
+            return
+        self._running = False
+        os.write(self._wake_w, b'x')
+        self._thread.join(timeout=2)
+        self._close_fds()
+        os.close(self._wake_r)
+        os.close(self._wake_w)
+        self._thaw_all()
+
+    def _thaw_all(self):
+        """解冻本策略冻结、仍处于冻结状态的条目，等待冻结队列执行完成"""
+        processes = self.process_manager.processes
+        identifiers = [identifier for identifier in self.frozen_by_policy
+                       if processes.get(identifier, {}).get("is_frozen", False)]
+        self.frozen_by_policy.clear()
+        if not identifiers:
+            return
+        logging.info(f"Memory pressure policy stopping: resuming {identifiers}")
+        future = self.process_manager.resume_many_async(identifiers, priority=PRIORITY_INTERACTIVE)
+        try:
+            future.result(timeout=self.STOP_TIMEOUT)
+        except Exception as e:
+            logging.error(f"Failed to resume processes frozen by memory pressure policy: {str(e)}")
+
+    def _close_fds(self):
+        for fd in self._fds:
+            os.close(fd)
+        self._fds = []
+
+    def _run(self):
+        poller = select.poll()
+        for fd in self._fds:
+            poller.register(fd, select.POLLPRI)
+        poller.register(self._wake_r, select.POLLIN)
+        last_event = 0.0
+        while self._running:
+            # 没有需要解冻的条目时无限期阻塞，不消耗CPU
+            timeout = self.hold_seconds * 1000 if self.frozen_by_policy else None
+            events = poller.poll(timeout)
+            if not self._running:
+                break
+            if any(fd != self._wake_r and mask & select.POLLPRI for fd, mask in events):
+                last_event = time.monotonic()
+                self.on_pressure()
+            elif any(mask & select.POLLERR for _, mask in events):
+                logging.error("PSI trigger file descriptor error, memory pressure policy stopped")
+                break
+            elif self.frozen_by_policy and time.monotonic() - last_event >= self.hold_seconds:
+                try:
+                    avg10 = read_memory_avg10(self.path)
+                except OSError as e:
+                    logging.error(f"Failed to read memory pressure: {str(e)}")
+                    continue
+                if avg10 < self.clear_avg10:
+                    self.on_relief()
+
+    def candidates(self):
+        """可冻结的条目：未冻结、不是已由本策略冻结（可能仍在排队）、正在运行，按优先级从低到高排序"""
+        self.process_manager.refresh_index()
+        entries = []
+        for order, (identifier, data) in enumerate(list(self.process_manager.processes.items())):
+            if data.get("is_frozen", False) or identifier in self.frozen_by_policy:
+                continue
+            if not self.process_manager.resolve_pids(identifier):
+                continue
+            entries.append((data.get("priority", 0), order, identifier))
+        return [identifier for _, _, identifier in sorted(entries)]
+
+    def on_pressure(self):
+        """内存压力越过阈值：冻结优先级最低的一个条目"""
+        candidates = self.candidates()
+        if not candidates:
+            logging.warning("Memory pressure detected but no process left to freeze")
+            return None
+        identifier = candidates[0]
+        logging.warning(f"Memory pressure: freezing lowest priority process {identifier}")
+        self.frozen_by_policy[identifier] = None
+        self.process_manager.freeze_many_async([identifier], priority=PRIORITY_BATCH)
+        return identifier
+
+    def on_relief(self):
+        """内存压力解除：解冻本策略冻结的条目中优先级最高的一个"""
+        processes = self.process_manager.processes
+        # 已被手动解冻或删除的条目不再由本策略处理
+        self.frozen_by_policy = {identifier: None for identifier in self.frozen_by_policy
+                                 if processes.get(identifier, {}).get("is_frozen", False)}
+        if not self.frozen_by_policy:
+            return None
+        identifier = max(self.frozen_by_policy, key=lambda i: processes[i].get("priority", 0))
+        del self.frozen_by_policy[identifier]
+        logging.info(f"Memory pressure cleared: resuming {identifier}")
+        self.process_manager.resume_many_async([identifier], priority=PRIORITY_BACKGROUND)
+        return identifier
@@ -0,0 +1,158 @@
+"""配置文件的原子写入和合并写入
+
+atomic_write_json 先写入同目录下的临时文件并 fsync，再用 os.replace 替换目标文件，
+写到一半崩溃时原文件保持完整。临时文件沿用原文件的权限（新文件按 umask），
+不会因为 mkstemp 的 0600 改变配置文件的权限。
+
+DebouncedWriter 把一连串的保存请求合并为一次写入：最后一次请求之后 delay 秒内没有
+新请求时写入，持续有请求时最迟在第一次请求之后 max_delay 秒写入。写入在后台线程中
+进行，要写的数据在写入时才通过 snapshot() 取得（snapshot 需要自行加锁复制，保证返回的
+数据在序列化期间不被修改）；退出前调用 flush()（也注册在 atexit 中）。写入失败时数据
+保持待写入状态，retry_delay 秒后重试。
+"""
+import os
+import json
+import stat
+import time
+import atexit
+import logging
+import tempfile
+import threading
+
+
+
+def _read_umask():
+    mask = os.umask(0)
+    os.umask(mask)
+    return mask
+
+
+# 只在导入时读取一次：os.umask 只能通过设置来读取，运行中读取会与其他线程创建文件竞争
+UMASK = _read_umask()
+
+
+def atomic_write_json(path, data, **dump_kwargs):
+    """原子地把 data 以 JSON 写入 path"""
+    atomic_write_text(path, json.dumps(data, **dump_kwargs))
+
+
+def atomic_write_text(path, text):
+    directory = os.path.dirname(os.path.abspath(path))
+    fd, temp_path = tempfile.mkstemp(prefix=os.path.basename(path) + ".", suffix=".tmp", dir=directory)
+    try:
+        with os.fdopen(fd, 'w', encoding='utf-8') as f:
+            f.write(text)
+            f.flush()
+            os.fsync(f.fileno())
+        try:
+            mode = stat.S_IMODE(os.stat(path).st_mode)
+        except FileNotFoundError:
+            mode = 0o666 & ~UMASK
+        os.chmod(temp_path, mode)
+        os.replace(temp_path, path)
+    except BaseException:
+        try:
+            os.remove(temp_path)
+        except OSError:
+            pass
+        raise
+    if hasattr(os, 'O_DIRECTORY'):
+        # 让重命名本身也落盘（Windows 没有目录 fsync）
+        dir_fd = os.open(directory, os.O_RDONLY | os.O_DIRECTORY)
+        try:
+            os.fsync(dir_fd)
+        finally:
+            os.close(dir_fd)
+
+
+class DebouncedWriter:
+    """合并短时间内的多次保存请求，只写入最新的数据"""
+
+    def __init__(self, path, snapshot, delay=0.2, max_delay=2.0, retry_delay=5.0, **dump_kwargs):
+        self.path = path
+        self.snapshot = snapshot  # 无参函数，返回要写入的数据
+        self.delay = delay
+        self.max_delay = max_delay
+        self.retry_delay = retry_delay  # 写入失败后多久重试
+        self.dump_kwargs = dump_kwargs
+        self.requests = 0  # schedule 调用次数
+        self.writes = 0  # 实际写入次数
+        self._cond = threading.Condition()
+        self._write_lock = threading.Lock()
+        self._first_change = None  # 尚未写入的第一次请求时间，None 表示没有待写入的数据
+        self._last_change = None
+        self._closed = False
+        self._thread = None
+        atexit.register(self.flush)
+
+    @property
+    def dirty(self):
+        return self._first_change is not None
+
+    def schedule(self):
+        """请求保存，立即返回"""
+        with self._cond:
+            self.requests += 1
+            now = time.monotonic()
+            if self._first_change is None:
+                self._first_change = now
+            self._last_change = now
+            if self._thread is None:
+                self._thread = threading.Thread(target=self._run, name=f"save-{os.path.basename(self.path)}",
+                                                daemon=True)
+                self._thread.start()
+            self._cond.notify()
+
+    def flush(self):
+        """立即写入待保存的数据（没有待保存的数据时什么都不做）；写入失败时返回 False，数据仍待写入"""
+        with self._write_lock:
+            with self._cond:
+                if self._first_change is None:
+                    return True
+                first_change, self._first_change = self._first_change, None
+            if self._write():
+                return True
+            with self._cond:
+                # 写入期间没有新请求时恢复原来的请求时间
+                if self._first_change is None:
+                    self._first_change = first_change
+                    self._last_change = max(self._last_change or first_change, first_change)
+            return False
+
+    def close(self):
+        """写入待保存的数据并停止后台线程"""
+        with self._cond:
+            self._closed = True
+            self._cond.notify()
+        self.flush()
+        if self._thread is not None:
+            self._thread.join(timeout=2)
+        atexit.unregister(self.flush)
+
+    def _run(self):
+        while True:
+            with self._cond:
+                while self._first_change is None:
+                    if self._closed:
+                        return
+                    self._cond.wait()
+                deadline = min(self._last_change + self.delay, self._first_change + self.max_delay)
+                remaining = deadline - time.monotonic()
+                if remaining > 0 and not self._closed:
+                    self._cond.wait(remaining)
+                    continue
+            if not self.flush():
+                with self._cond:
+                    if self._closed:
+                        return  # 关闭后不再重试，atexit 中的 flush 还会再试一次
+                    self._cond.wait(self.retry_delay)
+
+    def _write(self):
+        """序列化并写入，返回是否成功"""
+        try:
+            atomic_write_text(self.path, json.dumps(self.snapshot(), **self.dump_kwargs))
+        except (OSError, TypeError, ValueError) as e:
+            logging.error(f"Failed to save {self.path}: {str(e)}")
+            return False
+        self.writes += 1
+        return True
@@ -0,0 +1,1849 @@
+"""进程冻结器图形界面：主窗口、托盘图标和各对话框"""
+import sys
+import os
+import time
+import logging
+import threading
+import functools
+import tkinter as tk
+from tkinter import ttk, messagebox, simpledialog, filedialog
+import tkinter.colorchooser
+import traceback
+
+import psutil
+
+try:
+    import win32gui
+    import win32process
+except ImportError:  # 非Windows平台没有pywin32，拖动选取窗口不可用
+    win32gui = win32process = None
+
+from focus_policy import FocusPolicy, Win32ForegroundSource
+from cpu_sampler import CpuThresholdPolicy
+from memory_pressure import MemoryPressurePolicy
+from process_monitor import ProcessMonitor, stable_keys
+from freeze_queue import PRIORITY_INTERACTIVE
+
+# pystray、PIL、keyboard 和 control_server（asyncio）导入较慢，在首次绘制之后用到时才导入
+
+ASSETS_DIR = os.path.join(os.path.dirname(__file__), "assets")
+TRAY_ICON_CACHE_SIZE = 64  # 缓存的托盘图标数量（冻结数量 × 颜色组合）
+
+
+@functools.lru_cache(maxsize=None)
+def load_icon(path):
+    """读取并缓存 .ico 图标（RGBA），图标刷新时不再重复读取文件"""
+    from PIL import Image
+    return Image.open(path).convert('RGBA')
+
+
+@functools.lru_cache(maxsize=None)
+def load_font(names, size):
+    """按顺序尝试加载字体并缓存结果，都不可用时返回 None"""
+    from PIL import ImageFont
+    for name in names:
+        try:
+            return ImageFont.truetype(name, size)
+        except (OSError, ImportError):  # 字体不存在，或 PIL 没有 FreeType 支持
+            continue
+    return None
+
+
+@functools.lru_cache(maxsize=TRAY_ICON_CACHE_SIZE)
+def render_tray_icon(active, count, number_color, shadow_color):
+    """渲染托盘图标：active 表示有冻结的进程，count 大于 0 时在图标上绘制数字
+
+    结果按参数缓存（LRU），冻结数量来回变化时不再重复合成同一张图标。
+    返回的图像是共享的，调用方不能修改。
+    """
+    from PIL import Image, ImageDraw
+    
+    # 根据是否有冻结进程选择图标
+    icon_path = os.path.join(ASSETS_DIR, "icon.ico" if active else "icon_inactive.ico")
+
+    if os.path.exists(icon_path):
+        image = load_icon(icon_path)
+    else:
+        # 如果图标文件不存在，创建默认的圆形图标
+        image = Image.new('RGBA', (64, 64), (0, 0, 0, 0))
+        dc = ImageDraw.Draw(image)
+        icon_color = '#007bff' if active else '#6c757d'
+        dc.ellipse([4, 4, 60, 60], fill=icon_color)
+    
+    # 需要显示数字时绘制数字
+    if count > 0:
+        # 创建一个新的图层用于绘制数字
+        txt_layer = Image.new('RGBA', image.size, (0, 0, 0, 0))
+        dc = ImageDraw.Draw(txt_layer)
+        
+        # 计算文本大小和位置
+        text = str(count)
+        font_size = int(image.width * 0.7)  # 增大字体大小为图标宽度的70%
+        font = load_font(("arial.ttf",), font_size)
+            
+        # 获取文本大小
+        if font:
+            text_bbox = dc.textbbox((0, 0), text, font=font)
+            text_width = text_bbox[2] - text_bbox[0]
+            text_height = text_bbox[3] - text_bbox[1]
+        else:
+            text_width = font_size
+            text_height = font_size
+        
+        # 为阴影创建稍大的粗体字体
+        shadow_font_size = int(font_size * 1.5)  # 阴影字体大1.5倍
+        # 尝试使用Arial Bold字体，备选Arial Bold的另一种写法
+        shadow_font = load_font(("arialbd.ttf", "arial bold"), shadow_font_size) or font
+
+        # 获取阴影文本的大小
+        if shadow_font:
+            shadow_bbox = dc.textbbox((0, 0), text, font=shadow_font)
+            shadow_width = shadow_bbox[2] - shadow_bbox[0]
+            shadow_height = shadow_bbox[3] - shadow_bbox[1]
+        else:
+            shadow_width = shadow_font_size
+            shadow_height = shadow_font_size
+
+        # 计算阴影和主文本的中心点位置
+        center_x = image.width // 2
+        center_y = image.height // 2
+
+        # 计算阴影文本位置（使其居中）
+        shadow_x = center_x - shadow_width // 2
+        shadow_y = center_y - shadow_height // 1.4
+
+        # 计算主文本位置（使其居中）
+        main_x = center_x - text_width // 2
+        main_y = center_y - text_height // 1.5
+
+        # 绘制较大的阴影文本
+        dc.text((shadow_x, shadow_y), text, fill=shadow_color, font=shadow_font)
+        # 绘制主文本
+        dc.text((main_x, main_y), text, fill=number_color, font=font)
+        
+        # 将文本图层合并到主图像
+        image = Image.alpha_composite(image, txt_layer)
+    
+    return image
+
+
+class DragHandle:
+    def __init__(self, parent, callback, process_index=None):
+        self.parent = parent
+        self.callback = callback
+        self.process_index = process_index
+        self.dragging = False
+        
+        # 创建手柄按钮
+        self.handle = tk.Label(parent, 
+                             text="⊕", 
+                             font=('Microsoft YaHei UI', 16),
+                             fg='#007bff',
+                             bg='white',
+                             cursor="hand2")
+        
+        # 绑定事件
+        self.handle.bind('<Button-1>', self.start_drag)
+        self.handle.bind('<B1-Motion>', self.dragging)
+        self.handle.bind('<ButtonRelease-1>', self.stop_drag)
+        self.handle.bind('<Enter>', self.on_enter)
+        self.handle.bind('<Leave>', self.on_leave)
+    
+    def start_drag(self, event):
+        if win32gui is None:
+            return
+        self.dragging = True
+        self.handle.configure(fg='#0056b3')  # 深蓝色
+    
+    def dragging(self, event):
+        if self.dragging:
+            # 获取鼠标位置
+            x, y = win32gui.GetCursorPos()
+            # 获取窗口句柄
+            hwnd = win32gui.WindowFromPoint((x, y))
+            if hwnd:
+                # 获取进程ID
+                _, process_id = win32process.GetWindowThreadProcessId(hwnd)
+                # 更新手柄显示
+                self.handle.configure(text="⊕")
+    
+    def stop_drag(self, event):
+        if self.dragging:
+            self.dragging = False
+            self.handle.configure(fg='#007bff', text="⊕")  # 恢复原始颜色
+            
+            # 获取鼠标位置下的窗口信息
+            x, y = win32gui.GetCursorPos()
+            hwnd = win32gui.WindowFromPoint((x, y))
+            
+            if hwnd:
+                # 获取进程ID和窗口标题
+                _, process_id = win32process.GetWindowThreadProcessId(hwnd)
+                window_title = win32gui.GetWindowText(hwnd)
+                
+                try:
+                    # 优先从共享的进程索引获取进程名，未命中时再用psutil查询
+                    process_name = self.process_index.name_of(process_id) if self.process_index else None
+                    if not process_name:
+                        process_name = psutil.Process(process_id).name()  # 获取进程的可执行文件名称
+                    
+                    # 调用回调函数，传递进程名称而不是ID
+                    if self.callback:
+                        self.callback(process_name, window_title)
+                except (psutil.NoSuchProcess, psutil.AccessDenied, psutil.ZombieProcess):
+                    messagebox.showerror("错误", "无法获取进程信息")
+    
+    def on_enter(self, event):
+        if not self.dragging:
+            self.handle.configure(fg='#0056b3')  # 深蓝色
+    
+    def on_leave(self, event):
+        if not self.dragging:
+            self.handle.configure(fg='#007bff')  # 恢复原始颜色
+    
+    def pack(self, **kwargs):
+        self.handle.pack(**kwargs)
+
+class TrayMenu:
+    """托盘菜单
+
+    build() 只在菜单的可见内容（条目文字）变化时生成新菜单，并复用文字未变的菜单项；
+    条目超过 GROUP_SIZE 个时按名称排序分为子菜单，每组至少 GROUP_SIZE 个，最多 MAX_GROUPS 组。
+    """
+    GROUP_SIZE = 25
+    MAX_GROUPS = 30
+
+    def __init__(self, process_manager, toggle, batch_actions, footer_items):
+        self.process_manager = process_manager
+        self.toggle = toggle  # toggle(标识符) -> 菜单项的回调
+        self.batch_actions = batch_actions  # 有条目时显示的 [(文字, 回调)]
+        self.footer_items = footer_items  # 始终显示在末尾的菜单项
+        self.shown = None  # 当前菜单对应的 entries()
+        self._items = {}  # {(标识符, 文字): MenuItem}
+        self._groups = {}  # {组内的 entries: 子菜单项}
+
+    def entries(self):
+        """每个条目在菜单中的 (标识符, 名称, 文字)"""
+        entries = []
+        for proc_id, data in list(self.process_manager.processes.items()):
+            display_name = data.get("name", proc_id)
+            is_frozen = data.get("is_frozen", False)
+            # 为已冻结的进程添加雪花图标，处理中的进程添加省略号
+            if self.process_manager.is_pending(proc_id):
+                prefix = "… "
+            else:
+                prefix = "❄ " if is_frozen else "  "
+            entries.append((proc_id, display_name, f"{prefix}{'解冻' if is_frozen else '冻结'} {display_name}"))
+        return tuple(entries)
+
+    def build(self, force=False):
+        """返回新的 pystray.Menu；可见内容没有变化时返回 None"""
+        import pystray
+        entries = self.entries()
+        if entries == self.shown and not force:
+            return None
+        self.shown = entries
+
+        items = {}
+        for proc_id, _, text in entries:
+            key = (proc_id, text)
+            items[key] = self._items.get(key) or pystray.MenuItem(text, self.toggle(proc_id))
+        self._items = items
+
+        if len(entries) > self.GROUP_SIZE:
+            menu_items = self._grouped(sorted(entries, key=lambda entry: entry[1].lower()))
+        else:
+            menu_items = [items[(proc_id, text)] for proc_id, _, text in entries]
+
+        # 添加分隔线和批量操作
+        if menu_items:
+            menu_items.append(pystray.Menu.SEPARATOR)
+            menu_items.extend(pystray.MenuItem(text, action) for text, action in self.batch_actions)
+            menu_items.append(pystray.Menu.SEPARATOR)
+        menu_items.extend(self.footer_items)
+        return pystray.Menu(*menu_items)
+
+    def _grouped(self, entries):
+        """按顺序把条目分成若干子菜单，子菜单名显示名称范围和冻结数量"""
+        import pystray
+        size = max(self.GROUP_SIZE, -(-len(entries) // self.MAX_GROUPS))
+        groups = {}
+        for start in range(0, len(entries), size):
+            group = tuple(entries[start:start + size])
+            item = self._groups.get(group)
+            if item is None:
+                frozen = sum(1 for proc_id, _, _ in group
+                             if self.process_manager.processes.get(proc_id, {}).get("is_frozen", False))
+                label = f"{group[0][1]} – {group[-1][1]}"
+                if frozen:
+                    label = f"❄ {label} ({frozen})"
+                item = pystray.MenuItem(label, pystray.Menu(*(self._items[(proc_id, text)]
+                                                              for proc_id, _, text in group)))
+            groups[group] = item
+        self._groups = groups
+        return list(groups.values())
+
+
+class ProcessListWindow:
+    RECONCILE_INTERVAL_MS = 30000  # 定期核对真实冻结状态的间隔
+    THROTTLE_REFRESH_MS = 1000  # 限速中刷新实测占空比的间隔
+    TRAY_UPDATE_DELAY_MS = 100  # 合并托盘图标更新请求的时间窗口
+    LIST_COLUMNS = (("name", "进程名称", 300), ("id", "进程ID", 200), ("status", "状态", 120))
+    STATUS_COLORS = {"pending": "#6c757d", "throttled": "#fd7e14", "frozen": "#dc3545", "running": "#28a745"}
+
+    def __init__(self, process_manager):
+        """先显示窗口，托盘图标和后台服务在首次绘制后由 finish_startup 启动"""
+        self.startup_marks = {}  # 启动各阶段的 time.monotonic()，供启动基准测试读取
+        self.settings = process_manager.settings  # 与 ProcessManager 共用同一个 Settings 实例
+        self.process_manager = process_manager
+        self.process_manager.error_handler = self.report_error  # 工作线程中的错误交给主线程显示
+        self.focus_policy = None  # 前台焦点驱动的自动冻结（需要 Windows 前台窗口事件）
+        self.cpu_policy = None  # CPU占用阈值自动冻结
+        self.memory_policy = None  # 内存压力（PSI）自动冻结
+        self.control_server = None
+        self.refresh_pending = False
+        self.changed = set()  # 等待刷新到界面的条目
+        self.changed_lock = threading.Lock()
+        self.tray_update_pending = False
+        self.tray_icon_shown = None  # 托盘当前显示的图标对应的 tray_icon_key()
+        self.window = tk.Tk()
+        self.window.title("进程冻结器")
+        self.window.geometry("880x450")
+        self.window.configure(bg='white')  # 设置窗口背景色
+        
+        # 用于控制快捷键检查的标志
+        self.running = True
+        
+        # 设置窗口图标
+        icon_path = os.path.join(os.path.dirname(__file__), "assets", "icon.ico")
+        if os.path.exists(icon_path):
+            self.window.iconbitmap(icon_path)
+        
+        # 绑定窗口事件
+        self.window.protocol("WM_DELETE_WINDOW", self.minimize_to_tray)
+        self.window.bind("<Unmap>", lambda e: self.handle_minimize(e))
+        
+        # 设置统一的字体
+        self.default_font = ('Microsoft YaHei UI', 10)
+        self.title_font = ('Microsoft YaHei UI', 12, 'bold')
+        
+        # 创建主框架
+        main_frame = tk.Frame(self.window, bg='white')
+        main_frame.pack(fill=tk.BOTH, expand=True, padx=20, pady=10)
+        
+        # 创建顶部框架（包含标题和设置按钮）
+        top_frame = tk.Frame(main_frame, bg='white')
+        top_frame.pack(fill=tk.X, pady=(0, 10))
+        
+        # 添加进程按钮（使用现代风格）
+        add_button = tk.Button(top_frame,
+                             text="添加进程",
+                             command=self.add_process,
+                             font=self.default_font,
+                             bg='#007bff',
+                             fg='white',
+                             relief=tk.FLAT,
+                             padx=15)
+        add_button.pack(side=tk.LEFT)
+        
+        # 设置按钮（使用⚙符号）
+        settings_btn = tk.Label(top_frame,
+                              text="⚙",
+                              font=('Microsoft YaHei UI', 16),
+                              bg='white',
+                              fg='#666666',
+                              cursor="hand2")
+        settings_btn.pack(side=tk.RIGHT)
+        
+        # 绑定鼠标事件
+        settings_btn.bind('<Button-1>', lambda e: self.show_settings_menu(e))
+        settings_btn.bind('<Enter>', lambda e: settings_btn.configure(fg='#007bff'))
+        settings_btn.bind('<Leave>', lambda e: settings_btn.configure(fg='#666666'))
+        
+        # 绑定鼠标悬停事件
+        add_button.bind('<Enter>', lambda e, b=add_button: self.on_hover(e, b))
+        add_button.bind('<Leave>', lambda e, b=add_button: self.on_leave(e, b))
+        
+        # 两个页签：已添加的条目、系统进程监视
+        self.notebook = ttk.Notebook(main_frame)
+        self.notebook.pack(fill=tk.BOTH, expand=True)
+        entries_tab = tk.Frame(self.notebook, bg='white')
+        self.notebook.add(entries_tab, text="已添加")
+        monitor_tab = tk.Frame(self.notebook, bg='white')
+        self.notebook.add(monitor_tab, text="系统进程")
+        self.monitor_panel = ProcessMonitorPanel(monitor_tab, self.process_manager, self.add_and_freeze)
+        self.notebook.bind('<<NotebookTabChanged>>', lambda e: self.update_monitor_state())
+        
+        # 进程列表（ttk.Treeview 只绘制可见的行，条目再多也不会创建额外的控件）
+        list_container = tk.Frame(entries_tab, bg='#f0f0f0')
+        list_container.pack(fill=tk.BOTH, expand=True)
+        
+        style = ttk.Style(self.window)
+        style.configure('ProcessList.Treeview', font=self.default_font, rowheight=28, background='white')
+        style.configure('ProcessList.Treeview.Heading', font=('Microsoft YaHei UI', 10, 'bold'))
+        self.tree = ttk.Treeview(list_container,
+                                 columns=[column[0] for column in self.LIST_COLUMNS],
+                                 show='headings',
+                                 style='ProcessList.Treeview')
+        for column, title, width in self.LIST_COLUMNS:
+            self.tree.heading(column, text=title, anchor='w')
+            self.tree.column(column, width=width, anchor='w')
+        for tag, color in self.STATUS_COLORS.items():
+            self.tree.tag_configure(tag, foreground=color)
+        self.tree.pack(side=tk.LEFT, fill=tk.BOTH, expand=True)
+        
+        scrollbar = tk.Scrollbar(list_container, command=self.tree.yview)
+        scrollbar.pack(side=tk.RIGHT, fill=tk.Y)
+        self.tree.configure(yscrollcommand=scrollbar.set)
+        self.rows = {}  # {标识符: (列值, 状态标签)}，列表中已显示的内容，只更新有变化的行
+        
+        # 双击切换冻结，右键菜单，Delete 删除
+        self.tree.bind('<Double-1>', self.on_row_double_click)
+        self.tree.bind('<Button-3>', self.show_row_menu)
+        self.tree.bind('<Delete>', lambda e: self.remove_selected())
+        self.tree.bind('<<TreeviewSelect>>', lambda e: self.update_action_buttons())
+        
+        # 对选中条目的操作按钮
+        action_frame = tk.Frame(entries_tab, bg='white')
+        action_frame.pack(fill=tk.X, pady=(10, 0))
+        self.freeze_button = tk.Button(action_frame,
+                                       text="冻结",
+                                       command=lambda: self.for_selected(self.toggle_freeze_with_button),
+                                       font=self.default_font,
+                                       bg='#dc3545',
+                                       fg='white',
+                                       relief=tk.FLAT,
+                                       width=6)
+        self.throttle_button = tk.Button(action_frame,
+                                         text="限速",
+                                         command=lambda: self.for_selected(self.toggle_throttle_with_button),
+                                         font=self.default_font,
+                                         bg='#fd7e14',
+                                         fg='white',
+                                         relief=tk.FLAT,
+                                         width=8)
+        self.delete_button = tk.Button(action_frame,
+                                       text="删除",
+                                       command=self.remove_selected,
+                                       font=self.default_font,
+                                       bg='#6c757d',
+                                       fg='white',
+                                       relief=tk.FLAT,
+                                       width=6)
+        for btn in (self.freeze_button, self.throttle_button, self.delete_button):
+            btn.pack(side=tk.LEFT, padx=(0, 10))
+            btn.bind('<Enter>', lambda e, b=btn: self.on_hover(e, b))
+            btn.bind('<Leave>', lambda e, b=btn: self.on_leave(e, b))
+        
+        # 设置窗口置顶状态
+        self.set_window_on_top(self.settings.always_on_top)
+
+        # 更新进程列表显示
+        self.update_process_list()
+
+        # 添加快捷键状态标志
+        self.hotkey_registered = False
+        self.hotkey_retry_count = 0
+        self.MAX_RETRY_COUNT = 3
+        
+        # 首次绘制之后再创建托盘图标、启动后台服务
+        self.startup_marks["window_created"] = time.monotonic()
+        self.window.after(0, self.finish_startup)
+
+    def finish_startup(self):
+        """窗口绘制完成后依次创建托盘图标和启动后台服务，每一步之间让出事件循环"""
+        self.window.update_idletasks()
+        self.startup_marks["first_paint"] = time.monotonic()
+        self.create_tray_icon()
+        self.startup_marks["tray_ready"] = time.monotonic()
+        self.window.after_idle(self.start_services)
+
+    def start_services(self):
+        """启动进程监视、自动冻结策略、控制端点和定期核对"""
+        self.process_manager.restore_throttles()
+        if self.settings.watch_new_processes:
+            self.process_manager.start_watcher()
+        if Win32ForegroundSource.is_available():
+            self.focus_policy = FocusPolicy(self.process_manager,
+                                            Win32ForegroundSource(self.process_manager.window_hider))
+            self.focus_policy.start()
+        self.cpu_policy = CpuThresholdPolicy(
+            self.process_manager,
+            interval=self.settings.cpu_sample_interval,
+            foreground=lambda: self.focus_policy.foreground_identifiers if self.focus_policy else set()
+        )
+        self.cpu_policy.start()
+        if self.settings.memory_pressure_enabled:
+            self.start_memory_policy()
+
+        # 外部（控制端点、自动策略）引起的状态变化也要刷新界面
+        self.process_manager.add_listener(self.on_state_change)
+        if self.settings.control_socket_enabled:
+            self.start_control_server()
+
+        # 启动时核对一次真实冻结状态，之后定期核对
+        self.reconcile_state()
+        self.refresh_throttle_status()
+
+        # 延迟注册快捷键
+        self.window.after(1000, self.ensure_hotkey_registered)
+        self.startup_marks["services_started"] = time.monotonic()
+
+    def on_hover(self, event, button):
+        """鼠标悬停效果"""
+        if button['text'] == "添加进程":
+            button.configure(bg='#0056b3')  # 深蓝色
+        elif button['text'] == "最小化":
+            button.configure(bg='#5a6268')  # 深灰色
+        elif button['text'] == "冻结":
+            button.configure(bg='#c82333')  # 深红色
+        elif button['text'] == "解冻":
+            button.configure(bg='#218838')  # 深绿色
+        elif button['text'] in ("限速", "取消限速"):
+            button.configure(bg='#e8590c')  # 深橙色
+        elif button['text'] == "删除":
+            button.configure(bg='#5a6268')  # 深灰色
+        else:  # 退出按钮
+            button.configure(bg='#c82333')  # 深红色
+    
+    def on_leave(self, event, button):
+        """鼠标离开效果"""
+        if button['text'] == "添加进程":
+            button.configure(bg='#007bff')  # 恢复蓝色
+        elif button['text'] == "最小化":
+            button.configure(bg='#6c757d')  # 恢复灰色
+        elif button['text'] == "冻结":
+            button.configure(bg='#dc3545')  # 恢复红色
+        elif button['text'] == "解冻":
+            button.configure(bg='#28a745')  # 恢复绿色
+        elif button['text'] in ("限速", "取消限速"):
+            button.configure(bg='#fd7e14')  # 恢复橙色
+        elif button['text'] == "删除":
+            button.configure(bg='#6c757d')  # 恢复灰色
+        else:  # 退出按钮
+            button.configure(bg='#dc3545')  # 恢复红色
+
+    def row_for(self, proc_id, data):
+        """条目在列表中的 (列值, 状态标签)"""
+        # 状态（有操作在队列中时显示为处理中）
+        throttle = self.process_manager.throttle_status(proc_id)
+        if self.process_manager.is_pending(proc_id):
+            status_text, tag = "处理中", "pending"
+        elif throttle:
+            # 限速状态显示实测占空比
+            percent, measured = throttle
+            status_text = f"限速{measured:.0f}%" if measured is not None else f"限速{percent:.0f}%"
+            tag = "throttled"
+        elif data.get("is_frozen", False):
+            status_text, tag = "已冻结", "frozen"
+        else:
+            status_text, tag = "未冻结", "running"
+        return (data.get("name", proc_id), proc_id, status_text), tag
+
+    def update_process_list(self, identifiers=None):
+        """把条目的变化应用到列表：只插入、删除或修改有变化的行
+
+        identifiers 为 None 时核对全部条目，否则只核对给出的条目（已删除的条目会被移除）。
+        """
+        processes = self.process_manager.processes
+        if identifiers is None:
+            removed = [proc_id for proc_id in self.rows if proc_id not in processes]
+            if removed:
+                self.tree.delete(*removed)
+                for proc_id in removed:
+                    del self.rows[proc_id]
+            identifiers = list(processes)
+        for proc_id in identifiers:
+            data = processes.get(proc_id)
+            if data is None:
+                if self.rows.pop(proc_id, None) is not None:
+                    self.tree.delete(proc_id)
+                continue
+            row = self.row_for(proc_id, data)
+            current = self.rows.get(proc_id)
+            if current == row:
+                continue
+            if current is None:
+                self.tree.insert('', tk.END, iid=proc_id, values=row[0], tags=(row[1],))
+            else:
+                self.tree.item(proc_id, values=row[0], tags=(row[1],))
+            self.rows[proc_id] = row
+        self.update_action_buttons()
+
+    def selected_identifiers(self):
+        return [proc_id for proc_id in self.tree.selection() if proc_id in self.process_manager.processes]
+
+    def update_action_buttons(self):
+        """按选中条目的状态更新操作按钮的文字和可用状态"""
+        selected = self.selected_identifiers()
+        processes = self.process_manager.processes
+        frozen = bool(selected) and all(processes[proc_id].get("is_frozen", False) for proc_id in selected)
+        throttled = bool(selected) and all(self.process_manager.throttle_status(proc_id) for proc_id in selected)
+        pending = any(self.process_manager.is_pending(proc_id) for proc_id in selected)
+        state = tk.NORMAL if selected and not pending else tk.DISABLED
+        self.freeze_button.configure(text="解冻" if frozen else "冻结",
+                                     bg='#28a745' if frozen else '#dc3545',
+                                     state=state)
+        self.throttle_button.configure(text="取消限速" if throttled else "限速", state=state)
+        self.delete_button.configure(state=tk.NORMAL if selected else tk.DISABLED)
+
+    def for_selected(self, action):
+        for proc_id in self.selected_identifiers():
+            action(proc_id)
+
+    def on_row_double_click(self, event):
+        proc_id = self.tree.identify_row(event.y)
+        if proc_id:
+            self.toggle_freeze_with_button(proc_id)
+
+    def show_row_menu(self, event):
+        """右键菜单：对点击的行（或已选中的多行）操作"""
+        proc_id = self.tree.identify_row(event.y)
+        if not proc_id:
+            return
+        if proc_id not in self.tree.selection():
+            self.tree.selection_set(proc_id)
+        self.update_action_buttons()
+        menu = tk.Menu(self.window, tearoff=0, font=self.default_font)
+        for button in (self.freeze_button, self.throttle_button, self.delete_button):
+            menu.add_command(label=button['text'], command=button.invoke, state=button['state'])
+        menu.post(event.x_root, event.y_root)
+
+    def remove_selected(self):
+        selected = self.selected_identifiers()
+        if len(selected) == 1:
+            self.remove_process(selected[0])
+        elif selected and messagebox.askokcancel("确认删除", f"确定要删除选中的 {len(selected)} 个进程吗？"):
+            for proc_id in selected:
+                self.process_manager.remove_process(proc_id)
+            self.update_process_list(selected)
+            self.update_tray_icon()
+
+    def update_monitor_state(self):
+        """系统进程页签可见时才采样"""
+        visible = self.running and self.window.state() != 'withdrawn'
+        if visible and self.notebook.select() == str(self.monitor_panel.frame.master):
+            self.monitor_panel.activate()
+        else:
+            self.monitor_panel.deactivate()
+
+    def add_and_freeze(self, process_names):
+        """按进程名添加条目（已添加的直接使用）并冻结"""
+        for name in process_names:
+            if name not in self.process_manager.processes:
+                self.process_manager.add_process(name, name)
+        future = self.process_manager.freeze_many_async(process_names, priority=PRIORITY_INTERACTIVE)
+        future.add_done_callback(lambda f: self.window.after(0, self.refresh_views, process_names))
+        self.refresh_views(process_names)
+
+    def toggle_freeze_with_button(self, process_id):
+        # 切换冻结状态（在冻结队列中执行，界面先显示处理中）
+        if process_id in self.process_manager.processes:
+            future = self.process_manager.toggle_freeze_async(process_id)
+            future.add_done_callback(lambda f: self.window.after(0, self.refresh_views, [process_id]))
+            self.refresh_views([process_id])
+
+    def toggle_throttle_with_button(self, process_id):
+        """设置或取消限速"""
+        if process_id not in self.process_manager.processes:
+            return
+        if self.process_manager.throttle_status(process_id):
+            percent = 0
+        else:
+            percent = simpledialog.askinteger("限速", "每个周期运行的百分比(1-99)：",
+                                              parent=self.window, minvalue=1, maxvalue=99,
+                                              initialvalue=10)
+            if not percent:
+                return
+        future = self.process_manager.set_throttle_async(process_id, percent)
+        future.add_done_callback(lambda f: self.window.after(0, self.refresh_views, [process_id]))
+        self.refresh_views([process_id])
+        if percent:
+            self.window.after(self.THROTTLE_REFRESH_MS, self.refresh_throttle_status)
+
+    def refresh_throttle_status(self):
+        """有限速中的条目时定期刷新列表，更新实测占空比"""
+        if not self.running:
+            return
+        throttled = self.process_manager.throttler.targets()
+        if throttled:
+            self.update_process_list(throttled)
+            self.window.after(self.THROTTLE_REFRESH_MS, self.refresh_throttle_status)
+
+    def reconcile_state(self):
+        """在后台核对条目的真实冻结状态，有修正时刷新界面"""
+        if not self.running:
+            return
+
+        def on_done(future):
+            if not future.exception() and future.result():
+                self.window.after(0, self.refresh_views)
+
+        self.process_manager.reconcile_async().add_done_callback(on_done)
+        self.window.after(self.RECONCILE_INTERVAL_MS, self.reconcile_state)
+
+    def refresh_views(self, identifiers=None):
+        """刷新进程列表（identifiers 为 None 时核对全部条目）和托盘图标，只能在Tk主线程调用"""
+        self.update_process_list(identifiers)
+        self.update_tray_icon()
+
+    def on_state_change(self, identifier, event):
+        """ProcessManager 状态变化回调（任意线程），合并为一次界面刷新，只更新变化的条目"""
+        with self.changed_lock:
+            self.changed.add(identifier)
+            if self.refresh_pending:
+                return
+            self.refresh_pending = True
+
+        def refresh():
+            with self.changed_lock:
+                changed, self.changed = self.changed, set()
+                self.refresh_pending = False
+            self.refresh_views(changed)
+        self.window.after(0, refresh)
+
+    def start_control_server(self):
+        from control_server import ControlServer
+
+        server = ControlServer(self.process_manager, self.settings.control_socket_address or None)
+        try:
+            server.start()
+        except OSError as e:
+            # 通常是另一个实例（或守护进程）已经在监听
+            logging.error(f"Failed to start control server: {str(e)}")
+            return
+        self.control_server = server
+
+    def report_error(self, title, message):
+        """在Tk主线程中显示错误对话框，可从任意线程调用"""
+        self.window.after(0, lambda: messagebox.showerror(title, message))
+
+    def minimize_to_tray(self):
+        """最小化到托盘"""
+        try:
+            if self.window.winfo_exists():  # 确保窗口还存在
+                self.window.withdraw()  # 隐藏窗口
+                self.update_monitor_state()
+                logging.info("Window minimized to tray successfully")
+        except Exception as e:
+            error_msg = f"Failed to minimize window to tray: {str(e)}"
+            logging.error(error_msg)
+            logging.error(f"Traceback:\n{traceback.format_exc()}")
+    
+    def quit_app(self, from_tray=False):
+        """退出应用程序"""
+        import keyboard
+        try:
+            # 如果是从托盘退出，或者用户确认退出
+            if from_tray or messagebox.askokcancel("确认退出", "确定要退出程序吗？"):
+                logging.info("User confirmed application exit")
+                
+                # 停止快捷键检查
+                self.running = False
+                logging.info("Hotkey check stopped")
+                
+                # 停止自动冻结策略和进程监视，冻结队列不再接收新操作
+                if self.focus_policy:
+                    self.focus_policy.stop()
+                if self.cpu_policy:
+                    self.cpu_policy.stop()
+                self.stop_memory_policy()
+                self.monitor_panel.deactivate()
+                if self.control_server:
+                    self.control_server.stop()
+                self.process_manager.throttler.stop()  # 恢复所有限速中的进程
+                self.process_manager.stop_watcher()
+                self.process_manager.executor.shutdown(wait=False)
+                self.process_manager.flush()  # 写入尚未保存的配置
+                
+                # 确保在退出前清理所有快捷键
+                try:
+                    keyboard.unhook_all()
+                    self.hotkey_registered = False
+                    logging.info("All keyboard hooks cleared")
+                except Exception as e:
+                    logging.error(f"Error clearing keyboard hooks: {str(e)}")
+                
+                # 停止托盘图标
+                try:
+                    if hasattr(self, 'tray_icon'):
+                        self.tray_icon.stop()
+                        logging.info("Tray icon stopped")
+                except Exception as e:
+                    logging.error(f"Error stopping tray icon: {str(e)}")
+                
+                # 销毁窗口
+                try:
+                    self.window.quit()
+                    self.window.destroy()
+                    logging.info("Main window destroyed")
+                except Exception as e:
+                    logging.error(f"Error destroying window: {str(e)}")
+                
+                logging.info("Application exit successful")
+                sys.exit(0)  # 使用sys.exit代替os._exit以允许清理
+        except Exception as e:
+            error_msg = f"Critical error during application exit: {str(e)}"
+            logging.error(error_msg)
+            logging.error(f"Traceback:\n{traceback.format_exc()}")
+            sys.exit(1)  # 使用sys.exit代替os._exit以允许清理
+
+    def add_process(self):
+        dialog = AddProcessDialog(self.window, self.process_manager.process_index)
+        self.window.wait_window(dialog.dialog)
+        if dialog.result:
+            self.process_manager.add_process(dialog.result[0], dialog.result[1],
+                                             include_children=dialog.result[2],
+                                             idle_freeze_seconds=dialog.result[3],
+                                             cpu_rule=dialog.result[4],
+                                             priority=dialog.result[5])
+            self.update_process_list()
+            self.update_tray_icon()
+            
+    def remove_process(self, process_id):
+        # 获取进程名称
+        process_name = self.process_manager.processes[process_id].get("name", process_id)
+        # 显示确认对话框
+        if messagebox.askokcancel("确认删除", f"确定要删除进程 {process_name} 吗？"):
+            self.process_manager.remove_process(process_id)
+            self.update_process_list([process_id])
+            self.update_tray_icon()
+        
+    def run(self):
+        self.window.mainloop()
+
+    def tray_icon_key(self):
+        """决定托盘图标外观的参数，作为渲染缓存的键"""
+        frozen_count = sum(1 for data in list(self.process_manager.processes.values()) if data.get('is_frozen'))
+        return (frozen_count > 0,
+                frozen_count if self.settings.show_icon_count else 0,
+                self.settings.icon_number_color,
+                self.settings.icon_shadow_color)
+
+    def create_icon_image(self):
+        """创建托盘图标图像"""
+        return render_tray_icon(*self.tray_icon_key())
+
+    def create_tray_icon(self):
+        """创建系统托盘图标"""
+        import pystray
+        def toggle_process(process_id):
+            """切换进程状态的包装函数"""
+            return lambda: self.toggle_from_tray(process_id)
+            
+        def quit_from_tray(icon):
+            """从托盘退出的包装函数"""
+            self.quit_app(from_tray=True)
+        
+        # 托盘菜单，只在可见内容变化时重建
+        self.tray_menu = TrayMenu(self.process_manager, toggle_process, [
+            ("冻结全部", lambda: self.batch_from_tray(freeze=True)),
+            ("解冻全部", lambda: self.batch_from_tray(freeze=False)),
+        ], [
+            pystray.MenuItem(
+                "显示主窗口",
+                self.show_window,
+                default=True  # 设置为默认动作（双击时执行）
+            ),
+            pystray.MenuItem(
+                "退出",
+                quit_from_tray  # 使用包装函数
+            )
+        ])
+
+        # 创建托盘图标
+        self.tray_icon_shown = self.tray_icon_key()
+        self.tray_icon = pystray.Icon(
+            "process_freezer",
+            render_tray_icon(*self.tray_icon_shown),
+            "进程冻结器",
+            menu=self.tray_menu.build()
+        )
+        
+        # 在单独的线程中启动托盘图标
+        self.tray_icon.run_detached()
+
+    def update_tray_icon(self):
+        """请求更新托盘图标，TRAY_UPDATE_DELAY_MS 内的多次请求合并为一次（Tk主线程调用）"""
+        if self.tray_update_pending or not hasattr(self, 'tray_icon'):
+            return
+        self.tray_update_pending = True
+        self.window.after(self.TRAY_UPDATE_DELAY_MS, self.apply_tray_update)
+
+    def apply_tray_update(self):
+        """图标外观或菜单的可见内容有变化时才替换"""
+        self.tray_update_pending = False
+        if not hasattr(self, 'tray_icon'):
+            return
+        key = self.tray_icon_key()
+        if key != self.tray_icon_shown:
+            self.tray_icon.icon = render_tray_icon(*key)
+            self.tray_icon_shown = key
+        menu = self.tray_menu.build()
+        if menu is not None:
+            self.tray_icon.menu = menu
+
+    def toggle_from_tray(self, process_id):
+        """从托盘菜单切换进程状态"""
+        def on_done(future):
+            if future.exception() or not future.result():
+                # 在托盘图标显示通知
+                self.tray_icon.notify(
+                    "错误",
+                    f"无法切换进程 {process_id} 的状态"
+                )
+            self.window.after(0, self.refresh_views, [process_id])
+
+        future = self.process_manager.toggle_freeze_async(process_id)
+        future.add_done_callback(on_done)
+        # 托盘回调运行在 pystray 线程，界面刷新交给Tk主线程
+        self.window.after(0, self.refresh_views, [process_id])
+
+    def batch_from_tray(self, freeze):
+        """从托盘菜单批量冻结/解冻所有进程"""
+        def on_done(future):
+            if future.exception():
+                failed = ["全部"]
+            else:
+                failed = [identifier for identifier, result in future.result().items()
+                          if not result["success"]]
+            if failed:
+                self.tray_icon.notify(
+                    "错误",
+                    f"以下进程操作失败: {', '.join(failed)}"
+                )
+            self.window.after(0, self.refresh_views)
+
+        if freeze:
+            future = self.process_manager.freeze_many_async()
+        else:
+            future = self.process_manager.resume_many_async()
+        future.add_done_callback(on_done)
+        self.window.after(0, self.refresh_views)
+
+    def show_window(self):
+        """显示主窗口"""
+        try:
+            self.window.deiconify()  # 显示窗口
+            self.window.state('normal')  # 确保窗口不是最小化状态
+            self.window.lift()  # 将窗口提升到顶层
+            self.window.focus_force()  # 强制获取焦点
+            
+            # 添加短暂延迟后再设置置顶状态
+            self.window.after(100, lambda: self.set_window_on_top(self.settings.always_on_top))
+            
+            # 更新进程列表
+            self.update_process_list()
+            self.update_monitor_state()
+            logging.info("Window shown successfully")
+        except Exception as e:
+            error_msg = f"Failed to show window: {str(e)}"
+            logging.error(error_msg)
+            logging.error(f"Traceback:\n{traceback.format_exc()}")
+
+    def handle_minimize(self, event):
+        """处理最小化事件"""
+        # 如果是最小化操作，则隐藏到托盘
+        if self.window.state() == 'iconic':
+            self.minimize_to_tray()
+
+    def show_settings_menu(self, event):
+        """显示设置菜单"""
+        # 创建设置菜单
+        settings_menu = tk.Menu(self.window, tearoff=0)
+        
+        # 添加分组标题（不可点击）
+        settings_menu.add_command(label="托盘图标", state="disabled")
+        settings_menu.add_separator()
+        
+        # 显示图标数字选项
+        self.show_count_var = tk.BooleanVar(value=self.settings.show_icon_count)
+        settings_menu.add_checkbutton(label="    显示冻结数量", 
+                                variable=self.show_count_var,
+                                command=self.toggle_icon_count)
+        
+        # 颜色选择按钮
+        settings_menu.add_command(label="    设置数字颜色", command=self.set_number_color)
+        settings_menu.add_command(label="    设置阴影颜色", command=self.set_shadow_color)
+        
+        # 添加进程冻结设置分组
+        settings_menu.add_separator()
+        settings_menu.add_command(label="进程冻结", state="disabled")
+        settings_menu.add_separator()
+        
+        # 添加隐藏窗口选项
+        self.hide_window_var = tk.BooleanVar(value=self.settings.hide_window)
+        settings_menu.add_checkbutton(label="    冻结时隐藏窗口", 
+                                    variable=self.hide_window_var,
+                                    command=self.toggle_hide_window)
+        
+        # 自动冻结新实例选项
+        self.watch_new_processes_var = tk.BooleanVar(value=self.settings.watch_new_processes)
+        settings_menu.add_checkbutton(label="    自动冻结新启动的实例", 
+                                    variable=self.watch_new_processes_var,
+                                    command=self.toggle_watch_new_processes)
+        
+        # 内存压力自动冻结选项（需要 Linux PSI）
+        self.memory_pressure_var = tk.BooleanVar(value=self.settings.memory_pressure_enabled)
+        settings_menu.add_checkbutton(label="    内存压力时自动冻结", 
+                                    variable=self.memory_pressure_var,
+                                    command=self.toggle_memory_pressure,
+                                    state="normal" if MemoryPressurePolicy.is_available() else "disabled")
+        
+        # 冻结/解冻延迟统计
+        settings_menu.add_command(label="    延迟统计", command=self.show_latency_stats)
+        
+        # 添加窗口设置分组
+        settings_menu.add_separator()
+        settings_menu.add_command(label="窗口设置", state="disabled")
+        settings_menu.add_separator()
+        
+        # 添加窗口置顶选项
+        self.always_on_top_var = tk.BooleanVar(value=self.settings.always_on_top)
+        settings_menu.add_checkbutton(label="    窗口置顶", 
+                                    variable=self.always_on_top_var,
+                                    command=self.toggle_window_on_top)
+        
+        # 添加快捷键设置分组
+        settings_menu.add_separator()
+        settings_menu.add_command(label="快捷键设置", state="disabled")
+        settings_menu.add_separator()
+        
+        # 添加修改快捷键选项
+        settings_menu.add_command(label="    修改显示/隐藏快捷键", 
+                                command=self.set_toggle_hotkey)
+
+        # 添加程序操作分组
+        settings_menu.add_separator()
+        settings_menu.add_command(label="程序操作", state="disabled")
+        settings_menu.add_separator()
+        settings_menu.add_command(label="    最小化到托盘", 
+                                command=self.minimize_to_tray)
+        settings_menu.add_command(label="    退出程序", 
+                                command=self.quit_app,
+                                foreground='#dc3545')  # 使用红色突出显示退出选项
+        
+        # 显示菜单
+        settings_menu.post(event.x_root, event.y_root)
+
+    def toggle_icon_count(self):
+        """切换是否显示图标数字"""
+        self.settings.show_icon_count = self.show_count_var.get()
+        self.settings.save_settings()
+        self.update_tray_icon()
+
+    def toggle_hide_window(self):
+        """切换是否在冻结时隐藏窗口"""
+        self.settings.hide_window = self.hide_window_var.get()
+        self.settings.save_settings()
+
+    def toggle_watch_new_processes(self):
+        """切换是否自动冻结已冻结进程新启动的实例"""
+        self.settings.watch_new_processes = self.watch_new_processes_var.get()
+        self.settings.save_settings()
+        if self.settings.watch_new_processes:
+            self.process_manager.start_watcher()
+        else:
+            self.process_manager.stop_watcher()
+
+    def toggle_memory_pressure(self):
+        """切换是否在内存压力时按优先级自动冻结"""
+        self.settings.memory_pressure_enabled = self.memory_pressure_var.get()
+        self.settings.save_settings()
+        if self.settings.memory_pressure_enabled:
+            self.start_memory_policy()
+        else:
+            self.stop_memory_policy()
+
+    def start_memory_policy(self):
+        if self.memory_policy is not None or not MemoryPressurePolicy.is_available():
+            return
+        policy = MemoryPressurePolicy(self.process_manager,
+                                      triggers=self.settings.memory_pressure_triggers,
+                                      clear_avg10=self.settings.memory_pressure_clear_avg10,
+                                      hold_seconds=self.settings.memory_pressure_hold_seconds)
+        try:
+            policy.start()
+        except OSError as e:
+            # 注册触发器需要写权限，非特权用户的窗口必须是2秒的整数倍
+            logging.error(f"Failed to start memory pressure policy: {str(e)}")
+            return
+        self.memory_policy = policy
+
+    def stop_memory_policy(self):
+        if self.memory_policy is not None:
+            self.memory_policy.stop()
+            self.memory_policy = None
+
+    def show_latency_stats(self):
+        """显示各后端和各进程的冻结/解冻延迟统计"""
+        LatencyDialog(self.window, self.process_manager.latency)
+
+    def set_number_color(self):
+        """设置数字颜色"""
+        color = tk.colorchooser.askcolor(color=self.settings.icon_number_color,
+                                       title="选择数字颜色")
+        if color and color[1]:  # color[1] 是十六进制颜色值
+            self.settings.icon_number_color = color[1]
+            self.settings.save_settings()
+            self.update_tray_icon()
+
+    def set_shadow_color(self):
+        """设置阴影颜色"""
+        color = tk.colorchooser.askcolor(color=self.settings.icon_shadow_color,
+                                       title="选择阴影颜色")
+        if color and color[1]:  # color[1] 是十六进制颜色值
+            self.settings.icon_shadow_color = color[1]
+            self.settings.save_settings()
+            self.update_tray_icon()
+
+    def set_window_on_top(self, on_top):
+        """设置窗口置顶状态"""
+        self.window.attributes('-topmost', on_top)
+        if self.settings.always_on_top != on_top:  # 每次显示窗口都会调用，没有变化时不保存
+            self.settings.always_on_top = on_top
+            self.settings.save_settings()
+
+    def toggle_window_on_top(self):
+        """切换窗口置顶状态"""
+        on_top = self.always_on_top_var.get()
+        self.set_window_on_top(on_top)
+
+    def ensure_hotkey_registered(self):
+        """确保快捷键被正确注册"""
+        import keyboard
+        if not self.running:
+            return
+            
+        try:
+            if not self.hotkey_registered:
+                logging.warning("Hotkey not registered, attempting to register")
+                self.register_hotkey()
+            else:
+                # 测试快捷键是否仍然有效
+                try:
+                    hotkeys = keyboard._listener.handlers.get(self.settings.toggle_hotkey, [])
+                    if not hotkeys:
+                        logging.warning("Hotkey handler not found, re-registering")
+                        self.register_hotkey()
+                except Exception as e:
+                    logging.error(f"Error checking hotkey status: {str(e)}")
+                    logging.error(f"Traceback:\n{traceback.format_exc()}")
+                    self.register_hotkey()
+            
+            # 只有在程序仍在运行时才继续检查
+            if self.running:
+                self.window.after(10000, self.ensure_hotkey_registered)  # 每10秒检查一次
+        except Exception as e:
+            logging.error(f"Error in ensure_hotkey_registered: {str(e)}")
+            logging.error(f"Traceback:\n{traceback.format_exc()}")
+            # 发生错误时，尝试重新注册
+            if self.running:
+                self.register_hotkey()
+
+    def register_hotkey(self):
+        """注册全局快捷键"""
+        import keyboard
+        try:
+            # 先清除已有的快捷键绑定
+            keyboard.unhook_all()
+            logging.info("Previous hotkeys cleared")
+            
+            def hotkey_callback():
+                try:
+                    if not self.window.winfo_exists():
+                        logging.warning("Window does not exist, skipping hotkey action")
+                        return
+                        
+                    # 将窗口操作放入主线程队列
+                    self.window.after(0, self._handle_hotkey_action)
+                except Exception as e:
+                    logging.error(f"Error in hotkey callback: {str(e)}")
+                    logging.error(f"Traceback:\n{traceback.format_exc()}")
+                    self.retry_register_hotkey()
+
+            # 注册新的快捷键
+            keyboard.add_hotkey(
+                self.settings.toggle_hotkey,
+                hotkey_callback,
+                suppress=True,
+                trigger_on_release=True
+            )
+            
+            self.hotkey_registered = True
+            self.hotkey_retry_count = 0
+            logging.info(f"Global hotkey registered successfully: {self.settings.toggle_hotkey}")
+            
+        except Exception as e:
+            error_msg = f"Failed to register hotkey: {str(e)}"
+            logging.error(error_msg)
+            logging.error(f"Traceback:\n{traceback.format_exc()}")
+            self.retry_register_hotkey()
+
+    def retry_register_hotkey(self):
+        """重试注册快捷键"""
+        MAX_RETRY_COUNT = 5  # 最大重试次数
+        try:
+            if self.hotkey_retry_count < MAX_RETRY_COUNT:
+                self.hotkey_retry_count += 1
+                retry_delay = min(1000 * (2 ** self.hotkey_retry_count), 30000)  # 指数退避，最大30秒
+                logging.info(f"Retrying hotkey registration (attempt {self.hotkey_retry_count}) after {retry_delay}ms")
+                self.window.after(retry_delay, self.register_hotkey)
+            else:
+                logging.error("Max retry attempts reached for hotkey registration")
+                self.hotkey_retry_count = 0  # 重置重试计数
+                messagebox.showerror("错误", "快捷键注册失败，请尝试重启应用")
+        except Exception as e:
+            logging.error(f"Error in retry_register_hotkey: {str(e)}")
+            logging.error(f"Traceback:\n{traceback.format_exc()}")
+
+    def _handle_hotkey_action(self):
+        """处理快捷键动作"""
+        try:
+            current_state = self.window.state()
+            is_visible = self.window.winfo_viewable()
+            logging.debug(f"Window state: {current_state}, Visible: {is_visible}")
+            
+            if current_state == 'withdrawn' or not is_visible:
+                logging.info("Hotkey pressed: Showing window")
+                self.show_window()
+            else:
+                logging.info("Hotkey pressed: Minimizing window")
+                self.minimize_to_tray()
+        except Exception as e:
+            logging.error(f"Error handling hotkey action: {str(e)}")
+
+    def set_toggle_hotkey(self):
+        """设置显示/隐藏快捷键"""
+        dialog = HotkeyDialog(self.window, self.settings.toggle_hotkey)
+        self.window.wait_window(dialog.dialog)
+        if dialog.result:
+            try:
+                # 更新快捷键设置
+                self.settings.toggle_hotkey = dialog.result
+                self.settings.save_settings()
+                
+                # 重置状态并重新注册快捷键
+                self.hotkey_registered = False
+                self.hotkey_retry_count = 0
+                self.register_hotkey()
+                
+                messagebox.showinfo("成功", f"快捷键已更新为: {dialog.result}")
+            except Exception as e:
+                logging.error(f"Error setting hotkey: {str(e)}")
+                messagebox.showerror("错误", f"设置快捷键失败: {str(e)}")
+
+class ProcessMonitorPanel:
+    """系统进程列表：CPU、内存、I/O 速率和线程数，可排序、过滤，一键添加并冻结
+
+    ProcessMonitor 在后台采样，只推送变化的行；界面合并推送后按 (pid, create_time) 更新行，
+    排序时只移动相对顺序变化了的行（见 process_monitor.stable_keys）。
+    """
+    COLUMNS = (("pid", "PID", 70, False), ("name", "进程名称", 220, False),
+               ("cpu_percent", "CPU%", 70, True), ("rss_mb", "内存(MB)", 90, True),
+               ("io_kbps", "I/O(KB/s)", 90, True), ("threads", "线程", 60, True))
+    SAMPLE_INTERVAL = 1.0
+
+    def __init__(self, parent, process_manager, on_add_and_freeze):
+        self.process_manager = process_manager
+        self.on_add_and_freeze = on_add_and_freeze  # on_add_and_freeze([进程名])
+        self.monitor = ProcessMonitor(process_manager.process_index, self.on_update,
+                                      interval=self.SAMPLE_INTERVAL, refresh=process_manager.refresh_index)
+        self.rows = {}  # {(pid, create_time): ProcessRow}
+        self.shown = []  # 列表中当前显示的键（按显示顺序）
+        self.sort_column = "cpu_percent"
+        self.sort_descending = True
+        self.pending_changed = {}  # 等待刷新到界面的变化
+        self.pending_removed = set()
+        self.update_pending = False
+        self.lock = threading.Lock()
+        self.default_font = ('Microsoft YaHei UI', 10)
+
+        self.frame = tk.Frame(parent, bg='white')
+        self.frame.pack(fill=tk.BOTH, expand=True)
+
+        # 过滤框和添加按钮
+        toolbar = tk.Frame(self.frame, bg='white')
+        toolbar.pack(fill=tk.X, pady=(5, 5))
+        tk.Label(toolbar, text="过滤:", font=self.default_font, bg='white').pack(side=tk.LEFT)
+        self.filter_var = tk.StringVar()
+        self.filter_var.trace_add('write', lambda *args: self.render(()))
+        tk.Entry(toolbar, textvariable=self.filter_var, font=self.default_font, width=30).pack(side=tk.LEFT, padx=5)
+        add_button = tk.Button(toolbar,
+                               text="添加并冻结",
+                               command=self.add_selected,
+                               font=self.default_font,
+                               bg='#dc3545',
+                               fg='white',
+                               relief=tk.FLAT,
+                               padx=10)
+        add_button.pack(side=tk.RIGHT)
+
+        table_frame = tk.Frame(self.frame, bg='white')
+        table_frame.pack(fill=tk.BOTH, expand=True)
+        self.tree = ttk.Treeview(table_frame, columns=[column[0] for column in self.COLUMNS],
+                                 show='headings', style='ProcessList.Treeview')
+        for column, title, width, numeric in self.COLUMNS:
+            self.tree.heading(column, text=title, anchor='w', command=lambda c=column: self.sort_by(c))
+            self.tree.column(column, width=width, anchor='e' if numeric else 'w')
+        self.tree.pack(side=tk.LEFT, fill=tk.BOTH, expand=True)
+        scrollbar = tk.Scrollbar(table_frame, command=self.tree.yview)
+        scrollbar.pack(side=tk.RIGHT, fill=tk.Y)
+        self.tree.configure(yscrollcommand=scrollbar.set)
+        self.tree.bind('<Double-1>', lambda e: self.add_selected())
+
+    def activate(self):
+        self.monitor.start()
+
+    def deactivate(self):
+        """停止采样并清空列表，再次激活时重新填充"""
+        if not self.monitor.running:
+            return
+        self.monitor.stop()
+        with self.lock:
+            self.pending_changed = {}
+            self.pending_removed = set()
+        self.rows = {}
+        self.render(())
+
+    def on_update(self, changed, removed):
+        """采样线程回调，合并为一次界面刷新"""
+        with self.lock:
+            for key in removed:
+                self.pending_changed.pop(key, None)
+            self.pending_removed.update(removed)
+            self.pending_removed.difference_update(changed)
+            self.pending_changed.update(changed)
+            if self.update_pending:
+                return
+            self.update_pending = True
+        self.frame.after(0, self.apply_updates)
+
+    def apply_updates(self):
+        with self.lock:
+            changed, self.pending_changed = self.pending_changed, {}
+            removed, self.pending_removed = self.pending_removed, set()
+            self.update_pending = False
+        if not self.monitor.running:
+            return
+        for key in removed:
+            self.rows.pop(key, None)
+        self.rows.update(changed)
+        self.render(changed)
+
+    def sort_by(self, column):
+        if column == self.sort_column:
+            self.sort_descending = not self.sort_descending
+        else:
+            self.sort_column = column
+            self.sort_descending = column not in ("pid", "name")
+        self.render(())
+
+    def visible_order(self):
+        """过滤并排序后的键列表"""
+        text = self.filter_var.get().strip().lower()
+        keys = [key for key, row in self.rows.items()
+                if not text or text in row.name.lower() or str(row.pid).startswith(text)]
+        column = self.sort_column
+        descending = self.sort_descending
+
+        def sort_key(key):
+            row = self.rows[key]
+            if column == "name":
+                return row.name.lower(), key[0]
+            value = getattr(row, column)
+            # 尚无数值的行无论升序降序都排在最后
+            return (value is not None) == descending, value or 0, key[0]
+        keys.sort(key=sort_key, reverse=descending)
+        return keys
+
+    @staticmethod
+    def iid(key):
+        return f"{key[0]}:{key[1]}"
+
+    @staticmethod
+    def values(row):
+        return (row.pid, row.name,
+                '' if row.cpu_percent is None else f"{row.cpu_percent:.1f}",
+                f"{row.rss_mb:.1f}",
+                '' if row.io_kbps is None else row.io_kbps,
+                row.threads)
+
+    def render(self, changed):
+        """把列表调整为 visible_order()：删除、插入、移动和修改尽量少的行"""
+        order = self.visible_order()
+        target = set(order)
+        gone = [key for key in self.shown if key not in target]
+        if gone:
+            self.tree.delete(*(self.iid(key) for key in gone))
+        current = [key for key in self.shown if key in target]
+        existing = set(current)
+        stable = stable_keys(current, order)
+        moved = [self.iid(key) for key in current if key not in stable]
+        if moved:
+            self.tree.detach(*moved)
+        for index, key in enumerate(order):
+            if key in stable:
+                continue
+            if key in existing:
+                self.tree.move(self.iid(key), '', index)
+            else:
+                self.tree.insert('', index, iid=self.iid(key), values=self.values(self.rows[key]))
+        for key in changed:
+            if key in existing and key in target:
+                self.tree.item(self.iid(key), values=self.values(self.rows[key]))
+        self.shown = order
+
+    def add_selected(self):
+        names = []
+        for iid in self.tree.selection():
+            pid, create_time = iid.split(':', 1)
+            row = self.rows.get((int(pid), float(create_time)))
+            if row is not None and row.name and row.name not in names:
+                names.append(row.name)
+        if names:
+            self.on_add_and_freeze(names)
+
+
+class AddProcessDialog:
+    def __init__(self, parent, process_index=None):
+        self.dialog = tk.Toplevel(parent)
+        self.dialog.title("添加进程")
+        self.dialog.geometry("420x540")
+        self.dialog.configure(bg='#f0f0f0')
+        self.dialog.resizable(False, False)
+        
+        # 设置字体
+        self.default_font = ('Microsoft YaHei UI', 10)
+        self.title_font = ('Microsoft YaHei UI', 12, 'bold')
+        
+        # 主框架
+        main_frame = tk.Frame(self.dialog, bg='#f0f0f0')
+        main_frame.pack(fill=tk.BOTH, expand=True, padx=20, pady=10)
+        
+        # 标题
+        title_label = tk.Label(main_frame,
+                             text="添加进程",
+                             font=self.title_font,
+                             bg='#f0f0f0',
+                             fg='#333333')
+        title_label.pack(pady=(0, 20))
+
+        # 拖动手柄框架
+        handle_frame = tk.Frame(main_frame, bg='#f0f0f0')
+        handle_frame.pack(fill=tk.X, pady=(0, 20))
+        
+        handle_label = tk.Label(handle_frame,
+                              text="拖动句柄到目标窗口获取进程标识：",
+                              font=self.default_font,
+                              bg='#f0f0f0',
+                              fg='#333333')
+        handle_label.pack(side=tk.LEFT, padx=(0, 10))
+        
+        # 创建拖动手柄
+        self.drag_handle = DragHandle(handle_frame, self.on_process_identified, process_index)
+        self.drag_handle.pack(side=tk.LEFT)
+        
+        # 进程ID输入框架
+        id_frame = tk.Frame(main_frame, bg='#f0f0f0')
+        id_frame.pack(fill=tk.X, pady=(0, 10))
+        
+        id_label = tk.Label(id_frame,
+                          text="进程标识符：",
+                          font=self.default_font,
+                          bg='#f0f0f0',
+                          fg='#333333')
+        id_label.pack(side=tk.LEFT)
+        
+        self.id_entry = tk.Entry(id_frame,
+                               font=self.default_font,
+                               width=30)
+        self.id_entry.pack(side=tk.LEFT, padx=(10, 0))
+        
+        # 进程名称输入框架
+        name_frame = tk.Frame(main_frame, bg='#f0f0f0')
+        name_frame.pack(fill=tk.X, pady=(0, 10))
+        
+        name_label = tk.Label(name_frame,
+                            text="进程名称：",
+                            font=self.default_font,
+                            bg='#f0f0f0',
+                            fg='#333333')
+        name_label.pack(side=tk.LEFT)
+        
+        self.name_entry = tk.Entry(name_frame,
+                                 font=self.default_font,
+                                 width=30)
+        self.name_entry.pack(side=tk.LEFT, padx=(10, 0))
+        
+        # 子进程选项（浏览器、Electron 等多进程程序需要整棵进程树一起冻结）
+        self.include_children_var = tk.BooleanVar(value=False)
+        include_children_check = tk.Checkbutton(main_frame,
+                                                text="同时冻结子进程",
+                                                variable=self.include_children_var,
+                                                font=self.default_font,
+                                                bg='#f0f0f0',
+                                                fg='#333333',
+                                                activebackground='#f0f0f0')
+        include_children_check.pack(anchor='w', pady=(0, 10))
+        
+        # 后台自动冻结时间输入框架
+        idle_frame = tk.Frame(main_frame, bg='#f0f0f0')
+        idle_frame.pack(fill=tk.X, pady=(0, 10))
+        
+        idle_label = tk.Label(idle_frame,
+                            text="后台自动冻结(秒，0为关闭)：",
+                            font=self.default_font,
+                            bg='#f0f0f0',
+                            fg='#333333')
+        idle_label.pack(side=tk.LEFT)
+        
+        self.idle_entry = tk.Entry(idle_frame,
+                                 font=self.default_font,
+                                 width=8)
+        self.idle_entry.insert(0, "0")
+        self.idle_entry.pack(side=tk.LEFT, padx=(10, 0))
+        
+        # CPU阈值自动冻结输入框架
+        cpu_frame = tk.Frame(main_frame, bg='#f0f0f0')
+        cpu_frame.pack(fill=tk.X, pady=(0, 10))
+        
+        cpu_label = tk.Label(cpu_frame,
+                           text="后台CPU超过(%，0为关闭)：",
+                           font=self.default_font,
+                           bg='#f0f0f0',
+                           fg='#333333')
+        cpu_label.pack(side=tk.LEFT)
+        
+        self.cpu_threshold_entry = tk.Entry(cpu_frame,
+                                          font=self.default_font,
+                                          width=5)
+        self.cpu_threshold_entry.insert(0, "0")
+        self.cpu_threshold_entry.pack(side=tk.LEFT, padx=(10, 0))
+        
+        cpu_window_label = tk.Label(cpu_frame,
+                                  text="持续(秒)：",
+                                  font=self.default_font,
+                                  bg='#f0f0f0',
+                                  fg='#333333')
+        cpu_window_label.pack(side=tk.LEFT, padx=(10, 0))
+        
+        self.cpu_window_entry = tk.Entry(cpu_frame,
+                                       font=self.default_font,
+                                       width=5)
+        self.cpu_window_entry.insert(0, "30")
+        self.cpu_window_entry.pack(side=tk.LEFT, padx=(10, 0))
+        
+        # 优先级输入框架（内存压力时先冻结优先级低的进程）
+        priority_frame = tk.Frame(main_frame, bg='#f0f0f0')
+        priority_frame.pack(fill=tk.X, pady=(0, 20))
+        
+        priority_label = tk.Label(priority_frame,
+                                text="优先级(越大越晚被冻结)：",
+                                font=self.default_font,
+                                bg='#f0f0f0',
+                                fg='#333333')
+        priority_label.pack(side=tk.LEFT)
+        
+        self.priority_entry = tk.Entry(priority_frame,
+                                     font=self.default_font,
+                                     width=5)
+        self.priority_entry.insert(0, "0")
+        self.priority_entry.pack(side=tk.LEFT, padx=(10, 0))
+        
+        # 按钮框架
+        button_frame = tk.Frame(main_frame, bg='#f0f0f0')
+        button_frame.pack(pady=10)
+        
+        # 确定按钮
+        self.ok_button = tk.Button(button_frame,
+                                 text="确定",
+                                 command=self.ok,
+                                 font=self.default_font,
+                                 bg='#007bff',
+                                 fg='white',
+                                 relief=tk.FLAT,
+                                 width=10)
+        self.ok_button.pack(side=tk.LEFT, padx=5)
+        
+        # 取消按钮
+        self.cancel_button = tk.Button(button_frame,
+                                     text="取消",
+                                     command=self.cancel,
+                                     font=self.default_font,
+                                     bg='#6c757d',
+                                     fg='white',
+                                     relief=tk.FLAT,
+                                     width=10)
+        self.cancel_button.pack(side=tk.LEFT, padx=5)
+        
+        # 绑定鼠标悬停事件
+        for btn in [self.ok_button, self.cancel_button]:
+            btn.bind('<Enter>', lambda e, b=btn: self.on_hover(e, b))
+            btn.bind('<Leave>', lambda e, b=btn: self.on_leave(e, b))
+
+        self.result = None
+        
+        # 设置对话框为模态
+        self.dialog.transient(parent)
+        self.dialog.grab_set()
+    
+    def on_process_identified(self, process_name, window_title):
+        """当通过拖动识别到进程时调用"""
+        self.id_entry.delete(0, tk.END)
+        self.id_entry.insert(0, process_name)
+        
+        # 如果名称框为空，则使用窗口标题作为默认名称
+        if not self.name_entry.get() and window_title:
+            self.name_entry.delete(0, tk.END)
+            self.name_entry.insert(0, window_title)
+    
+    def on_hover(self, event, button):
+        """鼠标悬停效果"""
+        if button == self.ok_button:
+            button.configure(bg='#0056b3')  # 深蓝色
+        else:
+            button.configure(bg='#5a6268')  # 深灰色
+    
+    def on_leave(self, event, button):
+        """鼠标离开效果"""
+        if button == self.ok_button:
+            button.configure(bg='#007bff')  # 恢复蓝色
+        else:
+            button.configure(bg='#6c757d')  # 恢复灰色
+    
+    def ok(self):
+        """确定按钮回调"""
+        process_id = self.id_entry.get().strip()
+        process_name = self.name_entry.get().strip()
+        
+        if not process_id:
+            messagebox.showerror("错误", "请输入进程标识符")
+            return
+        
+        try:
+            idle_freeze_seconds = int(self.idle_entry.get().strip() or 0)
+            if idle_freeze_seconds < 0:
+                raise ValueError
+        except ValueError:
+            messagebox.showerror("错误", "后台自动冻结时间必须是非负整数")
+            return
+        
+        try:
+            cpu_threshold = float(self.cpu_threshold_entry.get().strip() or 0)
+            cpu_window = float(self.cpu_window_entry.get().strip() or 30)
+            if cpu_threshold < 0 or cpu_window <= 0:
+                raise ValueError
+        except ValueError:
+            messagebox.showerror("错误", "CPU阈值必须是非负数，持续时间必须大于0")
+            return
+        cpu_rule = None
+        if cpu_threshold > 0:
+            cpu_rule = {"threshold": cpu_threshold, "window": cpu_window, "background_only": True}
+        
+        try:
+            priority = int(self.priority_entry.get().strip() or 0)
+        except ValueError:
+            messagebox.showerror("错误", "优先级必须是整数")
+            return
+        
+        self.result = (process_id, process_name, self.include_children_var.get(),
+                       idle_freeze_seconds, cpu_rule, priority)
+        self.dialog.destroy()
+    
+    def cancel(self):
+        """取消按钮回调"""
+        self.dialog.destroy()
+
+# 新增：快捷键设置对话框
+class HotkeyDialog:
+    def __init__(self, parent, current_hotkey):
+        import keyboard
+        self.dialog = tk.Toplevel(parent)
+        self.dialog.title("设置快捷键")
+        self.dialog.geometry("400x200")
+        self.dialog.configure(bg='#f0f0f0')
+        self.dialog.resizable(False, False)
+        
+        self.default_font = ('Microsoft YaHei UI', 10)
+        self.result = None
+        
+        # 主框架
+        main_frame = tk.Frame(self.dialog, bg='#f0f0f0')
+        main_frame.pack(fill=tk.BOTH, expand=True, padx=20, pady=10)
+        
+        # 说明标签
+        instruction = tk.Label(main_frame,
+                             text="请按下新的快捷键组合\n当前快捷键: " + current_hotkey,
+                             font=self.default_font,
+                             bg='#f0f0f0',
+                             fg='#333333')
+        instruction.pack(pady=20)
+        
+        # 快捷键显示框
+        self.hotkey_var = tk.StringVar(value="按下快捷键...")
+        self.hotkey_label = tk.Label(main_frame,
+                                   textvariable=self.hotkey_var,
+                                   font=('Microsoft YaHei UI', 12, 'bold'),
+                                   bg='white',
+                                   fg='#007bff',
+                                   relief=tk.SUNKEN,
+                                   padx=10,
+                                   pady=5)
+        self.hotkey_label.pack(pady=20)
+        
+        # 按钮框架
+        button_frame = tk.Frame(main_frame, bg='#f0f0f0')
+        button_frame.pack(pady=10)
+        
+        # 确定按钮
+        self.ok_button = tk.Button(button_frame,
+                                 text="确定",
+                                 command=self.ok,
+                                 font=self.default_font,
+                                 bg='#007bff',
+                                 fg='white',
+                                 relief=tk.FLAT,
+                                 width=10,
+                                 state=tk.DISABLED)
+        self.ok_button.pack(side=tk.LEFT, padx=5)
+        
+        # 取消按钮
+        self.cancel_button = tk.Button(button_frame,
+                                     text="取消",
+                                     command=self.cancel,
+                                     font=self.default_font,
+                                     bg='#6c757d',
+                                     fg='white',
+                                     relief=tk.FLAT,
+                                     width=10)
+        self.cancel_button.pack(side=tk.LEFT, padx=5)
+        
+        # 开始监听按键
+        self.current_keys = set()
+        keyboard.hook(self.on_key_event)
+        
+        # 设置对话框为模态
+        self.dialog.transient(parent)
+        self.dialog.grab_set()
+        
+    def on_key_event(self, event):
+        """处理按键事件"""
+        import keyboard
+        try:
+            if not self.dialog.winfo_exists():  # 检查对话框是否还存在
+                return
+                
+            if event.event_type == 'down':
+                self.current_keys.add(event.name)
+            elif event.event_type == 'up':
+                if event.name in self.current_keys:
+                    self.current_keys.remove(event.name)
+                
+                if not self.current_keys:  # 当所有键都释放时
+                    if len(set(event.name) | self.current_keys) > 1:  # 确保不是单个按键
+                        hotkey = '+'.join(sorted(set(event.name) | self.current_keys))
+                        self.hotkey_var.set(hotkey)
+                        if self.ok_button.winfo_exists():  # 检查按钮是否还存在
+                            self.ok_button.configure(state=tk.NORMAL)
+        except Exception as e:
+            logging.error(f"Error in hotkey dialog: {str(e)}")
+            keyboard.unhook_all()  # 出错时清理键盘钩子
+    
+    def ok(self):
+        """确定按钮回调"""
+        import keyboard
+        try:
+            self.result = self.hotkey_var.get()
+        finally:
+            keyboard.unhook_all()  # 确保在任何情况下都清理键盘钩子
+            self.dialog.destroy()
+    
+    def cancel(self):
+        """取消按钮回调"""
+        import keyboard
+        try:
+            keyboard.unhook_all()  # 清理键盘钩子
+        finally:
+            self.dialog.destroy()
+
+# 延迟统计对话框
+class LatencyDialog:
+    COLUMNS = (("category", "分类", 70), ("name", "名称", 140), ("operation", "操作", 90),
+               ("phase", "阶段", 70), ("count", "次数", 60), ("p50_ms", "p50(ms)", 80),
+               ("p95_ms", "p95(ms)", 80), ("p99_ms", "p99(ms)", 80), ("max_ms", "最大(ms)", 80))
+    CATEGORY_NAMES = {"backend": "后端", "target": "进程"}
+
+    def __init__(self, parent, recorder):
+        self.recorder = recorder
+        self.dialog = tk.Toplevel(parent)
+        self.dialog.title("延迟统计")
+        self.dialog.geometry("820x420")
+        self.dialog.configure(bg='#f0f0f0')
+        
+        self.default_font = ('Microsoft YaHei UI', 10)
+        
+        # 主框架
+        main_frame = tk.Frame(self.dialog, bg='#f0f0f0')
+        main_frame.pack(fill=tk.BOTH, expand=True, padx=20, pady=10)
+        
+        # 统计表格
+        table_frame = tk.Frame(main_frame, bg='#f0f0f0')
+        table_frame.pack(fill=tk.BOTH, expand=True)
+        self.tree = ttk.Treeview(table_frame, columns=[column[0] for column in self.COLUMNS],
+                                 show='headings')
+        for column, title, width in self.COLUMNS:
+            self.tree.heading(column, text=title)
+            self.tree.column(column, width=width, anchor='w')
+        self.tree.pack(side=tk.LEFT, fill=tk.BOTH, expand=True)
+        scrollbar = tk.Scrollbar(table_frame, command=self.tree.yview)
+        scrollbar.pack(side=tk.RIGHT, fill=tk.Y)
+        self.tree.configure(yscrollcommand=scrollbar.set)
+        
+        # 按钮框架
+        button_frame = tk.Frame(main_frame, bg='#f0f0f0')
+        button_frame.pack(pady=10)
+        
+        for text, command, color in (("刷新", self.refresh, '#007bff'),
+                                     ("导出JSON", self.export_json, '#28a745'),
+                                     ("清空", self.reset, '#6c757d')):
+            tk.Button(button_frame,
+                      text=text,
+                      command=command,
+                      font=self.default_font,
+                      bg=color,
+                      fg='white',
+                      relief=tk.FLAT,
+                      width=10).pack(side=tk.LEFT, padx=5)
+        
+        self.dialog.transient(parent)
+        self.refresh()
+    
+    def refresh(self):
+        """重新读取统计结果"""
+        self.tree.delete(*self.tree.get_children())
+        for category, name, operation, phase, summary in self.recorder.rows():
+            values = [self.CATEGORY_NAMES[category], name, operation, phase]
+            values += ['' if summary[key] is None else summary[key]
+                       for key in ("count", "p50_ms", "p95_ms", "p99_ms", "max_ms")]
+            self.tree.insert('', tk.END, values=values)
+    
+    def export_json(self):
+        """导出为 JSON 文件"""
+        path = filedialog.asksaveasfilename(parent=self.dialog,
+                                            defaultextension=".json",
+                                            initialfile="latency.json",
+                                            filetypes=[("JSON", "*.json")])
+        if not path:
+            return
+        try:
+            self.recorder.dump_json(path)
+            logging.info(f"Latency stats exported to {path}")
+        except Exception as e:
+            logging.error(f"Failed to export latency stats: {str(e)}")
+            messagebox.showerror("错误", f"导出失败: {str(e)}", parent=self.dialog)
+    
+    def reset(self):
+        """清空已收集的统计"""
+        self.recorder.reset()
+        self.refresh()
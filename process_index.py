@@ -0,0 +1,248 @@
+"""进程表查询
+
+ProcessIndex 是 ProcessManager、WindowHider 和 DragHandle 共用的进程索引，
+按小写进程名和 (pid, create_time) 组织。索引不会每次重建：refresh() 只比较
+PID 集合的差异，仅为新出现的进程读取详细信息，按名称查询的开销只与匹配数有关。
+PID 被复用时 PID 集合不变，因此 pids_for() 返回前会核对每个匹配进程的启动时间，
+不一致的记录重新读取，避免把复用了该 PID 的无关进程当成目标。
+每次增删记录都写入一个有界的变更日志，RuleResolver 等使用者据此增量同步（见 changes_since）。
+同时维护 父进程 -> 子进程 索引，用于整棵进程树的冻结；父进程晚于子进程启动时
+（ppid 指向的PID已被复用）不视为父子关系。
+"""
+import time
+import logging
+import itertools
+import threading
+from collections import defaultdict, deque
+
+import psutil
+
+
+class ProcessIndex:
+    """增量维护的 进程名 -> PID、(pid, create_time) -> 进程 和 父PID -> 子PID 索引"""
+
+    CHANGE_LOG_SIZE = 4096  # 变更日志保留的条数，落后更多的使用者需要全量同步
+
+    def __init__(self, verify=True):
+        self._lock = threading.RLock()
+        self.verify = verify  # 查询时是否核对启动时间；只写入合成记录（add_record）时关闭
+        self.records = {}  # {pid: (create_time, 小写进程名, 原始进程名, ppid)}
+        self.by_key = {}  # {(pid, create_time): 原始进程名}
+        self.by_name = defaultdict(set)
+        self.children = defaultdict(set)
+        self.last_refresh = 0.0
+        self.generation = 0  # 每次增删记录时递增，供 RuleResolver 判断是否需要重新求值
+        self._changes = deque(maxlen=self.CHANGE_LOG_SIZE)  # [((pid, create_time), 进程名，删除时为 None)]
+
+    def refresh(self):
+        """与当前进程表比较差异并更新索引，返回 (新增PID集合, 退出PID集合)"""
+        current = set(psutil.pids())
+        with self._lock:
+            known = set(self.records)
+        added = current - known
+        removed = known - current
+        # 读取新进程信息时不持有锁，避免阻塞查询
+        new_records = [(pid, self._read(pid)) for pid in added]
+        with self._lock:
+            for pid in removed:
+                self._remove(pid)
+            for pid, record in new_records:
+                if record is not None:
+                    self._add(pid, *record)
+            self.last_refresh = time.monotonic()
+        if added or removed:
+            logging.debug(f"Process index updated: +{len(added)} -{len(removed)}, {len(self.records)} total")
+        return added, removed
+
+    def add_pid(self, pid):
+        """记录新启动（或刚 exec）的进程，返回进程名；进程已退出时移除旧记录并返回 None
+
+        exec 后 PID 和启动时间都不变，但进程名、命令行等会变，因此总是替换旧记录，
+        变更日志中同一个键先删除再添加，使用者会重新求值。
+        """
+        record = self._read(pid)
+        if record is None:
+            self.remove_pid(pid)
+            return None
+        with self._lock:
+            self._remove(pid)  # PID 复用时替换旧记录
+            self._add(pid, *record)
+        return record[1]
+
+    def remove_pid(self, pid):
+        """移除已退出的进程"""
+        with self._lock:
+            self._remove(pid)
+
+    def add_record(self, pid, name, ppid=None, create_time=0.0):
+        """直接写入一条记录（不访问系统进程表）"""
+        with self._lock:
+            self._remove(pid)
+            self._add(pid, create_time, name, ppid)
+
+    @staticmethod
+    def _read(pid):
+        """读取 (create_time, name, ppid)，进程已退出时返回 None"""
+        try:
+            proc = psutil.Process(pid)
+            with proc.oneshot():
+                name = proc.name() or ''
+                try:
+                    create_time = proc.create_time()
+                except psutil.AccessDenied:
+                    create_time = 0.0
+                try:
+                    ppid = proc.ppid()
+                except psutil.AccessDenied:
+                    ppid = None
+            return create_time, name, ppid
+        except (psutil.NoSuchProcess, psutil.ZombieProcess):
+            return None
+        except psutil.AccessDenied:
+            return 0.0, '', None
+
+    def _add(self, pid, create_time, name, ppid):
+        self.generation += 1
+        self._changes.append(((pid, create_time), name))
+        key = name.lower()
+        self.records[pid] = (create_time, key, name, ppid)
+        self.by_key[(pid, create_time)] = name
+        self.by_name[key].add(pid)
+        if ppid is not None and ppid != pid:
+            self.children[ppid].add(pid)
+
+    def _remove(self, pid):
+        record = self.records.pop(pid, None)
+        if record is None:
+            return
+        self.generation += 1
+        create_time, key, _, ppid = record
+        self._changes.append(((pid, create_time), None))
+        self.by_key.pop((pid, create_time), None)
+        pids = self.by_name.get(key)
+        if pids is not None:
+            pids.discard(pid)
+            if not pids:
+                del self.by_name[key]
+        siblings = self.children.get(ppid)
+        if siblings is not None:
+            siblings.discard(pid)
+            if not siblings:
+                del self.children[ppid]
+
+    def __len__(self):
+        return len(self.records)
+
+    def __contains__(self, pid):
+        return pid in self.records
+
+    def pids_for(self, identifier):
+        """将进程标识符（进程名或PID）解析为PID列表，按名称查询时只返回启动时间与记录一致的进程"""
+        with self._lock:
+            if identifier.isdigit():
+                pid = int(identifier)
+                return [pid] if pid in self.records else []
+            pids = sorted(self.by_name.get(identifier.lower(), ()))
+        if self.verify and self.revalidate(pids):
+            with self._lock:
+                pids = sorted(self.by_name.get(identifier.lower(), ()))
+        return pids
+
+    def revalidate(self, pids):
+        """核对这些进程的启动时间，重新读取PID已被复用或已退出的记录；返回被替换的记录数"""
+        stale = []
+        for pid in pids:
+            record = self.records.get(pid)
+            if record is None:
+                continue
+            try:
+                create_time = psutil.Process(pid).create_time()
+            except (psutil.NoSuchProcess, psutil.ZombieProcess):
+                stale.append(pid)
+                continue
+            except psutil.AccessDenied:
+                continue  # 无法判断，保留原记录
+            if create_time != record[0]:
+                stale.append(pid)
+        for pid in stale:
+            self.add_pid(pid)
+        return len(stale)
+
+    def name_of(self, pid):
+        """返回进程名，未知的PID返回 None"""
+        record = self.records.get(pid)
+        return record[2] if record else None
+
+    def key_of(self, pid):
+        """返回进程的 (pid, create_time) 键"""
+        record = self.records.get(pid)
+        return (pid, record[0]) if record else None
+
+    def snapshot(self):
+        """返回 {(pid, create_time): 进程名} 的副本"""
+        with self._lock:
+            return dict(self.by_key)
+
+    def changes_since(self, generation):
+        """返回 (当前版本, 自 generation 以来的变更列表 [(键, 进程名或 None)])
+
+        变更日志已不完整（落后超过 CHANGE_LOG_SIZE 条，或 generation 为 None）时变更列表为 None，
+        调用方需要改用 snapshot() 全量同步。
+        """
+        with self._lock:
+            behind = None if generation is None else self.generation - generation
+            if behind is None or behind < 0 or behind > len(self._changes):
+                return self.generation, None
+            return self.generation, list(itertools.islice(reversed(self._changes), behind))[::-1]
+
+    def lookup(self, pid, create_time):
+        """按 (pid, create_time) 查询进程名，可以区分被复用的PID"""
+        return self.by_key.get((pid, create_time))
+
+    def subtree(self, root_pids):
+        """返回以 root_pids 为根的所有进程，父进程总在子进程之前（先根顺序）"""
+        ordered = []
+        visited = set()
+        with self._lock:
+            for root in self._top_level(root_pids):
+                stack = [root]
+                while stack:
+                    pid = stack.pop()
+                    # PID复用可能造成环，已访问的节点直接跳过
+                    if pid in visited:
+                        continue
+                    visited.add(pid)
+                    ordered.append(pid)
+                    stack.extend(sorted(self._children_of(pid), reverse=True))
+        return ordered
+
+    def _top_level(self, pids):
+        """去掉祖先也在 pids 中的进程（如 chrome.exe 的子进程也叫 chrome.exe）"""
+        pid_set = set(pids)
+        roots = []
+        for pid in pids:
+            seen = {pid}
+            ancestor = self._parent(pid)
+            while ancestor is not None and ancestor not in seen and ancestor not in pid_set:
+                seen.add(ancestor)
+                ancestor = self._parent(ancestor)
+            if ancestor is None or ancestor in seen:
+                roots.append(pid)
+        return roots
+
+    def _children_of(self, pid):
+        """pid 的子进程，只包含不早于 pid 启动的进程"""
+        return [child for child in self.children.get(pid, ()) if self._parent(child) == pid]
+
+    def _parent(self, pid):
+        """父进程PID；父进程未知或晚于 pid 启动（ppid 指向的PID已被复用）时返回 None
+
+        Windows 下父进程退出后 ppid 不会更新，孤儿进程的 ppid 可能指向复用该PID的无关进程。
+        """
+        record = self.records.get(pid)
+        if record is None or record[3] is None:
+            return None
+        parent = self.records.get(record[3])
+        if parent is None or parent[0] > record[0]:
+            return None
+        return record[3]
@@ -0,0 +1,241 @@
+"""系统进程监视
+
+ProcessMonitor 在后台线程中按固定间隔采样所有进程的 CPU 占用、常驻内存、I/O 速率和线程数，
+与上一次的结果比较，只把显示内容有变化的行交给回调：
+
+    monitor = ProcessMonitor(process_index, on_update, interval=1.0)
+    monitor.start()
+    # on_update(changed, removed) 在采样线程中调用：
+    #   changed: {(pid, create_time): ProcessRow}，removed: [(pid, create_time)]
+
+进程列表来自共享的 ProcessIndex（增量刷新）。ProcessStatsReader 在 Linux 下直接读
+/proc/<pid>/stat 和 /proc/<pid>/io，文件描述符在两次采样之间保持打开（同 cpu_sampler.CpuSampler），
+其他平台使用缓存的 psutil.Process。
+"""
+import os
+import sys
+import time
+import bisect
+import logging
+import threading
+from collections import namedtuple
+
+import psutil
+
+from cpu_sampler import fd_cache_limit
+
+# 数值已按显示精度取整，两行相等即显示内容相同；尚未有两次采样时 cpu_percent/io_kbps 为 None
+ProcessRow = namedtuple("ProcessRow", "pid name cpu_percent rss_mb io_kbps threads")
+
+
+class ProcessStatsReader:
+    """批量读取进程的 (累计CPU秒数, 常驻内存字节, 累计读写字节, 线程数)；无权读取I/O时累计读写字节为 None"""
+
+    MAX_OPEN_FILES = 8000  # 最多缓存的 /proc 文件描述符数量（与 CpuSampler 共用的预算见 fd_cache_limit），超出的进程每次重新打开
+
+    def __init__(self):
+        self.use_procfs = sys.platform.startswith('linux')
+        self._clock_ticks = os.sysconf('SC_CLK_TCK') if self.use_procfs else None
+        self._page_size = os.sysconf('SC_PAGE_SIZE') if self.use_procfs else None
+        self.max_open_files = fd_cache_limit(self.MAX_OPEN_FILES)
+        self._fds = {}  # Linux 下保持打开的 {pid: [stat 描述符, io 描述符（-1 表示无权读取）]}
+        self._processes = {}  # 非Linux平台缓存的 psutil.Process 对象
+
+    def read(self, pids):
+        """返回 {pid: (cpu, rss, io, threads)}，已退出的进程不在结果中"""
+        if self.use_procfs:
+            return self._read_procfs(pids)
+        return self._read_psutil(pids)
+
+    def close(self):
+        for fds in self._fds.values():
+            self._close(fds)
+        self._fds = {}
+
+    @staticmethod
+    def _close(fds):
+        for fd in fds:
+            if fd is not None and fd >= 0:
+                os.close(fd)
+
+    def _read_procfs(self, pids):
+        stats = {}
+        ticks = self._clock_ticks
+        old_fds = self._fds
+        new_fds = {}
+        opened = 0
+        for pid in pids:
+            fds = old_fds.pop(pid, None) or [None, None]
+            try:
+                if fds[0] is None:
+                    fds[0] = os.open(f'/proc/{pid}/stat', os.O_RDONLY)
+                data = os.pread(fds[0], 512, 0)
+            except OSError:
+                # 进程已退出（旧描述符读取返回 ESRCH）
+                self._close(fds)
+                continue
+            # 进程名可能包含空格和括号，从最后一个右括号之后开始分割
+            fields = data[data.rindex(b')') + 2:].split(None, 22)
+            cpu = (int(fields[11]) + int(fields[12])) / ticks  # utime + stime
+            threads = int(fields[17])
+            rss = int(fields[21]) * self._page_size
+            stats[pid] = (cpu, rss, self._read_io(pid, fds), threads)
+            opened += 2
+            if opened <= self.max_open_files:
+                new_fds[pid] = fds
+            else:
+                self._close(fds)
+        # 不再采样的进程关闭其描述符
+        for fds in old_fds.values():
+            self._close(fds)
+        self._fds = new_fds
+        return stats
+
+    @staticmethod
+    def _read_io(pid, fds):
+        if fds[1] == -1:
+            return None
+        try:
+            if fds[1] is None:
+                fds[1] = os.open(f'/proc/{pid}/io', os.O_RDONLY)
+            lines = os.pread(fds[1], 512, 0).split(b'\n')
+            # read_bytes 和 write_bytes：实际发生的磁盘读写
+            return int(lines[4].split()[1]) + int(lines[5].split()[1])
+        except PermissionError:  # 其他用户的进程
+            fds[1] = -1
+        except (OSError, IndexError, ValueError):
+            pass
+        return None
+
+    def _read_psutil(self, pids):
+        stats = {}
+        processes = {}
+        for pid in pids:
+            proc = self._processes.get(pid)
+            try:
+                if proc is None:
+                    proc = psutil.Process(pid)
+                with proc.oneshot():
+                    cpu = proc.cpu_times()
+                    rss = proc.memory_info().rss
+                    threads = proc.num_threads()
+                    try:
+                        counters = proc.io_counters()
+                        io = counters.read_bytes + counters.write_bytes
+                    except (psutil.AccessDenied, AttributeError):  # macOS 没有 io_counters
+                        io = None
+            except (psutil.NoSuchProcess, psutil.AccessDenied, psutil.ZombieProcess):
+                continue
+            stats[pid] = (cpu.user + cpu.system, rss, io, threads)
+            processes[pid] = proc
+        # 只保留仍在采样的进程，避免缓存无限增长
+        self._processes = processes
+        return stats
+
+
+class ProcessMonitor:
+    """定期采样所有进程，只把有变化的行交给 on_update"""
+
+    def __init__(self, process_index, on_update, interval=1.0, reader=None, refresh=None):
+        self.process_index = process_index
+        self.on_update = on_update
+        self.interval = interval
+        self.refresh = refresh or process_index.refresh  # 刷新进程索引（监视器运行时可以跳过）
+        self.reader = reader or ProcessStatsReader()
+        self.cpu_count = psutil.cpu_count() or 1
+        self.rows = {}  # {(pid, create_time): ProcessRow}，最近一次采样的结果
+        self._last_stats = {}  # {(pid, create_time): (cpu, io)}
+        self._last_sample = None
+        self._stop_event = threading.Event()
+        self._thread = None
+
+    @property
+    def running(self):
+        return self._thread is not None
+
+    def start(self):
+        if self._thread is not None:
+            return
+        self._stop_event.clear()
+        self._thread = threading.Thread(target=self._run, name="process-monitor", daemon=True)
+        self._thread.start()
+        logging.info(f"Process monitor started, interval {self.interval}s")
+
+    def stop(self):
+        """停止采样；下次 start 时重新从空表开始，所有行都会作为变化推送"""
+        self._stop_event.set()
+        if self._thread is not None:
+            self._thread.join(timeout=2)
+            self._thread = None
+        self.reader.close()
+        self.rows = {}
+        self._last_stats = {}
+        self._last_sample = None
+
+    def _run(self):
+        while not self._stop_event.is_set():
+            try:
+                changed, removed = self.sample()
+                if (changed or removed) and not self._stop_event.is_set():
+                    self.on_update(changed, removed)
+            except Exception as e:
+                logging.error(f"Process monitor sampling failed: {str(e)}")
+            self._stop_event.wait(self.interval)
+
+    def sample(self, now=None):
+        """采样一次，返回 (变化的行, 消失的进程)"""
+        now = time.monotonic() if now is None else now
+        self.refresh()
+        processes = self.process_index.snapshot()
+        stats = self.reader.read([pid for pid, _ in processes])
+        elapsed = now - self._last_sample if self._last_sample is not None else None
+        rows = {}
+        last_stats = {}
+        for key, name in processes.items():
+            sample = stats.get(key[0])
+            if sample is None:
+                continue
+            cpu, rss, io, threads = sample
+            previous = self._last_stats.get(key)
+            cpu_percent = io_kbps = None
+            if previous is not None and elapsed:
+                # 占整机CPU的百分比（与任务管理器一致）
+                cpu_percent = round(max(cpu - previous[0], 0.0) / elapsed / self.cpu_count * 100, 1)
+                if io is not None and previous[1] is not None:
+                    io_kbps = round(max(io - previous[1], 0) / elapsed / 1024)
+            rows[key] = ProcessRow(key[0], name, cpu_percent, round(rss / 2 ** 20, 1), io_kbps, threads)
+            last_stats[key] = (cpu, io)
+        changed = {key: row for key, row in rows.items() if self.rows.get(key) != row}
+        removed = [key for key in self.rows if key not in rows]
+        self.rows = rows
+        self._last_stats = last_stats
+        self._last_sample = now
+        return changed, removed
+
+
+def stable_keys(current, target):
+    """current 和 target 是同一批键的两种顺序，返回不需要移动的最大键集合
+
+    只移动其余的键即可把 current 变成 target（最长递增子序列），排序列表每次刷新时
+    大部分行的相对顺序不变，需要移动的行数与变化的行数相当，而不是与列表长度相当。
+    """
+    position = {key: index for index, key in enumerate(target)}
+    sequence = [position[key] for key in current]
+    tails = []  # tails[i]: 长度为 i+1 的递增子序列的最小末尾在 sequence 中的下标
+    tail_values = []
+    parents = [-1] * len(sequence)
+    for index, value in enumerate(sequence):
+        length = bisect.bisect_left(tail_values, value)
+        parents[index] = tails[length - 1] if length else -1
+        if length == len(tails):
+            tails.append(index)
+            tail_values.append(value)
+        else:
+            tails[length] = index
+            tail_values[length] = value
+    stable = set()
+    index = tails[-1] if tails else -1
+    while index >= 0:
+        stable.add(current[index])
+        index = parents[index]
+    return stable
@@ -0,0 +1,209 @@
+"""进程启动/退出监视
+
+ProcessWatcher 在后台线程中把进程的启动和退出作为事件回调给订阅者：
+- NetlinkProcWatcher: Linux 下通过 netlink proc connector 接收内核事件，空闲时阻塞在 select 上
+- PollingProcWatcher: 其他平台（或没有 CAP_NET_ADMIN 权限时）定期比较 PID 集合的差异
+"""
+import os
+import sys
+import errno
+import socket
+import struct
+import logging
+import selectors
+import threading
+
+import psutil
+
+
+class ProcessWatcher:
+    """监视器基类，子类实现 _run，通过 _emit_start/_emit_exit 发出事件"""
+    name = "base"
+    is_live = False  # 事件是否实时到达（而不是周期性比较得到）
+
+    def __init__(self):
+        self._start_callbacks = []
+        self._exit_callbacks = []
+        self._stop_event = threading.Event()
+        self._thread = None
+
+    def on_start(self, callback):
+        """订阅进程启动事件，callback(pid)"""
+        self._start_callbacks.append(callback)
+
+    def on_exit(self, callback):
+        """订阅进程退出事件，callback(pid)"""
+        self._exit_callbacks.append(callback)
+
+    def start(self):
+        self._stop_event.clear()
+        self._thread = threading.Thread(target=self._run_safe, name=f"{self.name}-watcher", daemon=True)
+        self._thread.start()
+        logging.info(f"Process watcher started: {self.name}")
+
+    def stop(self):
+        self._stop_event.set()
+        if self._thread is not None:
+            self._thread.join(timeout=2)
+            self._thread = None
+
+    def _run_safe(self):
+        try:
+            self._run()
+        except Exception as e:
+            logging.error(f"Process watcher {self.name} stopped unexpectedly: {str(e)}")
+
+    def _run(self):
+        raise NotImplementedError
+
+    def _emit(self, callbacks, pid):
+        for callback in callbacks:
+            try:
+                callback(pid)
+            except Exception as e:
+                logging.error(f"Process watcher callback failed for {pid}: {str(e)}")
+
+    def _emit_start(self, pid):
+        self._emit(self._start_callbacks, pid)
+
+    def _emit_exit(self, pid):
+        self._emit(self._exit_callbacks, pid)
+
+
+class PollingProcWatcher(ProcessWatcher):
+    """周期性比较 psutil.pids() 的差异，只在PID集合变化时发出事件"""
+    name = "polling"
+
+    def __init__(self, interval=1.0):
+        super().__init__()
+        self.interval = interval
+
+    def _run(self):
+        known = set(psutil.pids())
+        while not self._stop_event.wait(self.interval):
+            current = set(psutil.pids())
+            for pid in current - known:
+                self._emit_start(pid)
+            for pid in known - current:
+                self._emit_exit(pid)
+            known = current
+
+
+class NetlinkProcWatcher(ProcessWatcher):
+    """Linux: 订阅 netlink proc connector 的 fork/exec/exit 事件"""
+    name = "netlink"
+    is_live = True
+
+    NETLINK_CONNECTOR = 11
+    CN_IDX_PROC = 1
+    CN_VAL_PROC = 1
+    NLMSG_DONE = 3
+    PROC_CN_MCAST_LISTEN = 1
+    PROC_CN_MCAST_IGNORE = 2
+
+    PROC_EVENT_FORK = 0x00000001
+    PROC_EVENT_EXEC = 0x00000002
+    PROC_EVENT_EXIT = 0x80000000
+
+    NLMSG_HEADER = struct.Struct('=IHHII')
+    CN_MSG_HEADER = struct.Struct('=IIIIHH')
+    PROC_EVENT_HEADER = struct.Struct('=IIQ')
+    EVENT_PIDS = struct.Struct('=IIII')
+
+    def __init__(self):
+        super().__init__()
+        self._sock = socket.socket(socket.AF_NETLINK, socket.SOCK_DGRAM, self.NETLINK_CONNECTOR)
+        try:
+            self._sock.bind((0, self.CN_IDX_PROC))
+            self._send_control(self.PROC_CN_MCAST_LISTEN)
+        except OSError:
+            self._sock.close()
+            raise
+        self._wake_r, self._wake_w = os.pipe()
+        self._known = set()
+
+    @classmethod
+    def is_available(cls):
+        return sys.platform.startswith('linux') and hasattr(socket, 'AF_NETLINK')
+
+    def _send_control(self, op):
+        payload = struct.pack('=I', op)
+        cn_msg = self.CN_MSG_HEADER.pack(self.CN_IDX_PROC, self.CN_VAL_PROC, 0, 0, len(payload), 0)
+        length = self.NLMSG_HEADER.size + len(cn_msg) + len(payload)
+        header = self.NLMSG_HEADER.pack(length, self.NLMSG_DONE, 0, 0, 0)
+        self._sock.send(header + cn_msg + payload)
+
+    def stop(self):
+        self._stop_event.set()
+        os.write(self._wake_w, b'x')
+        super().stop()
+        try:
+            self._send_control(self.PROC_CN_MCAST_IGNORE)
+        except OSError:
+            pass
+        self._sock.close()
+        os.close(self._wake_r)
+        os.close(self._wake_w)
+
+    def _run(self):
+        selector = selectors.DefaultSelector()
+        selector.register(self._sock, selectors.EVENT_READ)
+        selector.register(self._wake_r, selectors.EVENT_READ)
+        self._known = set(psutil.pids())
+        while not self._stop_event.is_set():
+            for key, _ in selector.select():
+                if key.fileobj is not self._sock:
+                    continue
+                try:
+                    data = self._sock.recv(65536)
+                except OSError as e:
+                    if e.errno != errno.ENOBUFS:
+                        raise
+                    # 接收缓冲区溢出会丢失事件，用一次全量比较补齐
+                    logging.warning("Netlink proc connector overrun, resyncing process list")
+                    self._resync()
+                    continue
+                self._dispatch(data)
+        selector.close()
+
+    def _resync(self):
+        current = set(psutil.pids())
+        for pid in current - self._known:
+            self._emit_start(pid)
+        for pid in self._known - current:
+            self._emit_exit(pid)
+        self._known = current
+
+    def _dispatch(self, data):
+        offset = 0
+        while offset + self.NLMSG_HEADER.size <= len(data):
+            length = self.NLMSG_HEADER.unpack_from(data, offset)[0]
+            if length < self.NLMSG_HEADER.size:
+                break
+            event_offset = offset + self.NLMSG_HEADER.size + self.CN_MSG_HEADER.size
+            what = self.PROC_EVENT_HEADER.unpack_from(data, event_offset)[0]
+            pids = self.EVENT_PIDS.unpack_from(data, event_offset + self.PROC_EVENT_HEADER.size)
+            if what == self.PROC_EVENT_FORK:
+                _, _, child_pid, child_tgid = pids
+                if child_pid == child_tgid:  # 忽略新线程
+                    self._known.add(child_tgid)
+                    self._emit_start(child_tgid)
+            elif what == self.PROC_EVENT_EXEC:
+                # exec 后进程名才会变成新程序的名字
+                self._emit_start(pids[1])
+            elif what == self.PROC_EVENT_EXIT:
+                process_pid, process_tgid = pids[0], pids[1]
+                if process_pid == process_tgid:
+                    self._known.discard(process_tgid)
+                    self._emit_exit(process_tgid)
+            offset += (length + 3) & ~3
+
+
+def create_process_watcher(interval=1.0):
+    """优先使用 netlink，不可用（如缺少权限）时回退到轮询"""
+    if NetlinkProcWatcher.is_available():
+        try:
+            return NetlinkProcWatcher()
+        except OSError as e:
+            logging.info(f"Netlink proc connector unavailable ({str(e)}), using polling watcher")
+    return PollingProcWatcher(interval)
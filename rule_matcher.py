@@ -0,0 +1,353 @@
+"""按规则匹配进程
+
+条目可以带 "rule" 字段，按进程名、可执行文件完整路径、命令行和用户匹配，
+所有字段都匹配时进程属于该条目：
+
+    "rule": {"name": "chrome*", "exe": "re:^/opt/google/", "cmdline": "*--type=renderer*", "user": "alice"}
+
+字段值默认是 glob（整串匹配），以 "re:" 开头时是正则表达式（re.search），均不区分大小写。
+没有 rule 字段的条目等价于 {"name": 标识符}（PID 条目除外）。
+
+CompiledRules 把所有规则按字段编译成一个组合匹配器（见 FieldMatcher），对一个进程
+求值一次就得到它匹配的全部条目，不需要每条规则扫描一遍进程表。
+RuleResolver 在 ProcessIndex 之上增量维护匹配结果：按索引的变更日志只为新出现
+（包括 exec 后换了程序）的进程求值，只有规则用到 exe/cmdline/user 时才读取这些信息。
+添加/删除单个条目时（update_rule）不重新编译全部规则：新规则单独编译后只对它求值一遍，
+累积较多后才合并进组合匹配器。
+"""
+import re
+import fnmatch
+import logging
+import threading
+from collections import defaultdict
+
+import psutil
+
+FIELDS = ("name", "exe", "cmdline", "user")
+DETAIL_FIELDS = ("exe", "cmdline", "user")  # 不在进程索引中、需要另外读取的字段
+REGEX_PREFIX = "re:"
+GLOB_CHARS = frozenset("*?[")
+GLOB_META = re.compile(r"\[[^\]]*\]|[*?\[]")  # 拆出 glob 中的字面片段
+GROUP_REFERENCE = re.compile(r"\\[1-9]|\(\?P=|\(\?\(")  # 反向引用和条件分组，合并后组号会改变
+
+
+class RuleError(ValueError):
+    pass
+
+
+def validate_rule(rule):
+    """检查规则格式，返回 {字段: 模式}；格式错误时抛出 RuleError"""
+    if not isinstance(rule, dict) or not rule:
+        raise RuleError("rule must be a non-empty object")
+    for field, pattern in rule.items():
+        if field not in FIELDS:
+            raise RuleError(f"unknown rule field: {field}")
+        if not isinstance(pattern, str) or not pattern:
+            raise RuleError(f"pattern for {field} must be a non-empty string")
+        if pattern.startswith(REGEX_PREFIX):
+            try:
+                re.compile(pattern[len(REGEX_PREFIX):])
+            except re.error as e:
+                raise RuleError(f"invalid regex for {field}: {e}") from None
+    return rule
+
+
+class FieldMatcher:
+    """一个字段上所有规则的组合匹配器，相同的模式只求值一次
+
+    不含通配符的 glob 放进字典直接查找；其余 glob 按第一个通配符之前的字面前缀建索引，
+    只测试前缀与值相符的模式；以通配符开头的 glob 和正则先用一个合并的正则预筛
+    （glob 取其中最长的字面片段），一个都不匹配时整组跳过。引用了分组编号的正则
+    （反向引用、条件分组）合并后组号会变，不参与预筛，每次都单独测试。
+    """
+
+    def __init__(self):
+        self.exact = {}  # {小写字符串: [规则序号]}
+        self.prefixed = {}  # {小写字面前缀: [(编译后的模式, [规则序号])]}
+        self.prefix_lengths = []  # prefixed 中出现的前缀长度（升序）
+        self.unanchored = []  # 需要预筛的 [(编译后的模式, [规则序号])]
+        self.always = []  # 没有字面片段、每次都要测试的 glob（如 "*"）
+        self.prefilter = None  # unanchored 中所有模式合并成的正则
+        self._patterns = {}  # {模式: [规则序号]}，与上面各表中的列表是同一个对象
+        self._sources = []  # 预筛正则的各个分支
+
+    def add(self, pattern, rule_index):
+        is_regex = pattern.startswith(REGEX_PREFIX)
+        key = pattern if is_regex else pattern.lower()  # glob 不区分大小写，只差大小写的模式视为相同
+        if key in self._patterns:
+            self._patterns[key].append(rule_index)
+            return
+        indexes = [rule_index]
+        self._patterns[key] = indexes
+        if is_regex:
+            source = pattern[len(REGEX_PREFIX):]
+            compiled = re.compile(source, re.IGNORECASE)
+            if compiled.groups and GROUP_REFERENCE.search(source):
+                self.always.append((compiled.search, indexes))
+            else:
+                self.unanchored.append((compiled.search, indexes))
+                self._sources.append(f"(?:{source})")
+            return
+        meta = next((i for i, char in enumerate(key) if char in GLOB_CHARS), None)
+        if meta is None:
+            self.exact[key] = indexes
+            return
+        test = re.compile(fnmatch.translate(key)).match
+        if meta > 0:
+            self.prefixed.setdefault(key[:meta], []).append((test, indexes))
+            return
+        literal = max(GLOB_META.split(key), key=len)
+        if literal:
+            self.unanchored.append((test, indexes))
+            self._sources.append(re.escape(literal))
+        else:
+            self.always.append((test, indexes))
+
+    def finish(self):
+        """所有模式添加完成后调用，生成前缀长度表和预筛正则"""
+        self.prefix_lengths = sorted({len(prefix) for prefix in self.prefixed})
+        self.prefilter = None
+        if self._sources:
+            try:
+                # 分支中不能有 .* 之类的前导通配，否则 re 无法优化合并后的分支，预筛反而更慢
+                self.prefilter = re.compile("|".join(self._sources), re.IGNORECASE | re.DOTALL).search
+            except re.error:  # 正则自带全局标志等无法合并的情况：不预筛，逐个测试
+                self.always.extend(self.unanchored)
+                self.unanchored = []
+
+    def match(self, value):
+        """返回 value 匹配的所有规则序号"""
+        value = value.lower()
+        matched = list(self.exact.get(value, ()))
+        for length in self.prefix_lengths:
+            if length > len(value):
+                break
+            for test, indexes in self.prefixed.get(value[:length], ()):
+                if test(value):
+                    matched.extend(indexes)
+        candidates = self.always
+        if self.prefilter is not None and self.prefilter(value):
+            candidates = self.unanchored + candidates
+        for test, indexes in candidates:
+            if test(value):
+                matched.extend(indexes)
+        return matched
+
+
+class CompiledRules:
+    """编译后的规则集合，格式错误的规则被跳过并记录在 errors 中"""
+
+    def __init__(self, rules):
+        self.identifiers = []
+        self.field_counts = []  # 每条规则的字段数，所有字段都匹配才算匹配
+        self.fields = {}  # {字段: FieldMatcher}
+        self.errors = {}  # {标识符: 错误信息}
+        for identifier, rule in rules.items():
+            try:
+                validate_rule(rule)
+            except RuleError as e:
+                self.errors[identifier] = str(e)
+                continue
+            index = len(self.identifiers)
+            self.identifiers.append(identifier)
+            self.field_counts.append(len(rule))
+            for field, pattern in rule.items():
+                self.fields.setdefault(field, FieldMatcher()).add(pattern, index)
+        for matcher in self.fields.values():
+            matcher.finish()
+        self.detail_fields = tuple(field for field in DETAIL_FIELDS if field in self.fields)
+
+    def __len__(self):
+        return len(self.identifiers)
+
+    def match(self, name, details=None):
+        """返回进程匹配的条目标识符集合；details 为 {字段: 值}，只需包含 detail_fields"""
+        counts = defaultdict(int)
+        for field, matcher in self.fields.items():
+            value = name if field == "name" else (details or {}).get(field, '')
+            for index in matcher.match(value):
+                counts[index] += 1
+        return {self.identifiers[index] for index, count in counts.items() if count == self.field_counts[index]}
+
+
+def read_process_details(pid, fields):
+    """读取进程的 exe/cmdline/user，无权限或进程已退出时为空字符串"""
+    details = dict.fromkeys(fields, '')
+    try:
+        proc = psutil.Process(pid)
+        with proc.oneshot():
+            for field in fields:
+                try:
+                    if field == "exe":
+                        details[field] = proc.exe() or ''
+                    elif field == "cmdline":
+                        details[field] = " ".join(proc.cmdline())
+                    elif field == "user":
+                        details[field] = proc.username() or ''
+                except psutil.AccessDenied:
+                    pass
+    except (psutil.NoSuchProcess, psutil.ZombieProcess):
+        pass
+    return details
+
+
+class RuleResolver:
+    """在 ProcessIndex 之上增量维护 条目 -> 进程 的规则匹配结果"""
+
+    OVERLAY_LIMIT = 32  # 单独编译的规则超过这个数量时合并重新编译
+
+    def __init__(self, process_index, read_details=read_process_details):
+        self.process_index = process_index
+        self.read_details = read_details  # (pid, 字段元组) -> {字段: 值}
+        self.compiled = CompiledRules({})
+        self.rules = {}  # 当前全部有效规则 {标识符: 规则}
+        self._overlay = {}  # set_rules 之后逐个添加的规则 {标识符: 只含这一条的 CompiledRules}
+        self._retired = set()  # compiled 中已被删除或被 _overlay 替换的标识符
+        self._detail_fields = ()  # compiled 和 _overlay 需要的详细信息字段
+        self._lock = threading.RLock()
+        self._generation = None  # 上次同步时进程索引的版本
+        self._matches = {}  # {(pid, create_time): 匹配的标识符集合}
+        self._names = {}  # {(pid, create_time): 求值时的进程名}，全量同步时据此发现 exec 过的进程
+        self._members = defaultdict(set)  # {标识符: {(pid, create_time)}}
+        self._details = {}  # {(pid, create_time): {字段: 值}}，规则变化后仍可复用
+
+    def set_rules(self, rules):
+        """替换全部规则 {标识符: 规则}，下次查询时对所有进程重新求值；返回格式错误的规则"""
+        compiled = CompiledRules(rules)
+        for identifier, error in compiled.errors.items():
+            logging.error(f"Invalid rule for {identifier}: {error}")
+        with self._lock:
+            self.compiled = compiled
+            self.rules = {identifier: rules[identifier] for identifier in compiled.identifiers}
+            self._overlay.clear()
+            self._retired.clear()
+            self._detail_fields = compiled.detail_fields
+            self._matches.clear()
+            self._names.clear()
+            self._members.clear()
+            self._generation = None
+        return compiled.errors
+
+    def update_rule(self, identifier, rule):
+        """添加、替换（rule 为规则）或删除（rule 为 None）单个条目的规则，只对这一条规则求值
+
+        返回格式错误的规则 {标识符: 错误信息}。
+        """
+        compiled = None
+        errors = {}
+        if rule is not None:
+            compiled = CompiledRules({identifier: rule})
+            errors = compiled.errors
+            if errors:
+                logging.error(f"Invalid rule for {identifier}: {errors[identifier]}")
+                compiled = None
+        with self._lock:
+            for key in self._members.pop(identifier, ()):
+                matched = self._matches.get(key)
+                if matched is not None:
+                    matched.discard(identifier)
+            self._overlay.pop(identifier, None)
+            self.rules.pop(identifier, None)
+            self._retired.add(identifier)
+            if compiled is not None:
+                self.rules[identifier] = rule
+                if len(self._overlay) >= self.OVERLAY_LIMIT:
+                    # 合并进组合匹配器；下次查询时对所有进程重新求值
+                    self.set_rules(dict(self.rules))
+                    return errors
+                self._overlay[identifier] = compiled
+                self._update_detail_fields()
+                # 已经求值过的进程只补上这一条规则的结果；尚未同步的进程会在 sync 中完整求值
+                for key, name in self._names.items():
+                    if compiled.match(name, self._details_for(key, compiled.detail_fields)):
+                        self._matches[key].add(identifier)
+                        self._members[identifier].add(key)
+        return errors
+
+    def _update_detail_fields(self):
+        fields = set(self.compiled.detail_fields)
+        for compiled in self._overlay.values():
+            fields.update(compiled.detail_fields)
+        self._detail_fields = tuple(field for field in DETAIL_FIELDS if field in fields)
+
+    def pids_for(self, identifier):
+        """条目规则匹配的PID列表；与 ProcessIndex.pids_for 一样先核对启动时间，排除被复用的PID"""
+        self.sync()
+        with self._lock:
+            pids = sorted(pid for pid, _ in self._members.get(identifier, ()))
+        if self.process_index.verify and self.process_index.revalidate(pids):
+            self.sync()
+            with self._lock:
+                pids = sorted(pid for pid, _ in self._members.get(identifier, ()))
+        return pids
+
+    def identifiers_for(self, pid):
+        """进程匹配的条目标识符集合"""
+        key = self.process_index.key_of(pid)
+        if key is None:
+            return set()
+        self.sync()
+        with self._lock:
+            return set(self._matches.get(key, ()))
+
+    def sync(self):
+        """进程索引有变化时，按变更日志为新出现或 exec 过的进程求值，并移除已退出的进程"""
+        if self.process_index.generation == self._generation:
+            return
+        with self._lock:
+            generation, changes = self.process_index.changes_since(self._generation)
+            if changes is None:
+                self._sync_all()
+            else:
+                # 同一个键在这批变更中可能先删除再添加（exec），只按最后的状态求值一次
+                latest = dict(changes)
+                for key in latest:
+                    self._drop(key)
+                for key, name in latest.items():
+                    if name is not None:
+                        self._evaluate(key, name)
+            self._generation = generation
+
+    def _sync_all(self):
+        """变更日志不完整时与进程索引的快照全量比较"""
+        processes = self.process_index.snapshot()
+        for key in list(self._matches):
+            if processes.get(key) != self._names.get(key):  # 已退出，或 exec 后换了名字
+                self._drop(key)
+        for key in self._details.keys() - processes.keys():
+            del self._details[key]
+        for key in processes.keys() - self._matches.keys():
+            self._evaluate(key, processes[key])
+
+    def _drop(self, key):
+        """移除进程的匹配结果和缓存的详细信息（exec 后需要重新读取）"""
+        for identifier in self._matches.pop(key, ()):
+            members = self._members.get(identifier)
+            if members is not None:
+                members.discard(key)
+        self._names.pop(key, None)
+        self._details.pop(key, None)
+
+    def _details_for(self, key, fields):
+        """进程的详细信息，只读取缓存中还没有的字段"""
+        if not fields:
+            return None
+        details = self._details.get(key)
+        missing = [field for field in fields if details is None or field not in details]
+        if missing:
+            details = {**(details or {}), **self.read_details(key[0], tuple(missing))}
+            self._details[key] = details
+        return details
+
+    def _evaluate(self, key, name):
+        details = self._details_for(key, self._detail_fields)
+        matched = self.compiled.match(name, details)
+        if self._retired:
+            matched -= self._retired
+        for identifier, compiled in self._overlay.items():
+            if compiled.match(name, details):
+                matched.add(identifier)
+        self._matches[key] = matched
+        self._names[key] = name
+        for identifier in matched:
+            self._members[identifier].add(key)
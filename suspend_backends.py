@@ -0,0 +1,427 @@
+"""进程挂起后端
+
+ProcessManager 通过 SuspendBackend 接口冻结/解冻进程，具体实现：
+- NtSuspendBackend: Windows 下在进程内调用 NtSuspendProcess/NtResumeProcess
+- SignalSuspendBackend: Linux 等 POSIX 平台使用 SIGSTOP/SIGCONT
+- CgroupFreezerBackend: Linux 下把目标放进独立的 cgroup v2，通过 cgroup.freeze 整组冻结
+- PsSuspendBackend: 调用 pssuspend64.exe，作为兼容旧行为的回退方案
+"""
+import os
+import re
+import sys
+import time
+import errno
+import select
+import signal
+import shutil
+import logging
+import subprocess
+
+
+class SuspendError(Exception):
+    """挂起或恢复进程失败"""
+
+
+def _read_state(stat_path):
+    """读取 /proc/.../stat 中的状态字段（进程名可能包含括号，取最后一个右括号之后）"""
+    fd = os.open(stat_path, os.O_RDONLY)
+    try:
+        data = os.read(fd, 512)
+    finally:
+        os.close(fd)
+    end = data.rindex(b')')
+    return data[end + 2:end + 3]
+
+
+def linux_process_stopped(pid):
+    """进程的所有线程是否都处于停止状态(T/t)；进程不存在时返回 None"""
+    try:
+        # 主线程没有停止时不必再检查其他线程
+        if _read_state(f'/proc/{pid}/stat') not in (b'T', b't'):
+            return False
+        task_dir = f'/proc/{pid}/task'
+        for tid in os.listdir(task_dir):
+            if _read_state(f'{task_dir}/{tid}/stat') not in (b'T', b't'):
+                return False
+        return True
+    except (FileNotFoundError, ProcessLookupError, ValueError):
+        return None
+
+
+class SuspendBackend:
+    """挂起后端基类，子类至少需要实现 suspend/resume"""
+    name = "base"
+
+    @classmethod
+    def is_available(cls):
+        """当前平台是否可以使用该后端"""
+        return False
+
+    def suspend(self, pid):
+        """挂起单个进程；进程不存在时抛出 ProcessLookupError"""
+        raise NotImplementedError
+
+    def resume(self, pid):
+        """恢复单个进程；进程不存在时抛出 ProcessLookupError"""
+        raise NotImplementedError
+
+    def suspend_group(self, identifier, pids):
+        """按给定顺序挂起一组进程"""
+        for pid in pids:
+            self._apply(self.suspend, pid)
+
+    def resume_group(self, identifier, pids):
+        """按给定顺序恢复一组进程"""
+        for pid in pids:
+            self._apply(self.resume, pid)
+
+    def release_group(self, identifier):
+        """条目被删除时调用，释放后端为该条目保留的资源"""
+
+    def is_group_suspended(self, identifier, pids):
+        """整组进程是否都处于挂起状态；无法判断（如非Linux或进程都已退出）时返回 None"""
+        if not sys.platform.startswith('linux'):
+            return None
+        result = None
+        for pid in pids:
+            stopped = linux_process_stopped(pid)
+            if stopped is False:
+                return False
+            if stopped:
+                result = True
+        return result
+
+    def _apply(self, func, pid):
+        try:
+            func(pid)
+        except ProcessLookupError:
+            # 解析PID到真正操作之间进程可能已经退出，忽略即可
+            logging.debug(f"Process {pid} exited before {func.__name__}")
+
+
+class NtSuspendBackend(SuspendBackend):
+    """Windows: 通过 ntdll 的 NtSuspendProcess/NtResumeProcess 挂起整个进程"""
+    name = "ntdll"
+
+    PROCESS_SUSPEND_RESUME = 0x0800
+    ERROR_INVALID_PARAMETER = 87
+
+    def __init__(self):
+        import ctypes
+        from ctypes import wintypes
+
+        self._ctypes = ctypes
+        self._kernel32 = ctypes.WinDLL('kernel32', use_last_error=True)
+        self._kernel32.OpenProcess.argtypes = [wintypes.DWORD, wintypes.BOOL, wintypes.DWORD]
+        self._kernel32.OpenProcess.restype = wintypes.HANDLE
+        self._kernel32.CloseHandle.argtypes = [wintypes.HANDLE]
+        self._kernel32.CloseHandle.restype = wintypes.BOOL
+
+        ntdll = ctypes.WinDLL('ntdll')
+        self._nt_suspend = ntdll.NtSuspendProcess
+        self._nt_resume = ntdll.NtResumeProcess
+        for func in (self._nt_suspend, self._nt_resume):
+            func.argtypes = [wintypes.HANDLE]
+            func.restype = ctypes.c_long  # NTSTATUS
+
+    @classmethod
+    def is_available(cls):
+        return sys.platform == 'win32'
+
+    def _call(self, func, pid):
+        handle = self._kernel32.OpenProcess(self.PROCESS_SUSPEND_RESUME, False, pid)
+        if not handle:
+            error = self._ctypes.get_last_error()
+            if error == self.ERROR_INVALID_PARAMETER:
+                raise ProcessLookupError(pid)
+            raise SuspendError(f"OpenProcess({pid}) 失败: WinError {error}")
+        try:
+            status = func(handle)
+        finally:
+            self._kernel32.CloseHandle(handle)
+        if status < 0:
+            raise SuspendError(f"进程 {pid} 操作失败: NTSTATUS 0x{status & 0xFFFFFFFF:08X}")
+
+    def suspend(self, pid):
+        self._call(self._nt_suspend, pid)
+
+    def resume(self, pid):
+        self._call(self._nt_resume, pid)
+
+
+class SignalSuspendBackend(SuspendBackend):
+    """POSIX: 使用 SIGSTOP/SIGCONT 挂起和恢复进程"""
+    name = "signal"
+
+    @classmethod
+    def is_available(cls):
+        return hasattr(signal, 'SIGSTOP') and hasattr(signal, 'SIGCONT')
+
+    def _send(self, pid, sig):
+        try:
+            os.kill(pid, sig)
+        except PermissionError as e:
+            raise SuspendError(f"没有权限操作进程 {pid}: {e}") from e
+
+    def suspend(self, pid):
+        self._send(pid, signal.SIGSTOP)
+
+    def resume(self, pid):
+        self._send(pid, signal.SIGCONT)
+
+
+class CgroupFreezerBackend(SuspendBackend):
+    """Linux: 每个条目一个 cgroup v2 子组，写 cgroup.freeze 整组冻结
+
+    进程只在第一次冻结时迁入子组，之后冻结/解冻都只写一次 cgroup.freeze，
+    耗时与组内任务数无关；组内进程新 fork 的子进程由内核自动归入同一组。
+    迁入时记录进程原来所在的 cgroup，条目被删除时（release_group）把进程迁回并删除子组；
+    解冻后已经没有进程的子组也会被删除，单个PID的 pid-<n> 子组在解冻时即迁回删除。
+    """
+    name = "cgroup"
+
+    GROUP_DIR = "process_freezer"
+    FREEZE_TIMEOUT = 5.0  # 秒
+
+    def __init__(self, root=None):
+        self.mount = self.find_mount()
+        self.root = root or self.default_root()
+        if self.root is None:
+            raise SuspendError("未找到 cgroup v2 挂载点")
+        os.makedirs(self.root, exist_ok=True)
+        self._origins = {}  # {子组路径: {pid: 迁入前所在的 cgroup 路径}}
+
+    @staticmethod
+    def find_mount():
+        """从 /proc/mounts 查找 cgroup2 挂载点（兼容 unified/hybrid 两种布局）"""
+        try:
+            with open('/proc/mounts', 'r') as f:
+                for line in f:
+                    fields = line.split()
+                    if len(fields) > 2 and fields[2] == 'cgroup2':
+                        return fields[1]
+        except OSError:
+            pass
+        return None
+
+    @classmethod
+    def default_root(cls):
+        mount = cls.find_mount()
+        return os.path.join(mount, cls.GROUP_DIR) if mount else None
+
+    @classmethod
+    def is_available(cls):
+        if not sys.platform.startswith('linux'):
+            return False
+        root = cls.default_root()
+        if root is None:
+            return False
+        if os.path.isdir(root):
+            return os.access(root, os.W_OK)
+        return os.access(os.path.dirname(root), os.W_OK)
+
+    def group_path(self, identifier):
+        """条目对应的子组路径"""
+        return os.path.join(self.root, re.sub(r'[^A-Za-z0-9._-]', '_', identifier))
+
+    def _write(self, path, value):
+        try:
+            with open(path, 'w') as f:
+                f.write(value)
+        except OSError as e:
+            if e.errno == errno.ESRCH:
+                raise ProcessLookupError(value) from e
+            raise SuspendError(f"写入 {path} 失败: {e}") from e
+
+    @staticmethod
+    def _members(group):
+        """组内的进程PID集合，子组不存在时为空"""
+        try:
+            with open(os.path.join(group, 'cgroup.procs'), 'r') as f:
+                return {int(line) for line in f if line.strip()}
+        except FileNotFoundError:
+            return set()
+
+    def _current_cgroup(self, pid):
+        """进程当前所在的 cgroup v2 目录；已在本后端的子组中或无法读取时返回 None"""
+        if self.mount is None:
+            return None
+        try:
+            with open(f'/proc/{pid}/cgroup', 'r') as f:
+                for line in f:
+                    if line.startswith('0::'):
+                        path = os.path.join(self.mount, line[3:].strip().lstrip('/'))
+                        if path != self.root and not path.startswith(self.root + os.sep):
+                            return path
+        except OSError:
+            pass
+        return None
+
+    def _attach(self, group, pids):
+        """把尚未在组内的进程迁入子组，并记录它们原来所在的 cgroup"""
+        os.makedirs(group, exist_ok=True)
+        procs_file = os.path.join(group, 'cgroup.procs')
+        attached = self._members(group)
+        origins = self._origins.setdefault(group, {})
+
+        def attach(pid):
+            origin = self._current_cgroup(pid)
+            self._write(procs_file, str(pid))
+            if origin is not None:
+                origins[pid] = origin
+
+        for pid in pids:
+            if pid not in attached:
+                self._apply(attach, pid)
+
+    def _detach(self, group):
+        """把组内进程迁回原来的 cgroup 并删除子组
+
+        组内新 fork 的子进程没有记录，随组内第一个有记录的进程迁回；
+        都没有记录时迁到本后端根目录的上一级。迁出冻结的子组同时会解冻进程。
+        """
+        origins = self._origins.pop(group, {})
+        fallback = next(iter(origins.values()), os.path.dirname(self.root))
+
+        def move_back(pid):
+            self._write(os.path.join(origins.get(pid, fallback), 'cgroup.procs'), str(pid))
+
+        for pid in self._members(group):
+            try:
+                self._apply(move_back, pid)
+            except SuspendError as e:
+                logging.error(f"Failed to move process {pid} back from {group}: {str(e)}")
+        self._remove_if_empty(group)
+
+    def _remove_if_empty(self, group):
+        """删除没有进程的子组；组内仍有进程时内核拒绝删除（EBUSY），保留即可"""
+        try:
+            os.rmdir(group)
+        except FileNotFoundError:
+            pass
+        except OSError as e:
+            if e.errno != errno.EBUSY:
+                logging.error(f"Failed to remove cgroup {group}: {str(e)}")
+            return
+        self._origins.pop(group, None)
+
+    def _set_frozen(self, group, frozen):
+        """写 cgroup.freeze，并等待 cgroup.events 确认状态已生效"""
+        self._write(os.path.join(group, 'cgroup.freeze'), '1' if frozen else '0')
+        expected = f"frozen {1 if frozen else 0}"
+        deadline = time.monotonic() + self.FREEZE_TIMEOUT
+
+        fd = os.open(os.path.join(group, 'cgroup.events'), os.O_RDONLY)
+        try:
+            poller = select.poll()
+            poller.register(fd, select.POLLPRI | select.POLLERR)
+            while True:
+                os.lseek(fd, 0, os.SEEK_SET)
+                if expected in os.read(fd, 4096).decode().splitlines():
+                    return
+                remaining = deadline - time.monotonic()
+                if remaining <= 0:
+                    raise SuspendError(f"等待 {group} 进入 '{expected}' 状态超时")
+                # cgroup.events 变化时内核会唤醒 POLLPRI，无需轮询
+                poller.poll(remaining * 1000)
+        finally:
+            os.close(fd)
+
+    def suspend_group(self, identifier, pids):
+        group = self.group_path(identifier)
+        self._attach(group, pids)
+        self._set_frozen(group, True)
+
+    def resume_group(self, identifier, pids):
+        group = self.group_path(identifier)
+        if os.path.isdir(group):
+            self._set_frozen(group, False)
+            self._remove_if_empty(group)
+
+    def release_group(self, identifier):
+        group = self.group_path(identifier)
+        if os.path.isdir(group):
+            self._detach(group)
+
+    def is_group_suspended(self, identifier, pids):
+        """cgroup 冻结的任务不会进入 T 状态，直接读取 cgroup.events"""
+        group = self.group_path(identifier)
+        try:
+            with open(os.path.join(group, 'cgroup.events'), 'r') as f:
+                return 'frozen 1' in f.read().splitlines()
+        except FileNotFoundError:
+            return False if pids else None
+
+    def suspend(self, pid):
+        self.suspend_group(f"pid-{pid}", [pid])
+
+    def resume(self, pid):
+        # 单个PID的子组没有条目生命周期，解冻后立即迁回原 cgroup
+        self.release_group(f"pid-{pid}")
+
+
+class PsSuspendBackend(SuspendBackend):
+    """回退方案：每次操作启动一次 pssuspend64.exe"""
+    name = "pssuspend"
+
+    def __init__(self):
+        self.executable = self.find_executable()
+
+    @staticmethod
+    def find_executable():
+        """优先使用程序目录下的 pssuspend，其次在 PATH 中查找"""
+        exe_name = 'pssuspend64.exe' if sys.maxsize > 2 ** 32 else 'pssuspend.exe'
+        local_path = os.path.join(os.path.dirname(os.path.abspath(__file__)), exe_name)
+        if os.path.exists(local_path):
+            return local_path
+        return shutil.which(exe_name)
+
+    @classmethod
+    def is_available(cls):
+        return sys.platform == 'win32' and cls.find_executable() is not None
+
+    def _run(self, args):
+        result = subprocess.run([self.executable] + args,
+                                capture_output=True,
+                                text=True,
+                                creationflags=getattr(subprocess, 'CREATE_NO_WINDOW', 0))
+        if result.returncode != 0:
+            raise SuspendError(f"pssuspend 执行失败({result.returncode}): {result.stderr or result.stdout}")
+
+    def suspend(self, pid):
+        self._run([str(pid)])
+
+    def resume(self, pid):
+        self._run(['-r', str(pid)])
+
+
+# 按优先级排列，auto 模式下选择第一个可用的后端
+# cgroup 会把进程迁出原有的 cgroup，只在显式配置时使用
+SUSPEND_BACKENDS = {
+    backend.name: backend
+    for backend in (NtSuspendBackend, SignalSuspendBackend, CgroupFreezerBackend, PsSuspendBackend)
+}
+AUTO_EXCLUDED = {CgroupFreezerBackend.name}
+
+
+def available_backends():
+    """返回当前平台可用的后端名称列表"""
+    return [name for name, backend in SUSPEND_BACKENDS.items() if backend.is_available()]
+
+
+def create_suspend_backend(preferred="auto"):
+    """创建挂起后端；指定的后端不可用时回退到第一个可用后端"""
+    backend_cls = SUSPEND_BACKENDS.get(preferred)
+    if backend_cls is not None and backend_cls.is_available():
+        return backend_cls()
+    if preferred != "auto":
+        logging.warning(f"Suspend backend '{preferred}' is not available, falling back to auto")
+
+    for name in available_backends():
+        if name in AUTO_EXCLUDED:
+            continue
+        try:
+            return SUSPEND_BACKENDS[name]()
+        except Exception as e:
+            logging.error(f"Failed to initialize suspend backend '{name}': {str(e)}")
+    raise SuspendError("当前平台没有可用的进程挂起后端")
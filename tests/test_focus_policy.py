@@ -0,0 +1,183 @@
+"""FocusPolicy 与 DeadlineScheduler 的测试，使用 FakeForegroundSource，不需要窗口系统
+
+    python -m pytest -q tests
+"""
+import os
+import sys
+import time
+import threading
+import unittest
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from focus_policy import DeadlineScheduler, FakeForegroundSource, FocusPolicy  # noqa: E402
+
+IDLE = 0.05  # 秒
+WAIT = 2.0  # 等待回调的上限
+
+
+class FakeProcessManager:
+    """FocusPolicy 用到的 ProcessManager 接口：冻结/解冻立即生效并发出状态事件"""
+
+    def __init__(self, entries):
+        self.processes = {}  # {标识符: 条目}
+        self.pids = {}  # {标识符: PID}
+        self.listeners = []
+        self.frozen_calls = []  # [(标识符, hide_windows)]
+        self.resumed_calls = []
+        for identifier, pid in entries.items():
+            self.processes[identifier] = {"is_frozen": False, "idle_freeze_seconds": IDLE}
+            self.pids[identifier] = pid
+
+    def add_process(self, identifier, pid):
+        self.processes[identifier] = {"is_frozen": False, "idle_freeze_seconds": IDLE}
+        self.pids[identifier] = pid
+        self._notify(identifier, "added")
+
+    def add_listener(self, callback):
+        self.listeners.append(callback)
+
+    def remove_listener(self, callback):
+        self.listeners.remove(callback)
+
+    def _notify(self, identifier, event):
+        for callback in list(self.listeners):
+            callback(identifier, event)
+
+    def identifiers_for_pid(self, pid):
+        return [identifier for identifier, entry_pid in self.pids.items() if entry_pid == pid]
+
+    def resolve_pids(self, identifier):
+        return [self.pids[identifier]] if identifier in self.pids else []
+
+    def freeze_many_async(self, identifiers, priority=None, hide_windows=True):
+        for identifier in identifiers:
+            self.processes[identifier]["is_frozen"] = True
+            self.frozen_calls.append((identifier, hide_windows))
+            self._notify(identifier, "frozen")
+
+    def resume_many_async(self, identifiers, priority=None):
+        for identifier in identifiers:
+            self.processes[identifier]["is_frozen"] = False
+            self.resumed_calls.append(identifier)
+            self._notify(identifier, "resumed")
+
+
+def wait_for(predicate, timeout=WAIT):
+    """轮询直到 predicate() 为真，超时返回 False"""
+    deadline = time.monotonic() + timeout
+    while not predicate():
+        if time.monotonic() > deadline:
+            return False
+        time.sleep(0.01)
+    return True
+
+
+class DeadlineSchedulerTest(unittest.TestCase):
+    def setUp(self):
+        self.fired = []
+        self.event = threading.Event()
+        self.scheduler = DeadlineScheduler(self._callback)
+
+    def tearDown(self):
+        self.scheduler.stop()
+
+    def _callback(self, key):
+        self.fired.append(key)
+        self.event.set()
+
+    def test_fires_in_deadline_order(self):
+        now = time.monotonic()
+        self.scheduler.schedule("late", now + 2 * IDLE)
+        self.scheduler.schedule("early", now + IDLE)
+        self.assertTrue(wait_for(lambda: len(self.fired) == 2))
+        self.assertEqual(self.fired, ["early", "late"])
+        self.assertEqual(len(self.scheduler), 0)
+
+    def test_does_not_fire_before_deadline(self):
+        self.scheduler.schedule("key", time.monotonic() + 3 * IDLE)
+        self.assertFalse(self.event.wait(IDLE))
+        self.assertTrue(self.event.wait(WAIT))
+
+    def test_cancel(self):
+        self.scheduler.schedule("key", time.monotonic() + IDLE)
+        self.scheduler.cancel("key")
+        self.assertIsNone(self.scheduler.deadline_of("key"))
+        self.assertFalse(self.event.wait(4 * IDLE))
+        self.assertEqual(self.fired, [])
+
+    def test_reschedule_replaces_deadline(self):
+        now = time.monotonic()
+        self.scheduler.schedule("key", now + IDLE)
+        self.scheduler.schedule("key", now + 60)
+        self.assertFalse(self.event.wait(4 * IDLE))
+        self.assertEqual(self.scheduler.deadline_of("key"), now + 60)
+
+
+class FocusPolicyTest(unittest.TestCase):
+    def setUp(self):
+        self.manager = FakeProcessManager({"game.exe": 100, "editor.exe": 200})
+        self.source = FakeForegroundSource()
+        self.policy = FocusPolicy(self.manager, self.source)
+
+    def tearDown(self):
+        self.policy.stop()
+
+    def test_background_entry_frozen_after_deadline(self):
+        self.policy.start()
+        self.source.activate(200)
+        self.assertTrue(wait_for(lambda: self.manager.frozen_calls))
+        self.assertEqual(self.manager.frozen_calls, [("game.exe", False)])
+        self.assertFalse(self.manager.processes["editor.exe"]["is_frozen"])
+
+    def test_refocus_thaws_frozen_entry(self):
+        self.policy.start()
+        self.source.activate(200)
+        self.assertTrue(wait_for(lambda: self.manager.frozen_calls))
+        self.source.activate(100)
+        self.assertEqual(self.manager.resumed_calls, ["game.exe"])
+        self.assertFalse(self.manager.processes["game.exe"]["is_frozen"])
+        # 位于前台的条目不会再被安排冻结
+        self.assertIsNone(self.policy.scheduler.deadline_of("game.exe"))
+
+    def test_refocus_cancels_pending_freeze(self):
+        self.manager.processes["game.exe"]["idle_freeze_seconds"] = 4 * IDLE
+        self.policy.start()
+        self.source.activate(200)
+        self.assertIsNotNone(self.policy.scheduler.deadline_of("game.exe"))
+        self.source.activate(100)
+        self.assertIsNone(self.policy.scheduler.deadline_of("game.exe"))
+        time.sleep(8 * IDLE)
+        self.assertNotIn("game.exe", [identifier for identifier, _ in self.manager.frozen_calls])
+
+    def test_entry_added_after_start_is_scheduled(self):
+        self.manager.processes["game.exe"]["idle_freeze_seconds"] = 0
+        self.manager.processes["editor.exe"]["idle_freeze_seconds"] = 0
+        self.policy.start()
+        self.manager.add_process("music.exe", 300)
+        self.assertTrue(wait_for(lambda: self.manager.frozen_calls))
+        self.assertEqual(self.manager.frozen_calls, [("music.exe", False)])
+
+    def test_manual_resume_in_background_reschedules(self):
+        self.manager.processes["editor.exe"]["idle_freeze_seconds"] = 0
+        self.policy.start()
+        self.source.activate(200)
+        self.assertTrue(wait_for(lambda: self.manager.frozen_calls))
+        self.manager.resume_many_async(["game.exe"])
+        self.assertTrue(wait_for(lambda: len(self.manager.frozen_calls) == 2))
+        self.assertEqual(self.manager.frozen_calls, [("game.exe", False), ("game.exe", False)])
+
+    def test_entry_started_later_is_frozen(self):
+        self.manager.processes["editor.exe"]["idle_freeze_seconds"] = 0
+        del self.manager.pids["game.exe"]  # 策略启动时 game.exe 没有在运行
+        self.policy.start()
+        time.sleep(3 * IDLE)
+        self.assertEqual(self.manager.frozen_calls, [])
+        self.assertIsNotNone(self.policy.scheduler.deadline_of("game.exe"))
+        self.manager.pids["game.exe"] = 100
+        self.assertTrue(wait_for(lambda: self.manager.frozen_calls))
+        self.assertEqual(self.manager.frozen_calls, [("game.exe", False)])
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,140 @@
+"""atomic_write_text 与 DebouncedWriter 的测试
+
+    python -m pytest -q tests
+"""
+import os
+import sys
+import json
+import stat
+import time
+import shutil
+import tempfile
+import unittest
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from persistence import UMASK, DebouncedWriter, atomic_write_text  # noqa: E402
+
+DELAY = 0.05  # 秒
+WAIT = 2.0  # 等待后台写入的上限
+
+
+def wait_for(predicate, timeout=WAIT):
+    """轮询直到 predicate() 为真，超时返回 False"""
+    deadline = time.monotonic() + timeout
+    while not predicate():
+        if time.monotonic() > deadline:
+            return False
+        time.sleep(0.01)
+    return True
+
+
+class AtomicWriteTest(unittest.TestCase):
+    def setUp(self):
+        self.directory = tempfile.mkdtemp()
+        self.path = os.path.join(self.directory, "processes.json")
+
+    def tearDown(self):
+        shutil.rmtree(self.directory)
+
+    def mode(self):
+        return stat.S_IMODE(os.stat(self.path).st_mode)
+
+    def test_new_file_uses_umask(self):
+        atomic_write_text(self.path, "{}")
+        self.assertEqual(self.mode(), 0o666 & ~UMASK)
+
+    @unittest.skipIf(sys.platform == 'win32', "Windows 只有只读位")
+    def test_existing_mode_preserved(self):
+        with open(self.path, 'w') as f:
+            f.write("{}")
+        os.chmod(self.path, 0o640)
+        atomic_write_text(self.path, '{"a": 1}')
+        self.assertEqual(self.mode(), 0o640)
+        with open(self.path) as f:
+            self.assertEqual(f.read(), '{"a": 1}')
+        self.assertEqual(os.listdir(self.directory), ["processes.json"])  # 没有遗留临时文件
+
+
+class DebouncedWriterTest(unittest.TestCase):
+    def setUp(self):
+        self.directory = tempfile.mkdtemp()
+        self.path = os.path.join(self.directory, "processes.json")
+        self.data = {"count": 0}
+        self.writers = []
+
+    def tearDown(self):
+        for writer in self.writers:
+            writer.close()
+        shutil.rmtree(self.directory, ignore_errors=True)
+
+    def make_writer(self, path=None, **kwargs):
+        writer = DebouncedWriter(path or self.path, lambda: dict(self.data), **kwargs)
+        self.writers.append(writer)
+        return writer
+
+    def read(self):
+        with open(self.path) as f:
+            return json.load(f)
+
+    def test_burst_coalesced_into_one_write(self):
+        writer = self.make_writer(delay=DELAY, max_delay=10)
+        for i in range(20):
+            self.data["count"] = i
+            writer.schedule()
+        self.assertTrue(wait_for(lambda: writer.writes == 1))
+        time.sleep(4 * DELAY)
+        self.assertEqual(writer.writes, 1)
+        self.assertEqual(writer.requests, 20)
+        self.assertEqual(self.read(), {"count": 19})
+        self.assertFalse(writer.dirty)
+
+    def test_max_delay_bounds_continuous_requests(self):
+        writer = self.make_writer(delay=4 * DELAY, max_delay=6 * DELAY)
+        start = time.monotonic()
+        # 请求间隔小于 delay，只有 max_delay 能触发写入
+        while writer.writes == 0 and time.monotonic() - start < WAIT:
+            writer.schedule()
+            time.sleep(DELAY / 2)
+        self.assertEqual(writer.writes, 1)
+        self.assertLess(time.monotonic() - start, 6 * DELAY + 1.0)
+
+    def test_close_flushes_pending_data(self):
+        writer = self.make_writer(delay=60, max_delay=60)
+        self.data["count"] = 7
+        writer.schedule()
+        self.assertFalse(os.path.exists(self.path))
+        writer.close()
+        self.assertEqual(writer.writes, 1)
+        self.assertEqual(self.read(), {"count": 7})
+
+    def test_flush_without_pending_data_does_nothing(self):
+        writer = self.make_writer()
+        self.assertTrue(writer.flush())
+        self.assertEqual(writer.writes, 0)
+        self.assertFalse(os.path.exists(self.path))
+
+    def test_failed_write_stays_pending_and_retries(self):
+        missing = os.path.join(self.directory, "missing")
+        path = os.path.join(missing, "processes.json")
+        writer = self.make_writer(path, delay=DELAY, max_delay=DELAY, retry_delay=DELAY)
+        with self.assertLogs(level="ERROR"):
+            writer.schedule()
+            self.assertTrue(wait_for(lambda: writer.dirty and writer._thread is not None))
+            time.sleep(2 * DELAY)
+        self.assertEqual(writer.writes, 0)
+        self.assertTrue(writer.dirty)  # 写入失败的数据没有丢失
+        os.mkdir(missing)
+        self.assertTrue(wait_for(lambda: writer.writes == 1))
+        self.assertFalse(writer.dirty)
+
+    def test_flush_failure_returns_false(self):
+        writer = self.make_writer(os.path.join(self.directory, "missing", "x.json"), delay=60, max_delay=60)
+        writer.schedule()
+        with self.assertLogs(level="ERROR"):
+            self.assertFalse(writer.flush())
+        self.assertTrue(writer.dirty)
+
+
+if __name__ == '__main__':
+    unittest.main()
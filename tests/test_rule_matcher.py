@@ -0,0 +1,160 @@
+"""规则匹配（CompiledRules、FieldMatcher）与 RuleResolver 增量同步的测试
+
+    python -m pytest -q tests
+"""
+import os
+import sys
+import unittest
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from process_index import ProcessIndex  # noqa: E402
+from rule_matcher import CompiledRules, RuleError, RuleResolver, validate_rule  # noqa: E402
+
+
+class CompiledRulesTest(unittest.TestCase):
+    def match(self, rules, name, **details):
+        return CompiledRules(rules).match(name, details)
+
+    def test_exact_name_is_case_insensitive(self):
+        rules = {"chrome": {"name": "Chrome.exe"}}
+        self.assertEqual(self.match(rules, "chrome.EXE"), {"chrome"})
+        self.assertEqual(self.match(rules, "chrome.exe.bak"), set())
+
+    def test_prefix_glob(self):
+        rules = {"chrom": {"name": "chrom*"}, "chromium": {"name": "chromium?.exe"}}
+        self.assertEqual(self.match(rules, "chrome_helper"), {"chrom"})
+        self.assertEqual(self.match(rules, "chromium2.exe"), {"chrom", "chromium"})
+        self.assertEqual(self.match(rules, "firefox"), set())
+
+    def test_unanchored_glob(self):
+        rules = {"renderer": {"cmdline": "*--type=renderer*"}, "any": {"cmdline": "*"}}
+        self.assertEqual(self.match(rules, "x", cmdline="chrome --type=renderer --lang"), {"renderer", "any"})
+        self.assertEqual(self.match(rules, "x", cmdline="chrome --type=gpu"), {"any"})
+
+    def test_glob_character_class(self):
+        rules = {"worker": {"name": "worker[0-9]"}}
+        self.assertEqual(self.match(rules, "worker7"), {"worker"})
+        self.assertEqual(self.match(rules, "workerx"), set())
+
+    def test_regex_searches_anywhere(self):
+        rules = {"opt": {"exe": "re:^/opt/google/"}, "py": {"cmdline": r"re:python3?\s+-m"}}
+        self.assertEqual(self.match(rules, "chrome", exe="/opt/google/chrome/chrome"), {"opt"})
+        self.assertEqual(self.match(rules, "x", cmdline="/usr/bin/PYTHON3 -m http.server"), {"py"})
+        self.assertEqual(self.match(rules, "x", exe="/usr/opt/google/x"), set())
+
+    def test_regex_backreferences_not_merged(self):
+        rules = {"a": {"cmdline": r"re:(x)\1"}, "b": {"cmdline": r"re:(y)\1"},
+                 "c": {"cmdline": "re:(?P<q>z)(?P=q)"}, "d": {"cmdline": "re:(w)(?(1)w|v)"}}
+        self.assertEqual(self.match(rules, "n", cmdline="yy"), {"b"})
+        self.assertEqual(self.match(rules, "n", cmdline="xx"), {"a"})
+        self.assertEqual(self.match(rules, "n", cmdline="zz"), {"c"})
+        self.assertEqual(self.match(rules, "n", cmdline="ww"), {"d"})
+        self.assertEqual(self.match(rules, "n", cmdline="xy"), set())
+
+    def test_all_fields_must_match(self):
+        rules = {"alice": {"name": "bash", "user": "alice"}}
+        self.assertEqual(self.match(rules, "bash", user="alice"), {"alice"})
+        self.assertEqual(self.match(rules, "bash", user="bob"), set())
+
+    def test_identical_patterns_shared(self):
+        rules = {"one": {"name": "app*"}, "two": {"name": "APP*"}}
+        self.assertEqual(self.match(rules, "application"), {"one", "two"})
+
+    def test_invalid_rules_skipped(self):
+        compiled = CompiledRules({"bad": {"name": "re:("}, "unknown": {"color": "red"}, "ok": {"name": "ok"}})
+        self.assertEqual(set(compiled.errors), {"bad", "unknown"})
+        self.assertEqual(compiled.match("ok"), {"ok"})
+        with self.assertRaises(RuleError):
+            validate_rule({})
+
+
+def fake_details(values):
+    """按 {pid: {字段: 值}} 返回详细信息的 read_details"""
+    def read(pid, fields):
+        return {field: values.get(pid, {}).get(field, '') for field in fields}
+    return read
+
+
+class RuleResolverTest(unittest.TestCase):
+    def setUp(self):
+        self.index = ProcessIndex(verify=False)
+        self.details = {}
+        self.resolver = RuleResolver(self.index, read_details=fake_details(self.details))
+
+    def test_exec_re_evaluated_through_change_log(self):
+        self.resolver.set_rules({"sleeper": {"name": "fzsleep"}})
+        self.index.add_record(100, "bash", ppid=1, create_time=5.0)
+        self.assertEqual(self.resolver.identifiers_for(100), set())
+        generation = self.index.generation
+        # exec：PID 和启动时间不变，进程名改变
+        self.index.add_record(100, "fzsleep", ppid=1, create_time=5.0)
+        _, changes = self.index.changes_since(generation)
+        self.assertEqual(changes, [((100, 5.0), None), ((100, 5.0), "fzsleep")])
+        self.assertEqual(self.resolver.identifiers_for(100), {"sleeper"})
+        self.assertEqual(self.resolver.pids_for("sleeper"), [100])
+
+    def test_exec_rereads_details(self):
+        self.resolver.set_rules({"server": {"cmdline": "*http.server*"}})
+        self.details[100] = {"cmdline": "bash -c x"}
+        self.index.add_record(100, "python", create_time=5.0)
+        self.assertEqual(self.resolver.pids_for("server"), [])
+        self.details[100] = {"cmdline": "python -m http.server"}
+        self.index.add_record(100, "python", create_time=5.0)
+        self.assertEqual(self.resolver.pids_for("server"), [100])
+
+    def test_exit_removes_matches(self):
+        self.resolver.set_rules({"app": {"name": "app"}})
+        self.index.add_record(100, "app", create_time=1.0)
+        self.assertEqual(self.resolver.pids_for("app"), [100])
+        self.index.remove_pid(100)
+        self.assertEqual(self.resolver.pids_for("app"), [])
+
+    def test_full_resync_when_change_log_overflows(self):
+        self.resolver.set_rules({"app": {"name": "app"}})
+        self.index.add_record(1, "bash", create_time=1.0)
+        self.assertEqual(self.resolver.pids_for("app"), [])
+        for pid in range(1000, 1000 + ProcessIndex.CHANGE_LOG_SIZE + 1):
+            self.index.add_record(pid, "filler", create_time=1.0)
+        self.index.add_record(1, "app", create_time=1.0)
+        self.assertEqual(self.index.changes_since(self.resolver._generation)[1], None)
+        self.assertEqual(self.resolver.pids_for("app"), [1])
+
+    def test_update_rule_matches_set_rules(self):
+        for pid, name in enumerate(["chrome", "chrome_helper", "firefox", "code"], start=100):
+            self.index.add_record(pid, name, create_time=1.0)
+        self.resolver.set_rules({"chrome": {"name": "chrome*"}, "firefox": {"name": "firefox"}})
+        self.assertEqual(self.resolver.pids_for("chrome"), [100, 101])
+        self.resolver.update_rule("code", {"name": "code"})
+        self.resolver.update_rule("chrome", {"name": "chrome"})
+        self.resolver.update_rule("firefox", None)
+        self.assertEqual(self.resolver.pids_for("code"), [103])
+        self.assertEqual(self.resolver.pids_for("chrome"), [100])
+        self.assertEqual(self.resolver.pids_for("firefox"), [])
+        self.assertEqual(self.resolver.identifiers_for(101), set())
+        # 之后启动的进程按更新后的规则求值
+        self.index.add_record(200, "code", create_time=2.0)
+        self.index.add_record(201, "firefox", create_time=2.0)
+        self.assertEqual(self.resolver.pids_for("code"), [103, 200])
+        self.assertEqual(self.resolver.identifiers_for(201), set())
+
+    def test_update_rule_folds_overlay(self):
+        self.index.add_record(100, "app5", create_time=1.0)
+        self.resolver.set_rules({})
+        for i in range(RuleResolver.OVERLAY_LIMIT + 5):
+            self.resolver.update_rule(f"app{i}", {"name": f"app{i}"})
+        self.assertLessEqual(len(self.resolver._overlay), RuleResolver.OVERLAY_LIMIT)
+        self.assertEqual(self.resolver.identifiers_for(100), {"app5"})
+
+    def test_update_rule_invalid(self):
+        self.resolver.set_rules({"app": {"name": "app"}})
+        self.index.add_record(100, "app", create_time=1.0)
+        self.assertEqual(self.resolver.pids_for("app"), [100])
+        with self.assertLogs(level="ERROR"):
+            errors = self.resolver.update_rule("app", {"name": "re:("})
+        self.assertIn("app", errors)
+        self.assertEqual(self.resolver.pids_for("app"), [])
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,198 @@
+"""占空比限速
+
+DutyCycleThrottler 让进程只在每个周期的前 duty 部分运行，其余时间挂起，
+例如 period=0.1、duty=0.1 即运行 10ms、停止 90ms，从而把占用限制在单核的 duty 以内。
+
+所有限速目标共用一个调度线程：每个周期开始时统一恢复，再按运行时长从短到长依次挂起。
+截止时间按周期起点累加计算，不会因为单次延迟产生漂移。没有限速目标时线程阻塞，不消耗CPU。
+目标的PID由单独的解析线程定期重新解析（需要扫描进程表，耗时不固定），调度线程只在
+周期开始、所有目标都已恢复时换用新的PID列表，扫描耗时不会计入运行或挂起阶段，
+也不会阻塞 set/remove 的调用方。
+"""
+import time
+import logging
+import threading
+from collections import deque
+
+
+class DutyCycleThrottler:
+    """按固定周期交替挂起/恢复一组目标"""
+
+    HISTORY_CYCLES = 20  # 计算实测占空比使用的周期数
+
+    def __init__(self, backend, resolve, period=0.1, resolve_interval=1.0):
+        self.backend = backend
+        self.resolve = resolve  # resolve(identifier) -> PID列表，父进程在前
+        self.period = period
+        self.resolve_interval = resolve_interval  # 多久重新解析一次PID（秒）
+        self._targets = {}  # {标识符: 占空比(0~1)}
+        self._pids = {}  # {标识符: 调度线程正在使用的PID列表}
+        self._resolved = {}  # {标识符: 解析线程新解析出、尚未被调度线程换用的PID列表}
+        self._history = {}  # {标识符: deque[(运行秒数, 周期秒数)]}
+        self._suspended = set()  # 当前处于挂起阶段的目标
+        self._condition = threading.Condition()
+        self._resolve_requested = threading.Event()
+        self._running = False
+        self._thread = None
+        self._resolver_thread = None
+
+    def set(self, identifier, duty):
+        """开始（或调整）限速，duty 为每个周期中运行时间的比例"""
+        if not 0 < duty < 1:
+            raise ValueError(f"duty must be between 0 and 1, got {duty}")
+        with self._condition:
+            self._targets[identifier] = duty
+            self._history.setdefault(identifier, deque(maxlen=self.HISTORY_CYCLES))
+            if not self._running:
+                self._running = True
+                self._thread = threading.Thread(target=self._run, name="duty-cycle-throttler", daemon=True)
+                self._thread.start()
+                self._resolver_thread = threading.Thread(target=self._resolve_loop,
+                                                         name="duty-cycle-resolver", daemon=True)
+                self._resolver_thread.start()
+            self._condition.notify()
+        self._resolve_requested.set()  # 立即解析新目标的PID
+        logging.info(f"Throttling {identifier} to {duty:.0%} duty cycle")
+
+    def remove(self, identifier):
+        """停止限速并确保目标处于运行状态"""
+        with self._condition:
+            if self._targets.pop(identifier, None) is None:
+                return
+            self._history.pop(identifier, None)
+            self._resolved.pop(identifier, None)
+            pids = self._pids.pop(identifier, [])
+            if identifier in self._suspended:
+                self._suspended.discard(identifier)
+                self._resume(identifier, pids)
+        logging.info(f"Stopped throttling {identifier}")
+
+    def is_throttled(self, identifier):
+        return identifier in self._targets
+
+    def targets(self):
+        """当前限速中的目标标识符"""
+        with self._condition:
+            return list(self._targets)
+
+    def duty_of(self, identifier):
+        return self._targets.get(identifier)
+
+    def measured_duty(self, identifier):
+        """最近若干周期实际的运行时间比例，尚无完整周期时返回 None"""
+        with self._condition:
+            history = self._history.get(identifier)
+            if not history:
+                return None
+            run = sum(item[0] for item in history)
+            total = sum(item[1] for item in history)
+        return run / total if total > 0 else None
+
+    def stop(self):
+        """停止调度线程并恢复所有目标"""
+        with self._condition:
+            self._running = False
+            self._condition.notify()
+        self._resolve_requested.set()
+        for thread in (self._thread, self._resolver_thread):
+            if thread is not None:
+                thread.join(timeout=2)
+        self._thread = self._resolver_thread = None
+        with self._condition:
+            for identifier in list(self._suspended):
+                self._resume(identifier, self._pids.get(identifier, []))
+            self._suspended.clear()
+            self._targets.clear()
+            self._pids.clear()
+            self._resolved.clear()
+            self._history.clear()
+
+    def _suspend(self, identifier, pids):
+        try:
+            self.backend.suspend_group(identifier, pids[::-1])
+        except Exception as e:
+            logging.error(f"Throttle suspend failed for {identifier}: {str(e)}")
+
+    def _resume(self, identifier, pids):
+        try:
+            self.backend.resume_group(identifier, pids)
+        except Exception as e:
+            logging.error(f"Throttle resume failed for {identifier}: {str(e)}")
+
+    def _wait_until(self, deadline):
+        """在锁内等待到 deadline（perf_counter 时间），被停止时返回 False"""
+        while self._running:
+            remaining = deadline - time.perf_counter()
+            if remaining <= 0:
+                return True
+            self._condition.wait(remaining)
+        return False
+
+    def _resolve_loop(self):
+        """不持有锁地解析所有目标的PID，结果放进 _resolved 等待调度线程换用"""
+        identifiers = []
+        while True:
+            # 没有目标时无限期等待 set() 唤醒
+            self._resolve_requested.wait(self.resolve_interval if identifiers else None)
+            self._resolve_requested.clear()
+            with self._condition:
+                if not self._running:
+                    return
+                identifiers = list(self._targets)
+            resolved = {}
+            for identifier in identifiers:
+                try:
+                    resolved[identifier] = self.resolve(identifier)
+                except Exception as e:
+                    logging.error(f"Failed to resolve throttled target {identifier}: {str(e)}")
+            with self._condition:
+                for identifier, pids in resolved.items():
+                    if identifier in self._targets:  # 解析期间可能已被移除
+                        self._resolved[identifier] = pids
+
+    def _run(self):
+        cycle_start = time.perf_counter()
+        resumed_at = {}  # {标识符: 本周期实际恢复的时间}
+        run_time = {}  # {标识符: 本周期实际运行的秒数}
+        with self._condition:
+            while self._running:
+                if not self._targets:
+                    resumed_at.clear()
+                    run_time.clear()
+                    self._condition.wait()
+                    cycle_start = time.perf_counter()
+                    continue
+
+                # 周期开始：恢复所有目标，并记录上一个周期的实际运行时间和周期长度；
+                # 恢复之后再换用新解析的PID，不在新列表中的旧进程也不会停留在挂起状态
+                for identifier in list(self._targets):
+                    now = time.perf_counter()
+                    if identifier in resumed_at and identifier in run_time:
+                        self._history[identifier].append((run_time.pop(identifier), now - resumed_at[identifier]))
+                    if identifier in self._suspended:
+                        self._resume(identifier, self._pids.get(identifier, []))
+                        self._suspended.discard(identifier)
+                    if identifier in self._resolved:
+                        self._pids[identifier] = self._resolved.pop(identifier)
+                    resumed_at[identifier] = time.perf_counter()
+
+                # 按运行时长从短到长依次挂起
+                for identifier, duty in sorted(self._targets.items(), key=lambda item: item[1]):
+                    if not self._wait_until(cycle_start + duty * self.period):
+                        break
+                    if identifier not in self._targets or identifier not in resumed_at:
+                        continue  # 等待期间被移除，或本周期开始后才加入
+                    self._suspend(identifier, self._pids.get(identifier, []))
+                    self._suspended.add(identifier)
+                    run_time[identifier] = time.perf_counter() - resumed_at[identifier]
+
+                if not self._wait_until(cycle_start + self.period):
+                    break
+                cycle_start += self.period
+                # 落后超过一个周期（如系统休眠）时重新对齐，不补跑错过的周期
+                if time.perf_counter() - cycle_start > self.period:
+                    cycle_start = time.perf_counter()
+                for identifier in list(resumed_at):
+                    if identifier not in self._targets:
+                        resumed_at.pop(identifier)
+                        run_time.pop(identifier, None)
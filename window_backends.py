@@ -0,0 +1,210 @@
+"""窗口后端
+
+WindowHider 通过 WindowBackend 接口枚举、隐藏和显示顶层窗口，具体实现：
+- Win32WindowBackend: Windows 下使用 pywin32（EnumWindows/SetWindowPos）
+- NullWindowBackend: 没有窗口系统接口的平台，没有任何窗口
+- FakeWindowBackend: 内存中的窗口表，统计模拟的系统调用次数，用于基准测试
+
+enumerate() 一次遍历返回所有可见顶层窗口的 (hwnd, pid)，隐藏/显示按窗口列表批量进行，
+调用方不需要为每个进程单独枚举一遍窗口。
+"""
+import sys
+import logging
+
+try:
+    import win32gui
+    import win32process
+    import win32con
+except ImportError:  # 非Windows平台没有pywin32
+    win32gui = win32process = win32con = None
+
+
+class WindowBackend:
+    """窗口后端基类"""
+    name = "base"
+
+    @classmethod
+    def is_available(cls):
+        """当前平台是否可以使用该后端"""
+        return False
+
+    def enumerate(self):
+        """遍历一次所有可见的顶层窗口，返回 [(hwnd, pid)]"""
+        raise NotImplementedError
+
+    def window_pid(self, hwnd):
+        """窗口所属的进程ID，窗口不存在时返回 None"""
+        raise NotImplementedError
+
+    def title(self, hwnd):
+        raise NotImplementedError
+
+    def foreground(self):
+        """当前前台窗口，没有时返回 None"""
+        raise NotImplementedError
+
+    def set_foreground(self, hwnd):
+        raise NotImplementedError
+
+    def hide(self, hwnds):
+        """隐藏一批窗口"""
+        raise NotImplementedError
+
+    def show(self, hwnds):
+        """显示一批窗口"""
+        raise NotImplementedError
+
+
+class Win32WindowBackend(WindowBackend):
+    name = "win32"
+
+    @classmethod
+    def is_available(cls):
+        return sys.platform == 'win32' and win32gui is not None
+
+    def enumerate(self):
+        windows = []
+
+        def collect(hwnd, _):
+            if win32gui.IsWindowVisible(hwnd):
+                pid = self.window_pid(hwnd)
+                if pid is not None:
+                    windows.append((hwnd, pid))
+            return True
+
+        win32gui.EnumWindows(collect, None)
+        return windows
+
+    def window_pid(self, hwnd):
+        try:
+            _, pid = win32process.GetWindowThreadProcessId(hwnd)
+            return pid
+        except Exception:
+            return None
+
+    def title(self, hwnd):
+        return win32gui.GetWindowText(hwnd)
+
+    def foreground(self):
+        return win32gui.GetForegroundWindow() or None
+
+    def set_foreground(self, hwnd):
+        win32gui.SetForegroundWindow(hwnd)
+
+    def _set_visible(self, hwnds, flag):
+        for hwnd in hwnds:
+            try:
+                win32gui.SetWindowPos(
+                    hwnd,
+                    0,
+                    0, 0, 0, 0,
+                    win32con.SWP_NOMOVE |
+                    win32con.SWP_NOSIZE |
+                    win32con.SWP_NOZORDER |
+                    flag
+                )
+            except Exception as e:  # 窗口可能已经关闭
+                logging.warning(f"Failed to update window {hwnd}: {str(e)}")
+
+    def hide(self, hwnds):
+        self._set_visible(hwnds, win32con.SWP_HIDEWINDOW)
+
+    def show(self, hwnds):
+        self._set_visible(hwnds, win32con.SWP_SHOWWINDOW)
+
+
+class NullWindowBackend(WindowBackend):
+    """没有窗口系统接口：枚举结果为空，隐藏/显示什么都不做"""
+    name = "none"
+
+    @classmethod
+    def is_available(cls):
+        return True
+
+    def enumerate(self):
+        return []
+
+    def window_pid(self, hwnd):
+        return None
+
+    def title(self, hwnd):
+        return ''
+
+    def foreground(self):
+        return None
+
+    def set_foreground(self, hwnd):
+        pass
+
+    def hide(self, hwnds):
+        pass
+
+    def show(self, hwnds):
+        pass
+
+
+class FakeWindowBackend(WindowBackend):
+    """内存中的窗口表；calls 按 Win32 实现的调用方式统计模拟的系统调用次数"""
+    name = "fake"
+
+    def __init__(self):
+        self.windows = {}  # {hwnd: [pid, 标题, 是否可见]}
+        self.foreground_hwnd = None
+        self.calls = 0
+        self._next_hwnd = 0x10000
+
+    @classmethod
+    def is_available(cls):
+        return True
+
+    def add_window(self, pid, title="", visible=True):
+        self._next_hwnd += 2
+        self.windows[self._next_hwnd] = [pid, title, visible]
+        return self._next_hwnd
+
+    def enumerate(self):
+        self.calls += 1  # EnumWindows
+        windows = []
+        for hwnd, (pid, _, visible) in self.windows.items():
+            self.calls += 1  # IsWindowVisible
+            if visible:
+                self.calls += 1  # GetWindowThreadProcessId
+                windows.append((hwnd, pid))
+        return windows
+
+    def window_pid(self, hwnd):
+        self.calls += 1
+        window = self.windows.get(hwnd)
+        return window[0] if window else None
+
+    def title(self, hwnd):
+        self.calls += 1
+        window = self.windows.get(hwnd)
+        return window[1] if window else ''
+
+    def foreground(self):
+        self.calls += 1
+        return self.foreground_hwnd
+
+    def set_foreground(self, hwnd):
+        self.calls += 1
+        self.foreground_hwnd = hwnd
+
+    def hide(self, hwnds):
+        for hwnd in hwnds:
+            self.calls += 1
+            if hwnd in self.windows:
+                self.windows[hwnd][2] = False
+
+    def show(self, hwnds):
+        for hwnd in hwnds:
+            self.calls += 1
+            if hwnd in self.windows:
+                self.windows[hwnd][2] = True
+
+
+def create_window_backend():
+    """Windows 下使用 Win32WindowBackend，其他平台没有窗口可隐藏"""
+    if Win32WindowBackend.is_available():
+        return Win32WindowBackend()
+    return NullWindowBackend()